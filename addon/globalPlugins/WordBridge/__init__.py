@@ -1,7 +1,4 @@
-import csv
-import json
 import os
-import shutil
 import sys
 import threading
 import time
@@ -30,12 +27,21 @@ from .dialogs import CORRECTOR_CONFIG_ID_DEFAULT, EXECUTION_CHANNEL_DEFAULT, LAN
 from .dialogs import LLMSettingsPanel, FeedbackDialog
 from .configManager import normalize_selection
 from .dictionary.dialog import DictionaryEntryDialog
-from .lib.application.task_runner import run_typo_correction
-from .lib.coseeing import obtain_openai_key
+from .lib.application.dictionary import get_dictionary_service
+from .lib.application.incremental import CorrectionMemory
+from .lib.application.jobs import JOB_DONE, JOB_FAILED, JOB_RUNNING, CorrectionJobQueue
+from .lib.application.prewarm import (
+	ModulePrewarmer,
+	import_correction_modules,
+	load_char_bigram_model,
+	load_personal_dictionary,
+	warm_hanzidentifier,
+	warm_pinyin,
+)
+from .lib.coseeing import NDJSON_CONTENT_TYPE, CoseeingError, CoseeingTokenManager, read_proofreader_response
 from .lib.decimalUtils import decimal_to_str_0
-from .lib.tasks.typo.utils import strings_diff
-from .lib.viewHTML import text2template
-from hanzidentifier import has_chinese
+from .lib.tasks.typo.prefilter import DEFAULT_THRESHOLD as SKIP_CONFIDENCE_THRESHOLD_DEFAULT
+from .lib.viewHTML import render_report
 
 
 DEBUG_MODE = False
@@ -55,10 +61,18 @@ config.conf.spec["WordBridge"] = {
 		"auto_display_report": "boolean(default=False)",
 		"customized_words_enable": "boolean(default=True)",
 		"sound_effects_enable": "boolean(default=True)",
+		"skip_plausible_segments": "boolean(default=False)",
+		"detect_suspected_typos": "boolean(default=False)",
+		"stream_responses": "boolean(default=True)",
+		"cascade_enable": "boolean(default=False)",
+		"long_document_enable": "boolean(default=False)",
+		"max_cost_per_run": "float(default=0,min=0,max=10)",
 	}
 }
 COSEEING_BASE_URL = "https://wordbridge.coseeing.org"
 # COSEEING_BASE_URL = "http://localhost:8000"
+# Wait for NVDA to settle before loading the language data in the background.
+PREWARM_DELAY_MS = 5000
 
 
 class GlobalPlugin(globalPluginHandler.GlobalPlugin):
@@ -70,12 +84,41 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 			"response": None,
 			"diff": None,
 			"interaction_id": None,
+			"job_id": None,
 		}
-		self.correct_typo_thread = None
+		self.correction_jobs = CorrectionJobQueue(
+			self.runCorrectionJob,
+			max_workers=2,
+			max_pending=8,
+			on_failure=self.reportCorrectionJobFailure,
+		)
+		self.progress_sound_lock = threading.Lock()
+		self.correction_memory = CorrectionMemory()
+		self.coseeing_token_manager = CoseeingTokenManager(COSEEING_BASE_URL)
+		self.proofreader_progress_time = 0
+		self.prewarmer = ModulePrewarmer([
+			warm_hanzidentifier,
+			warm_pinyin,
+			import_correction_modules,
+			self.prewarmPersonalDictionary,
+			self.prewarmLanguageModel,
+		])
+		wx.CallLater(PREWARM_DELAY_MS, self.prewarmer.start)
+
+	def prewarmPersonalDictionary(self):
+		if config.conf["WordBridge"]["settings"]["customized_words_enable"]:
+			load_personal_dictionary()
+
+	def prewarmLanguageModel(self):
+		settings = config.conf["WordBridge"]["settings"]
+		if settings["skip_plausible_segments"] or settings["detect_suspected_typos"]:
+			load_char_bigram_model()
 
 	def terminate(self, *args, **kwargs):
 		super().terminate(*args, **kwargs)
 		gui.settingsDialogs.NVDASettingsDialog.categoryClasses.remove(LLMSettingsPanel)
+		self.coseeing_token_manager.invalidate()
+		self.correction_jobs.shutdown()
 
 	def onSettings(self, evt):
 		wx.CallAfter(
@@ -89,43 +132,11 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 			os.startfile(file)
 		wx.CallAfter(openfile)
 
-	def showReport(self, diff_data):
-		template_folder = os.path.join(PATH, "web", "templates")
-		raw_folder = os.path.join(PATH, "web", "workspace", "default")
-		review_folder = os.path.join(PATH, "web", "workspace", "review")
-
-		try:
-			shutil.rmtree(raw_folder)
-		except BaseException:
-			pass
-		if not os.path.exists(raw_folder):
-			os.makedirs(raw_folder)
-
-		raw = os.path.join(raw_folder, "result.txt")
-		with open(raw, "w", encoding="utf8") as f:
-			f.write(json.dumps(diff_data))
-
-		try:
-			shutil.rmtree(review_folder)
-		except BaseException:
-			pass
-		if not os.path.exists(review_folder):
-			os.makedirs(review_folder)
-
-		shutil.copytree(
-			os.path.join(template_folder, "modules"),
-			os.path.join(review_folder, "modules")
-		)
-
-		src = os.path.join(review_folder, os.path.basename(raw))
-		shutil.copyfile(
-			raw,
-			src,
-		)
-
-		dst = os.path.join(review_folder, "result.html")
-		text2template(src, dst)
-
+	def showReport(self, diff_data, job_id=None):
+		# Each task gets its own file, so a report is not overwritten by a task that finishes right after it.
+		file_name = "result.html" if job_id is None else f"result_{job_id}.html"
+		dst = os.path.join(PATH, "web", "workspace", "review", file_name)
+		render_report(diff_data, dst)
 		self.OnPreview(dst)
 
 	def getSelectedText(self):
@@ -133,7 +144,7 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 		text = obj.makeTextInfo(textInfos.POSITION_SELECTION).text
 		return text
 
-	def isTextValid(self, text):
+	def getMaxCharCount(self):
 		try:
 			max_char_count = config.conf["WordBridge"]["settings"]["max_char_count"]
 		except VdtValueTooBigError:
@@ -144,7 +155,44 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 			max_char_count = int(config.conf.getConfigValidation(
 				("WordBridge", "settings", "max_char_count")
 			).kwargs["min"])
-		if len(text) > max_char_count:
+		return max_char_count
+
+	def getCorrectorRoute(self, corrector_config_id, corrector_mode):
+		"""
+		Describe another local corrector for the workflow, or return None when it is unavailable or has no API key.
+		"""
+		route_config = configManager.get_config(corrector_config_id)
+		if route_config is None or not route_config.active:
+			return None
+
+		provider = route_config.provider
+		api_keys = config.conf["WordBridge"]["settings"]["api_key"]
+		api_key = api_keys[provider] if provider in api_keys else ""
+		if not api_key:
+			return None
+		return {
+			"provider_name": provider,
+			"model_name": route_config.model,
+			"credential": {"api_key": api_key},
+			"template_name": route_config.template_name[corrector_mode],
+			"optional_guidance_enable": route_config.optional_guidance_enable,
+		}
+
+	def isLongDocumentModeAvailable(self):
+		if not config.conf["WordBridge"]["settings"]["long_document_enable"]:
+			return False
+		_corrector_config_id, execution_channel, _corrector_config = normalize_selection(
+			configManager,
+			config.conf["WordBridge"]["settings"]["corrector_config_id"],
+			config.conf["WordBridge"]["settings"]["execution_channel"],
+		)
+		return execution_channel == "local"
+
+	def isTextValid(self, text):
+		from hanzidentifier import has_chinese
+
+		max_char_count = self.getMaxCharCount()
+		if len(text) > max_char_count and not self.isLongDocumentModeAvailable():
 			ui.message(
 				_("The number of characters is {len_text}, which exceeds the maximum, {max_char_count}.").format(
 					len_text=len(text),
@@ -169,15 +217,6 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 
 		return True
 
-	def readDictionary(self):
-		dictionary_path = os.path.join(PATH, "dictionary", "data.csv")
-		if not os.path.exists(dictionary_path):
-			open(dictionary_path, 'w', encoding='utf-8').close()
-		with open(dictionary_path, encoding='utf8', newline='') as csvfile:
-			reader = csv.DictReader(csvfile)
-			word_list = list(reader)
-		return word_list
-
 	def isNVDASettingsDialogCreate(self):
 		create_state = gui.settingsDialogs.NVDASettingsDialog.DialogState.CREATED
 		for dlg, state in gui.settingsDialogs.NVDASettingsDialog._instances.items():
@@ -185,7 +224,14 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 				return True
 		return False
 
-	def correctTypo(self, request):
+	def correctTypo(self, request, job_id=None):
+		# Loads whatever the background prewarming has not reached yet.
+		self.prewarmer.ensure_ready()
+		from .lib.application.long_document import run_long_document_typo_correction
+		from .lib.application.task_runner import run_incremental_typo_correction, run_typo_correction
+		from .lib.llm.budget import CorrectionBudget
+		from .lib.tasks.typo.utils import strings_diff
+
 		corrector_config_id = config.conf["WordBridge"]["settings"]["corrector_config_id"]
 		execution_channel = config.conf["WordBridge"]["settings"]["execution_channel"]
 		corrector_config_id, execution_channel, corrector_config = normalize_selection(
@@ -203,21 +249,37 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 		optional_guidance_enable = corrector_config.optional_guidance_enable
 
 		if config.conf["WordBridge"]["settings"]["customized_words_enable"]:
-			customized_words = [row["text"] for row in self.readDictionary()]
+			customized_words = get_dictionary_service().get_vocabulary()
 		else:
 			customized_words = []
+		if config.conf["WordBridge"]["settings"]["skip_plausible_segments"]:
+			skip_confidence_threshold = SKIP_CONFIDENCE_THRESHOLD_DEFAULT
+		else:
+			skip_confidence_threshold = None
 		if execution_channel == "local":
 			if provider not in config.conf["WordBridge"]["settings"]["api_key"]:
 				config.conf["WordBridge"]["settings"]["api_key"][provider] = ""
 			credential = {
 				"api_key": config.conf["WordBridge"]["settings"]["api_key"][provider],
 			}
-
+			first_pass = None
+			if config.conf["WordBridge"]["settings"]["cascade_enable"]:
+				first_pass = self.getCorrectorRoute(corrector_config.first_pass_corrector_config_id, corrector_mode)
+			fallback = self.getCorrectorRoute(corrector_config.fallback_corrector_config_id, corrector_mode)
+			if fallback is not None:
+				# The fallback reuses the main corrector's prompt, so only its endpoint is needed.
+				fallback = {key: fallback[key] for key in ("provider_name", "model_name", "credential")}
+
+			max_char_count = self.getMaxCharCount()
+			memory_key = (corrector_config_id, language, corrector_mode, tuple(customized_words))
+			previous = None
+			if len(request) <= max_char_count:
+				previous = self.correction_memory.find_closest(memory_key, request)
+			max_cost = config.conf["WordBridge"]["settings"]["max_cost_per_run"]
+			budget = CorrectionBudget(max_cost=max_cost) if max_cost else None
 			try:
 				batch_mode = not DEBUG_MODE
-				result = run_typo_correction(
-					request=request,
-					batch_mode=batch_mode,
+				workflow_kwargs = dict(
 					provider_name=provider,
 					model_name=model_name,
 					credential=credential,
@@ -228,69 +290,123 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 					customized_words=customized_words,
 					retries=2,
 					backoff=1,
+					skip_confidence_threshold=skip_confidence_threshold,
+					typo_detection=config.conf["WordBridge"]["settings"]["detect_suspected_typos"],
+					stream_responses=config.conf["WordBridge"]["settings"]["stream_responses"],
+					keep_response_history=False,
+					budget=budget,
+					first_pass=first_pass,
+					fallback=fallback,
 				)
+				if len(request) > max_char_count:
+					result = run_long_document_typo_correction(
+						request=request,
+						window_size=max_char_count,
+						batch_mode=batch_mode,
+						on_progress=self.reportLongDocumentProgress,
+						**workflow_kwargs,
+					)
+				elif previous is not None:
+					result = run_incremental_typo_correction(
+						request=request,
+						previous=previous,
+						batch_mode=batch_mode,
+						**workflow_kwargs,
+					)
+				else:
+					result = run_typo_correction(request=request, batch_mode=batch_mode, **workflow_kwargs)
 			except Exception as e:
 				ui.message(_("Sorry, an error occurred during the program execution, the details are: {e}").format(e=e))
-				log.warning(_("Sorry, an error occurred during the program execution, the details are: {e}").format(e=e))
-				raise e
+				log.exception(_("Sorry, an error occurred during the program execution, the details are: {e}").format(e=e))
 				return
 			response = result.corrected_text
+			diff = result.diff
 			interaction_id = None
 			cost = result.cost
+			budget_exhausted = budget is not None and budget.exhausted
+			# A correction cut short by the cost limit is not worth reusing.
+			if len(request) <= max_char_count and not budget_exhausted:
+				self.correction_memory.remember(memory_key, request, response, diff)
+			if result.telemetry:
+				log.info(f"WordBridge telemetry: {result.telemetry}")
+			if budget_exhausted:
+				ui.message(_("The cost limit was reached, so some segments were left as they were."))
+			for tier in result.tiers:
+				log.info(f"WordBridge tier: {tier}")
 		else:
-			try:
-				access_token = obtain_openai_key(
-					COSEEING_BASE_URL,
-					config.conf["WordBridge"]["settings"]["coseeing_username"],
-					config.conf["WordBridge"]["settings"]["coseeing_password"],
-				)
-			except Exception as e:
-				access_token = ""
-				# ui.message(_("Sorry, an error occurred while logging into Coseeing, the details are: {e}").format(e=e))
-				# log.warning(_("Sorry, an error occurred while logging into Coseeing, the details are: {e}").format(e=e))
-				# return
-
 			data = {
 				"request": request,
 				"corrector_config_id": corrector_config_id,
 				"language": language,
-				"typo_correction_mode": corrector_mode,
-				"customized_words": customized_words,
-			}
-			headers = {
-				"Authorization": f"Bearer {access_token}",
+				# The proofreader service only knows the full-text modes.
+				"typo_correction_mode": "standard" if corrector_mode == "edit" else corrector_mode,
+				"customized_words": [word.text for word in customized_words],
 			}
+			self.proofreader_progress_time = time.time()
 			try:
-				data = requests.post(f"{COSEEING_BASE_URL}/proofreader", headers=headers, json=data, timeout=120)
-				result = data.json()
-			except requests.exceptions.JSONDecodeError as e:
+				# The timeout applies between streamed events, so a long document is fine as long as segments keep arriving.
+				data = self.coseeing_token_manager.post(
+					"/proofreader",
+					config.conf["WordBridge"]["settings"]["coseeing_username"],
+					config.conf["WordBridge"]["settings"]["coseeing_password"],
+					json={**data, "stream": True},
+					headers={"Accept": f"{NDJSON_CONTENT_TYPE}, application/json"},
+					timeout=120,
+					stream=True,
+				)
+				try:
+					if data.status_code == 401:
+						ui.message(_("Authentication error. Please check if the Coseeing's username and password is correct."))
+						return
+					elif data.status_code == 429:
+						ui.message(
+							_("Rate limit reached for requests or you exceeded your current quota. ") +\
+							_("Please reduce the frequency of sending requests or check your account balance.")
+						)
+						return
+					result = read_proofreader_response(data, on_progress=self.reportProofreaderProgress)
+				finally:
+					# The reply is streamed, so its connection stays open until it is closed.
+					data.close()
+			except ValueError as e:
 				ui.message(_("Sorry, an error occurred while decode Coseeing response, the details are: {e}").format(e=e))
 				return
 			except requests.exceptions.Timeout:
 				ui.message(_("The request has not responded for over 2 minutes, possibly because the Coseeing server is busy. Please try again later."))
 				return
-			if data.status_code == 401:
-				ui.message(_("Authentication error. Please check if the Coseeing's username and password is correct."))
+			except CoseeingError as e:
+				ui.message(_("Sorry, an error occurred during the program execution, the details are: {e}").format(e=e))
+				log.warning(_("Sorry, an error occurred during the program execution, the details are: {e}").format(e=e))
 				return
-			elif data.status_code == 429:
+			except requests.exceptions.RequestException as e:
 				ui.message(
-					_("Rate limit reached for requests or you exceeded your current quota. ") +\
-					_("Please reduce the frequency of sending requests or check your account balance.")
+					_("HTTP request error ({request_error}). Please check the network setting.").format(
+						request_error=type(e).__name__
+					)
 				)
+				log.warning(f"Coseeing request failed: {e}")
 				return
 			response = result["response"]
+			diff = strings_diff(request, response)
 			interaction_id = result["interaction_id"]
 			cost = result["cost"]
 
-		diff = strings_diff(request, response)
-
-		self.latest_action = {
+		action = {
 			"request": request,
 			"response": response,
 			"diff": diff,
 			"interaction_id": interaction_id,
+			"job_id": job_id,
 		}
+		self.latest_action = action
+
+		# The worker thread only hands the result over; announcing and clipboard access happen on the main thread.
+		wx.CallAfter(self.announceResult, action, cost)
+		return action
 
+	def announceResult(self, action, cost):
+		request = action["request"]
+		response = action["response"]
 		if request == response:
 			ui.message(_("No errors in the selected text."))
 			log.warning(_("No errors in the selected text."))
@@ -308,30 +424,71 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 		log.warning(_("This task costs {cost} USD.").format(cost=cost))
 
 		if config.conf["WordBridge"]["settings"]["auto_display_report"]:
-			self.showReport(self.latest_action["diff"])
+			self.showReport(action["diff"], action["job_id"])
+
+	def reportLongDocumentProgress(self, progress):
+		ui.message(
+			_("Proofread {processed_chars} of {total_chars} characters.").format(
+				processed_chars=progress.processed_chars,
+				total_chars=progress.total_chars,
+			)
+		)
+
+	def reportProofreaderProgress(self, progress):
+		# Segments can finish in quick succession; announce at most every few seconds.
+		if time.time() - self.proofreader_progress_time < 3:
+			return
+		self.proofreader_progress_time = time.time()
+		if progress.total:
+			ui.message(
+				_("Proofread {count} of {total} segments.").format(count=progress.index + 1, total=progress.total)
+			)
+		else:
+			ui.message(
+				_("Proofread {char_count} characters.").format(char_count=len(progress.partial_response))
+			)
+
+	def runCorrectionJob(self, job):
+		return self.correctTypo(job.request, job_id=job.id)
+
+	def reportCorrectionJobFailure(self, job):
+		ui.message(
+			_("Proofreading task {job_id} failed, the details are: {e}").format(job_id=job.id, e=job.error)
+		)
 
 	def correctionAction(self, text):
-		if self.correct_typo_thread and self.correct_typo_thread.is_alive():
-			ui.message(_("Only one proofreading task can run at a time. Please wait until the current task has finished before starting another."))
+		job = self.correction_jobs.submit(text)
+		if job is None:
+			ui.message(_("Too many proofreading tasks are waiting. Please try again after some of them have finished."))
 			return
 
-		self.correct_typo_thread = threading.Thread(target=self.correctTypo, args=(text,))
-		self.correct_typo_thread.start()
+		# Whichever action holds the lock plays the progress sound until every queued task has finished.
+		while not self.correction_jobs.idle.is_set():
+			if not self.progress_sound_lock.acquire(blocking=False):
+				ui.message(_("Proofreading task {job_id} has been queued.").format(job_id=job.id))
+				return
+			try:
+				self.playProgressSound(self.correction_jobs.idle)
+			finally:
+				self.progress_sound_lock.release()
 
-		while self.correct_typo_thread.is_alive():
+	def playProgressSound(self, correction_done):
+		# Every wait returns as soon as the corrections finish, so the sound never outlasts the tasks.
+		while not correction_done.is_set():
 			if config.conf["WordBridge"]["settings"]["sound_effects_enable"]:
 				nvwave.playWaveFile(
 					os.path.join(os.path.dirname(__file__), "sounds", "zapsplat_nature_water_underwater_whoosh_movement_pass_med_designed_001_59240.wav"),
-					asynchronous=False,
+					asynchronous=True,
 				)
-				time.sleep(5)
-			else:
-				time.sleep(1)
+				# The clip lasts about four seconds and is followed by five seconds of silence.
+				correction_done.wait(9)
+			elif not correction_done.wait(1):
 				beep(261.6, 300)
-				time.sleep(1)
-
+				correction_done.wait(1)
 
-		self.correct_typo_thread = None
+		player = getattr(nvwave, "fileWavePlayer", None)
+		if player is not None:
+			player.stop()
 
 	@script(
 		gesture="kb:NVDA+alt+d",
@@ -385,7 +542,55 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 			log.warning(_("No report has been generated yet."))
 			return
 
-		self.showReport(self.latest_action["diff"])
+		self.showReport(self.latest_action["diff"], self.latest_action["job_id"])
+
+	@script(
+		gesture="kb:NVDA+alt+j",
+		description=_("Announce the status of proofreading tasks"),
+		category=ADDON_SUMMARY,
+	)
+	def script_announceCorrectionJobs(self, gesture):
+		jobs = self.correction_jobs.list_jobs()
+		if not jobs:
+			ui.message(_("No proofreading task has been run yet."))
+			return
+
+		status_names = {
+			JOB_RUNNING: _("running"),
+			JOB_DONE: _("done"),
+			JOB_FAILED: _("failed"),
+		}
+		ui.message("; ".join(
+			_("Task {job_id}: {status}").format(job_id=job.id, status=status_names.get(job.status, _("queued")))
+			for job in reversed(jobs)
+		))
+
+	@script(
+		gesture="kb:NVDA+alt+shift+j",
+		description=_("Choose a finished proofreading task to copy its corrected text and show its report"),
+		category=ADDON_SUMMARY,
+	)
+	def script_reviewCorrectionJob(self, gesture):
+		jobs = [job for job in reversed(self.correction_jobs.list_jobs()) if job.status == JOB_DONE]
+		if not jobs:
+			ui.message(_("No proofreading task has finished yet."))
+			return
+
+		def show():
+			choices = [
+				_("Task {job_id}: {request}").format(job_id=job.id, request=job.request[:30])
+				for job in jobs
+			]
+			with wx.SingleChoiceDialog(gui.mainFrame, _("Proofreading task:"), _("Proofreading tasks"), choices) as dialog:
+				if dialog.ShowModal() != wx.ID_OK:
+					return
+				action = jobs[dialog.GetSelection()].result
+
+			api.copyToClip(action["response"])
+			ui.message(_("The corrected text has been copied to the clipboard."))
+			self.showReport(action["diff"], action["job_id"])
+
+		wx.CallAfter(show)
 
 	@script(
 		gesture="kb:NVDA+alt+f",
@@ -411,26 +616,17 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 				if not feedback_value:
 					return
 
-			try:
-				access_token = obtain_openai_key(
-					COSEEING_BASE_URL,
-					config.conf["WordBridge"]["settings"]["coseeing_username"],
-					config.conf["WordBridge"]["settings"]["coseeing_password"],
-				)
-			except Exception as e:
-				ui.message(_("Sorry, an error occurred while logging into Coseeing, the details are: {e}").format(e=e))
-				log.warning(_("Sorry, an error occurred while logging into Coseeing, the details are: {e}").format(e=e))
-				return
-
 			data = {
 				"interaction_id": self.latest_action["interaction_id"],
 				"review_content": feedback_value,
 			}
-			headers = {
-				"Authorization": f"Bearer {access_token}",
-			}
 			try:
-				result = requests.post(f"{COSEEING_BASE_URL}/feedback", headers=headers, json=data).json()
+				result = self.coseeing_token_manager.post(
+					"/feedback",
+					config.conf["WordBridge"]["settings"]["coseeing_username"],
+					config.conf["WordBridge"]["settings"]["coseeing_password"],
+					json=data,
+				).json()
 			except Exception as e:
 				ui.message(_("Sorry, an error occurred during the feedback request, the details are: {e}").format(e=e))
 				log.warning(_("Sorry, an error occurred during the program execution, the details are: {e}").format(e=e))
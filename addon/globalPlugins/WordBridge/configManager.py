@@ -79,6 +79,8 @@ class CorrectorConfig:
 	coseeing: bool
 	template_name: dict
 	optional_guidance_enable: dict
+	first_pass_corrector_config_id: str | None = None
+	fallback_corrector_config_id: str | None = None
 
 	@property
 	def corrector_config_id(self) -> str:
@@ -117,6 +119,8 @@ class ConfigManager:
 				coseeing=raw_config["coseeing"],
 				template_name=raw_config["template_name"],
 				optional_guidance_enable=raw_config["optional_guidance_enable"],
+				first_pass_corrector_config_id=raw_config.get("first_pass_corrector_config_id"),
+				fallback_corrector_config_id=raw_config.get("fallback_corrector_config_id"),
 			)
 			if config.corrector_config_id in self.config_by_id:
 				raise ValueError(f"Duplicate corrector config id: {config.corrector_config_id}")
@@ -23,6 +23,7 @@ LABEL_DICT = {
 	"zh_simplified": _("Simplified Chinese"),
 	"standard": _("Standard"),
 	"lite": _("Lite"),
+	"edit": _("Edit list"),
 	"personal_api_key": _("Personal API Key"),
 	"coseeing_account": _("Coseeing Account"),
 }
@@ -38,7 +39,7 @@ TYPO_CORRECTION_MODE_DEFAULT = "standard"
 LANGUAGE_VALUES = ["zh_traditional", "zh_simplified"]
 LANGUAGE_LABELS = [LABEL_DICT[val] for val in LANGUAGE_VALUES]
 
-TYPO_CORRECTION_MODE_VALUES = ["standard", "lite"]
+TYPO_CORRECTION_MODE_VALUES = ["standard", "lite", "edit"]
 TYPO_CORRECTION_MODE_LABELS = [LABEL_DICT[val] for val in TYPO_CORRECTION_MODE_VALUES]
 
 SOUND_EFFECTS_URL = "https://www.zapsplat.com/music/medium-underwater-movement-whoosh-pass-by-1/"
@@ -191,6 +192,25 @@ class LLMSettingsPanel(SettingsPanel):
 			initial=maxCharCount
 		)
 
+		# For proofreading selections longer than the max character count window by window
+		self.longDocumentEnable = settingsSizerHelper.addItem(
+			wx.CheckBox(self, label=_("Proofread longer selections in windows of the max character count"))
+		)
+		self.longDocumentEnable.SetValue(config.conf["WordBridge"]["settings"]["long_document_enable"])
+
+		# For capping what one correction may spend; 0 means no limit
+		maxCostUpperBound = float(config.conf.getConfigValidation(
+			("WordBridge", "settings", "max_cost_per_run")
+		).kwargs["max"])
+		self.maxCostSpinCtrl = settingsSizerHelper.addLabeledControl(
+			_("Maximum cost per correction in USD (0 for no limit)"),
+			wx.SpinCtrlDouble,
+			min=0,
+			max=maxCostUpperBound,
+			initial=config.conf["WordBridge"]["settings"]["max_cost_per_run"],
+			inc=0.01,
+		)
+
 		# For setting auto display typo report
 		self.autoDisplayReportEnable = settingsSizerHelper.addItem(
 			wx.CheckBox(self, label=_("Auto display typo report"))
@@ -211,6 +231,30 @@ class LLMSettingsPanel(SettingsPanel):
 		)
 		self.wordDictionaryCtrl.Bind(wx.EVT_BUTTON, self.onEditDictionary)
 
+		# For skipping segments that the local language model considers correct
+		self.skipPlausibleSegmentsEnable = settingsSizerHelper.addItem(
+			wx.CheckBox(self, label=_("Skip segments that look correct without querying the model"))
+		)
+		self.skipPlausibleSegmentsEnable.SetValue(config.conf["WordBridge"]["settings"]["skip_plausible_segments"])
+
+		# For marking suspected typos locally before the first request
+		self.detectSuspectedTyposEnable = settingsSizerHelper.addItem(
+			wx.CheckBox(self, label=_("Mark suspected typos locally before querying the model"))
+		)
+		self.detectSuspectedTyposEnable.SetValue(config.conf["WordBridge"]["settings"]["detect_suspected_typos"])
+
+		# For streaming responses and stopping them once the model starts explaining
+		self.streamResponsesEnable = settingsSizerHelper.addItem(
+			wx.CheckBox(self, label=_("Stream responses and stop them when the model goes off track"))
+		)
+		self.streamResponsesEnable.SetValue(config.conf["WordBridge"]["settings"]["stream_responses"])
+
+		# For letting a cheaper model read every segment first and escalating only the ones it changes
+		self.cascadeEnable = settingsSizerHelper.addItem(
+			wx.CheckBox(self, label=_("Check with a faster model first and escalate only disputed segments"))
+		)
+		self.cascadeEnable.SetValue(config.conf["WordBridge"]["settings"]["cascade_enable"])
+
 		# For setting sound effects
 		self.soundEffectsEnable = settingsSizerHelper.addItem(
 			wx.CheckBox(self, label=_("Enable sound effect cues"))
@@ -255,8 +299,14 @@ class LLMSettingsPanel(SettingsPanel):
 		config.conf["WordBridge"]["settings"]["language"] = LANGUAGE_VALUES[self.languageList.GetSelection()]
 		config.conf["WordBridge"]["settings"]["typo_correction_mode"] = TYPO_CORRECTION_MODE_VALUES[self.typoCorrectionModeList.GetSelection()]
 		config.conf["WordBridge"]["settings"]["max_char_count"] = self.maxCharCountSpinCtrl.GetValue()
+		config.conf["WordBridge"]["settings"]["long_document_enable"] = self.longDocumentEnable.GetValue()
+		config.conf["WordBridge"]["settings"]["max_cost_per_run"] = self.maxCostSpinCtrl.GetValue()
 		config.conf["WordBridge"]["settings"]["auto_display_report"] = self.autoDisplayReportEnable.GetValue()
 		config.conf["WordBridge"]["settings"]["customized_words_enable"] = self.customizedWordEnable.GetValue()
+		config.conf["WordBridge"]["settings"]["skip_plausible_segments"] = self.skipPlausibleSegmentsEnable.GetValue()
+		config.conf["WordBridge"]["settings"]["detect_suspected_typos"] = self.detectSuspectedTyposEnable.GetValue()
+		config.conf["WordBridge"]["settings"]["stream_responses"] = self.streamResponsesEnable.GetValue()
+		config.conf["WordBridge"]["settings"]["cascade_enable"] = self.cascadeEnable.GetValue()
 		config.conf["WordBridge"]["settings"]["sound_effects_enable"] = self.soundEffectsEnable.GetValue()
 
 		config.conf["WordBridge"]["settings"]["coseeing_username"] = self.accountTextCtrlMap1["Coseeing"].GetValue()
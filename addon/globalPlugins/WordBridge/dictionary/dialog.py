@@ -3,8 +3,8 @@ from gui import guiHelper, nvdaControls
 from gui.settingsDialogs import SettingsDialog
 import wx
 import addonHandler
-import csv
-import os
+
+from ..lib.application.dictionary import get_dictionary_service
 
 
 addonHandler.initTranslation()
@@ -83,15 +83,8 @@ class DictionaryEntryDialog(SettingsDialog):
 	helpId = "WordBridgeDictionary"
 
 	def __init__(self, parent):
-		self.path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data.csv')
-		data = []
-		if not os.path.exists(self.path):
-			open(self.path, 'w', encoding='utf-8').close()
-		with open(self.path, 'r', encoding='utf-8') as file:
-			reader = csv.DictReader(file)
-			for row in reader:
-				data.append(row)
-		self.data = data
+		self.dictionary_service = get_dictionary_service()
+		self.data = self.dictionary_service.get_rows()
 
 		self.title = _("WordBridge Dictionary")
 		super(DictionaryEntryDialog, self).__init__(
@@ -360,12 +353,7 @@ class DictionaryEntryDialog(SettingsDialog):
 				"text": word.text,
 				"pronunciation": word.pronunciation,
 			})
-
-		with open(self.path, 'w', encoding='utf-8', newline='') as file:
-			writer = csv.DictWriter(file, fieldnames=["text", "pronunciation"])
-			writer.writeheader()
-			for row in data:
-				writer.writerow(row)
+		self.dictionary_service.save(data)
 
 		super(DictionaryEntryDialog, self).onOk(evt)
 
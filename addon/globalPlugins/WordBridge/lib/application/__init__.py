@@ -1,2 +1,23 @@
-from .task_factory import create_typo_workflow
-from .task_runner import run_typo_correction
+from importlib import import_module
+
+# Exports are imported on first use, so that loading the add-on does not pull in the language data behind them.
+_EXPORTS = {
+	"DictionaryService": ".dictionary",
+	"get_dictionary_service": ".dictionary",
+	"CorrectionMemory": ".incremental",
+	"CorrectionJobQueue": ".jobs",
+	"run_long_document_typo_correction": ".long_document",
+	"stream_typo_correction": ".long_document",
+	"ModulePrewarmer": ".prewarm",
+	"create_typo_workflow": ".task_factory",
+	"run_incremental_typo_correction": ".task_runner",
+	"run_typo_correction": ".task_runner",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+	if name not in _EXPORTS:
+		raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+	return getattr(import_module(_EXPORTS[name], __name__), name)
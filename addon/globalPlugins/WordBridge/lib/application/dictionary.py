@@ -0,0 +1,91 @@
+import csv
+import os
+from threading import Lock
+
+PATH = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+DICTIONARY_PATH = os.path.join(PATH, "dictionary", "data.csv")
+FIELDNAMES = ["text", "pronunciation"]
+
+
+class DictionaryService:
+	"""
+	Keep the personal dictionary in memory, reloading data.csv only when it changes on disk.
+
+	The words are returned as a CustomVocabulary whose pinyin and matching index are precomputed, so a
+	correction does no dictionary work of its own.
+	"""
+	def __init__(self, path: str = DICTIONARY_PATH):
+		self.path = path
+		self._lock = Lock()
+		self._signature = None
+		self._rows = ()
+		self._vocabulary = None
+
+	def _get_file_signature(self):
+		try:
+			stat = os.stat(self.path)
+		except FileNotFoundError:
+			return ()
+		return (stat.st_mtime_ns, stat.st_size)
+
+	def _load(self):
+		signature = self._get_file_signature()
+		if signature == self._signature:
+			return
+
+		rows = []
+		if signature:
+			with open(self.path, encoding="utf8", newline="") as csvfile:
+				for row in csv.DictReader(csvfile):
+					rows.append({"text": row.get("text") or "", "pronunciation": row.get("pronunciation") or ""})
+		self._set_rows(rows, signature)
+
+	def _set_rows(self, rows: list, signature):
+		self._rows = tuple(rows)
+		self._vocabulary = None
+		self._signature = signature
+
+	def get_rows(self) -> list:
+		with self._lock:
+			self._load()
+			return [dict(row) for row in self._rows]
+
+	def get_vocabulary(self):
+		# Imported here so that the dictionary dialog can read and save words without loading the pinyin data.
+		from ..tasks.typo.vocabulary import CustomVocabulary, create_custom_word
+
+		with self._lock:
+			self._load()
+			if self._vocabulary is None:
+				self._vocabulary = CustomVocabulary(
+					create_custom_word(row["text"], row["pronunciation"]) for row in self._rows if row["text"]
+				)
+			return self._vocabulary
+
+	def get_words(self) -> tuple:
+		return self.get_vocabulary().words
+
+	def save(self, rows: list):
+		rows = [{"text": row["text"], "pronunciation": row.get("pronunciation") or ""} for row in rows]
+		with self._lock:
+			with open(self.path, "w", encoding="utf-8", newline="") as csvfile:
+				writer = csv.DictWriter(csvfile, fieldnames=FIELDNAMES)
+				writer.writeheader()
+				writer.writerows(rows)
+			self._set_rows(rows, self._get_file_signature())
+
+	def invalidate(self):
+		with self._lock:
+			self._signature = None
+
+
+_dictionary_service = None
+_dictionary_service_lock = Lock()
+
+
+def get_dictionary_service() -> DictionaryService:
+	global _dictionary_service
+	with _dictionary_service_lock:
+		if _dictionary_service is None:
+			_dictionary_service = DictionaryService()
+		return _dictionary_service
@@ -0,0 +1,108 @@
+from collections import deque
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from threading import Lock
+
+
+@dataclass(frozen=True)
+class CorrectionRecord:
+	key: tuple
+	request: str
+	response: str
+	diff: list
+
+
+@dataclass(frozen=True)
+class SegmentPlan:
+	text: str
+	reused_text: str | None
+
+	@property
+	def is_dirty(self) -> bool:
+		return self.reused_text is None
+
+
+class CorrectionMemory:
+	"""
+	Keep the most recent (request, response, diff) triples so an edited document can be re-proofread incrementally.
+	"""
+	def __init__(self, max_size: int = 8, min_similarity: float = 0.5):
+		self.min_similarity = min_similarity
+		self._records = deque(maxlen=max_size)
+		self._lock = Lock()
+
+	def remember(self, key: tuple, request: str, response: str, diff: list):
+		# Only character-aligned corrections can be spliced, which is what the local workflow produces.
+		if len(request) != len(response):
+			return
+		with self._lock:
+			self._records = deque(
+				(record for record in self._records if not (record.key == key and record.request == request)),
+				maxlen=self._records.maxlen,
+			)
+			self._records.append(CorrectionRecord(key, request, response, diff))
+
+	def find_closest(self, key: tuple, request: str) -> CorrectionRecord | None:
+		with self._lock:
+			records = [record for record in self._records if record.key == key]
+
+		best_record = None
+		best_ratio = self.min_similarity
+		for record in records:
+			matcher = SequenceMatcher(None, record.request, request, autojunk=False)
+			if matcher.quick_ratio() < best_ratio:
+				continue
+			ratio = matcher.ratio()
+			if ratio >= best_ratio:
+				best_record = record
+				best_ratio = ratio
+
+		return best_record
+
+	def clear(self):
+		with self._lock:
+			self._records.clear()
+
+
+def plan_incremental_correction(request: str, previous: CorrectionRecord, max_length: int = 100) -> list:
+	"""
+	Split the request into workflow segments and reuse the previous correction of every segment left untouched by the edit.
+	"""
+	# Imported here so that the add-on can create a CorrectionMemory without loading the pinyin dictionaries.
+	from ..tasks.typo.utils import text_segmentation
+
+	matcher = SequenceMatcher(None, previous.request, request, autojunk=False)
+	blocks = [block for block in matcher.get_matching_blocks() if block.size]
+
+	plans = []
+	start = 0
+	for segment in text_segmentation(request, max_length=max_length):
+		end = start + len(segment)
+		reused_text = None
+		for block in blocks:
+			if block.b <= start and end <= block.b + block.size:
+				previous_start = block.a + (start - block.b)
+				reused_text = previous.response[previous_start:previous_start + len(segment)]
+				break
+		plans.append(SegmentPlan(segment, reused_text))
+		start = end
+
+	return plans
+
+
+def group_dirty_regions(plans: list) -> list:
+	"""
+	Merge consecutive dirty segments into regions so that each region keeps the original segment boundaries.
+	"""
+	regions = []
+	region = ""
+	for plan in plans:
+		if plan.is_dirty:
+			region += plan.text
+			continue
+		if region:
+			regions.append(region)
+			region = ""
+	if region:
+		regions.append(region)
+	return regions
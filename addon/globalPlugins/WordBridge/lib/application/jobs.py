@@ -0,0 +1,130 @@
+import itertools
+import logging
+import queue
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from threading import Event, Lock, Thread
+from typing import Any
+
+log = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+@dataclass
+class CorrectionJob:
+	id: int
+	request: str
+	status: str = JOB_QUEUED
+	result: Any = None
+	error: Exception | None = None
+	finished: Event = field(default_factory=Event, repr=False)
+
+	def wait(self, timeout: float | None = None) -> bool:
+		return self.finished.wait(timeout)
+
+
+class CorrectionJobQueue:
+	"""
+	Run correction jobs on a small pool of worker threads.
+
+	At most max_pending jobs wait in the queue; the most recent history_size jobs are kept with their status
+	and result so they can be looked up after they finish. A handler returning None has already reported its
+	failure, so the job is marked failed; an exception is logged and passed to on_failure.
+	"""
+	def __init__(
+		self,
+		handler: Callable[[CorrectionJob], Any],
+		max_workers: int = 2,
+		max_pending: int = 8,
+		history_size: int = 20,
+		on_failure: Callable[[CorrectionJob], None] | None = None,
+	):
+		self.handler = handler
+		self.on_failure = on_failure
+		self.max_workers = max_workers
+		self.max_pending = max_pending
+		self.idle = Event()
+		self.idle.set()
+		self._queue = queue.Queue()
+		self._jobs = deque(maxlen=history_size)
+		self._job_ids = itertools.count(1)
+		self._active_count = 0
+		self._workers = []
+		self._lock = Lock()
+
+	def submit(self, request: str) -> CorrectionJob | None:
+		"""
+		Queue a job, or return None if the queue is full.
+		"""
+		with self._lock:
+			if self._queue.qsize() >= self.max_pending:
+				return None
+			job = CorrectionJob(id=next(self._job_ids), request=request)
+			self._queue.put(job)
+			self._jobs.append(job)
+			self._active_count += 1
+			self.idle.clear()
+			if len(self._workers) < self.max_workers:
+				worker = Thread(target=self._work, daemon=True)
+				self._workers.append(worker)
+				worker.start()
+		return job
+
+	def get_job(self, job_id: int) -> CorrectionJob | None:
+		with self._lock:
+			for job in self._jobs:
+				if job.id == job_id:
+					return job
+		return None
+
+	def list_jobs(self) -> list:
+		with self._lock:
+			return list(self._jobs)
+
+	def shutdown(self):
+		"""
+		Drop the jobs still waiting and stop the workers once their current job is done.
+		"""
+		with self._lock:
+			while True:
+				try:
+					job = self._queue.get_nowait()
+				except queue.Empty:
+					break
+				job.status = JOB_FAILED
+				job.error = RuntimeError("The job queue was shut down.")
+				job.finished.set()
+				self._active_count -= 1
+			if self._active_count == 0:
+				self.idle.set()
+			for _ in self._workers:
+				self._queue.put(None)
+			self._workers = []
+
+	def _work(self):
+		while True:
+			job = self._queue.get()
+			if job is None:
+				return
+
+			job.status = JOB_RUNNING
+			try:
+				job.result = self.handler(job)
+				job.status = JOB_DONE if job.result is not None else JOB_FAILED
+			except Exception as e:
+				log.exception("Proofreading task %d failed", job.id)
+				job.error = e
+				job.status = JOB_FAILED
+				if self.on_failure is not None:
+					self.on_failure(job)
+			finally:
+				job.finished.set()
+				with self._lock:
+					self._active_count -= 1
+					if self._active_count == 0:
+						self.idle.set()
@@ -0,0 +1,135 @@
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from decimal import Decimal
+
+from . import task_factory
+from ..tasks.typo.result import TypoCorrectionResult
+from ..tasks.typo.utils import iter_text_segments
+
+
+@dataclass(frozen=True)
+class DocumentWindow:
+	index: int
+	start: int
+	text: str
+
+
+@dataclass(frozen=True)
+class CorrectionChunk:
+	index: int
+	start: int
+	original_text: str
+	corrected_text: str
+	diff: list
+	cost: Decimal
+	usage_summary: dict
+
+
+@dataclass(frozen=True)
+class CorrectionProgress:
+	window_count: int
+	processed_chars: int
+	total_chars: int | None
+	usage_summary: dict
+	cost: Decimal
+
+
+def iter_document_windows(chunks: Iterable[str], window_size: int = 2000, max_length: int = 100) -> Iterator[DocumentWindow]:
+	"""
+	Group the workflow's own segments into windows of about window_size characters.
+
+	Windows only end on segment boundaries, so segmenting a window again yields exactly the segments the
+	whole document would have produced and no segment straddles two windows.
+	"""
+	index = 0
+	start = 0
+	window = ""
+	for segment in iter_text_segments(chunks, max_length=max_length):
+		if window and len(window) + len(segment) > window_size:
+			yield DocumentWindow(index, start, window)
+			index += 1
+			start += len(window)
+			window = ""
+		window += segment
+
+	if window:
+		yield DocumentWindow(index, start, window)
+
+
+def stream_typo_correction(
+	*,
+	chunks: Iterable[str],
+	window_size: int = 2000,
+	batch_mode: bool = True,
+	total_chars: int | None = None,
+	on_progress: Callable[[CorrectionProgress], None] | None = None,
+	**workflow_kwargs,
+) -> Iterator[CorrectionChunk]:
+	"""
+	Correct a document window by window, yielding each corrected window and its diff as soon as it is ready.
+	Only the current window is held in memory.
+	"""
+	workflow = task_factory.create_typo_workflow(**workflow_kwargs)
+
+	cost = Decimal("0")
+	processed_chars = 0
+	for window in iter_document_windows(chunks, window_size=window_size):
+		result = workflow.run(window.text, batch_mode=batch_mode)
+		# The workflow reports the running totals of its executor, so the window cost is the increase.
+		window_cost = result.cost - cost
+		cost = result.cost
+		processed_chars += len(window.text)
+
+		if on_progress is not None:
+			on_progress(
+				CorrectionProgress(
+					window_count=window.index + 1,
+					processed_chars=processed_chars,
+					total_chars=total_chars,
+					usage_summary=result.usage_summary,
+					cost=cost,
+				)
+			)
+
+		yield CorrectionChunk(
+			index=window.index,
+			start=window.start,
+			original_text=window.text,
+			corrected_text=result.corrected_text,
+			diff=result.diff,
+			cost=window_cost,
+			usage_summary=result.usage_summary,
+		)
+
+
+def run_long_document_typo_correction(
+	*,
+	request: str,
+	window_size: int = 2000,
+	batch_mode: bool = True,
+	on_progress: Callable[[CorrectionProgress], None] | None = None,
+	**workflow_kwargs,
+) -> TypoCorrectionResult:
+	corrected_texts = []
+	diff = []
+	usage_summary = {}
+	cost = Decimal("0")
+	for chunk in stream_typo_correction(
+		chunks=[request],
+		window_size=window_size,
+		batch_mode=batch_mode,
+		total_chars=len(request),
+		on_progress=on_progress,
+		**workflow_kwargs,
+	):
+		corrected_texts.append(chunk.corrected_text)
+		diff.extend(chunk.diff)
+		usage_summary = chunk.usage_summary
+		cost += chunk.cost
+
+	return TypoCorrectionResult(
+		corrected_text="".join(corrected_texts),
+		diff=diff,
+		usage_summary=usage_summary,
+		cost=cost,
+	)
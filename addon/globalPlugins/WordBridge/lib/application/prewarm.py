@@ -0,0 +1,70 @@
+import logging
+from collections.abc import Callable
+from threading import Event, Lock, Thread
+
+log = logging.getLogger(__name__)
+
+
+class ModulePrewarmer:
+	"""
+	Run a list of warm-up steps (imports, dictionary loading) once, either on a background thread after startup
+	or in the caller's thread if something needs them before the background run has finished.
+	"""
+	def __init__(self, steps: list[Callable[[], object]]):
+		self.steps = list(steps)
+		self.ready = Event()
+		self._next_step = 0
+		self._lock = Lock()
+		self._thread = None
+
+	def start(self):
+		if self._thread is None and not self.ready.is_set():
+			self._thread = Thread(target=self._run_steps, daemon=True)
+			self._thread.start()
+
+	def ensure_ready(self):
+		"""
+		Finish the remaining steps now. A step already running in the background is waited for, not repeated.
+		"""
+		if not self.ready.is_set():
+			self._run_steps()
+
+	def _run_steps(self):
+		with self._lock:
+			while self._next_step < len(self.steps):
+				step = self.steps[self._next_step]
+				self._next_step += 1
+				try:
+					step()
+				except Exception:
+					# A failed step is retried by the code that needs it, which then reports the error properly.
+					log.exception(f"Prewarming step {getattr(step, '__name__', step)} failed")
+			self.ready.set()
+
+
+def import_correction_modules():
+	from . import long_document, task_runner  # noqa: F401
+
+
+def warm_pinyin():
+	from pypinyin import lazy_pinyin
+
+	lazy_pinyin("中文")
+
+
+def warm_hanzidentifier():
+	from hanzidentifier import has_chinese
+
+	has_chinese("中文")
+
+
+def load_personal_dictionary():
+	from .dictionary import get_dictionary_service
+
+	get_dictionary_service().get_vocabulary()
+
+
+def load_char_bigram_model():
+	from ..tasks.typo.language_model import get_char_bigram_model
+
+	get_char_bigram_model()
@@ -1,9 +1,12 @@
 from ..llm.adapter import get_provider_model_adapter
 from ..llm.executor import LLMExecutor
 from ..llm.provider import get_provider
-from ..tasks.typo.prompt import LiteTypoPromptStrategy, StandardTypoPromptStrategy
-from ..tasks.typo.text_policy import LiteTypoTextPolicy, StandardTypoTextPolicy
-from ..tasks.typo.workflow import TypoCorrectionWorkflow
+from ..llm.router import FailoverExecutor
+from ..tasks.typo.detector import HomophoneTypoDetector
+from ..tasks.typo.prefilter import PlausibilityPrefilter
+from ..tasks.typo.prompt import EditTypoPromptStrategy, LiteTypoPromptStrategy, StandardTypoPromptStrategy
+from ..tasks.typo.text_policy import EditTypoTextPolicy, LiteTypoTextPolicy, StandardTypoTextPolicy
+from ..tasks.typo.workflow import CascadeTypoCorrectionWorkflow, TypoCorrectionWorkflow
 
 
 def create_typo_workflow(
@@ -16,29 +19,135 @@ def create_typo_workflow(
 	corrector_mode: str,
 	optional_guidance_enable: dict,
 	customized_words: list | None = None,
+	customized_words_token_budget: int = 50,
+	max_history_responses: int = 2,
 	retries: int = 2,
 	backoff: int = 1,
 	max_correction_attempts: int = 3,
+	skip_confidence_threshold: float | None = None,
+	typo_detection: bool = False,
+	stream_responses: bool = False,
+	keep_response_history: bool = True,
+	budget=None,
+	first_pass: dict | None = None,
+	fallback: dict | None = None,
 ):
-	provider_object = get_provider(provider_name, credential, retries=retries, backoff=backoff)
-	adapter_object = get_provider_model_adapter(provider_name, model_name)
-	executor = LLMExecutor(provider_object, adapter_object)
+	"""
+	Build the typo correction workflow.
+
+	first_pass optionally names a cheaper corrector (provider_name, model_name, credential, template_name and
+	optional_guidance_enable) that reads every segment first; only the segments it changes reach the main model.
+	fallback optionally names an equivalent corrector (provider_name, model_name and credential) that takes over
+	when the main provider keeps failing.
+	keep_response_history=False keeps only the running usage and cost totals instead of every raw response.
+	budget optionally caps the spending of the run; every tier draws from the same CorrectionBudget.
+	max_history_responses bounds how many earlier answers a recorrection prompt replays.
+	"""
+	prefilter = None
+	if skip_confidence_threshold is not None:
+		prefilter = PlausibilityPrefilter(threshold=skip_confidence_threshold)
+	detector = HomophoneTypoDetector() if typo_detection else None
+	tier_kwargs = dict(
+		language=language,
+		corrector_mode=corrector_mode,
+		customized_words=customized_words or [],
+		customized_words_token_budget=customized_words_token_budget,
+		max_history_responses=max_history_responses,
+		retries=retries,
+		backoff=backoff,
+		max_correction_attempts=max_correction_attempts,
+		detector=detector,
+		stream_responses=stream_responses,
+		keep_response_history=keep_response_history,
+		budget=budget,
+	)
+
+	workflow = _create_tier_workflow(
+		provider_name=provider_name,
+		model_name=model_name,
+		credential=credential,
+		template_name=template_name,
+		optional_guidance_enable=optional_guidance_enable,
+		prefilter=None if first_pass else prefilter,
+		fallbacks=[fallback] if fallback else [],
+		**tier_kwargs,
+	)
+	if not first_pass:
+		return workflow
+
+	# When the cheap provider is down, the first pass falls back to the main corrector.
+	main_route = {"provider_name": provider_name, "model_name": model_name, "credential": credential}
+	first_pass_workflow = _create_tier_workflow(
+		**first_pass,
+		prefilter=prefilter,
+		fallbacks=[main_route],
+		**tier_kwargs,
+	)
+	return CascadeTypoCorrectionWorkflow(first_pass_workflow, workflow)
+
+
+def _create_tier_workflow(
+	*,
+	provider_name: str,
+	model_name: str,
+	credential: dict,
+	language: str,
+	template_name: str,
+	corrector_mode: str,
+	optional_guidance_enable: dict,
+	customized_words: list,
+	customized_words_token_budget: int,
+	max_history_responses: int,
+	retries: int,
+	backoff: int,
+	max_correction_attempts: int,
+	prefilter,
+	detector,
+	stream_responses: bool,
+	keep_response_history: bool,
+	budget,
+	fallbacks: list,
+) -> TypoCorrectionWorkflow:
+	executors = [
+		LLMExecutor(
+			get_provider(route["provider_name"], route["credential"], retries=retries, backoff=backoff),
+			get_provider_model_adapter(route["provider_name"], route["model_name"]),
+			stream_responses=stream_responses,
+			keep_response_history=keep_response_history,
+			budget=budget,
+		)
+		for route in [{"provider_name": provider_name, "model_name": model_name, "credential": credential}] + fallbacks
+	]
+	executor = executors[0] if len(executors) == 1 else FailoverExecutor(executors)
 
-	customized_words = customized_words or []
 	if corrector_mode == "lite":
 		prompt_strategy = LiteTypoPromptStrategy(
 			language=language,
 			template_name=template_name,
 			optional_guidance_enable=optional_guidance_enable,
 			customized_words=customized_words,
+			customized_words_token_budget=customized_words_token_budget,
+			max_history_responses=max_history_responses,
 		)
 		text_policy = LiteTypoTextPolicy(language)
+	elif corrector_mode == "edit":
+		prompt_strategy = EditTypoPromptStrategy(
+			language=language,
+			template_name=template_name,
+			optional_guidance_enable=optional_guidance_enable,
+			customized_words=customized_words,
+			customized_words_token_budget=customized_words_token_budget,
+			max_history_responses=max_history_responses,
+		)
+		text_policy = EditTypoTextPolicy(language)
 	else:
 		prompt_strategy = StandardTypoPromptStrategy(
 			language=language,
 			template_name=template_name,
 			optional_guidance_enable=optional_guidance_enable,
 			customized_words=customized_words,
+			customized_words_token_budget=customized_words_token_budget,
+			max_history_responses=max_history_responses,
 		)
 		text_policy = StandardTypoTextPolicy(language)
 
@@ -47,4 +156,7 @@ def create_typo_workflow(
 		prompt_strategy=prompt_strategy,
 		text_policy=text_policy,
 		max_correction_attempts=max_correction_attempts,
+		prefilter=prefilter,
+		detector=detector,
+		budget=budget,
 	)
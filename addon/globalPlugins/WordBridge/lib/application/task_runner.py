@@ -1,6 +1,47 @@
-from . import task_factory
+from decimal import Decimal
+
+from . import incremental, task_factory
+from ..tasks.typo.result import TypoCorrectionResult
+from ..tasks.typo.utils import strings_diff
 
 
 def run_typo_correction(*, request: str, batch_mode: bool = True, **workflow_kwargs):
 	workflow = task_factory.create_typo_workflow(**workflow_kwargs)
 	return workflow.run(request, batch_mode=batch_mode)
+
+
+def run_incremental_typo_correction(*, request: str, previous, batch_mode: bool = True, **workflow_kwargs):
+	plans = incremental.plan_incremental_correction(request, previous)
+	regions = incremental.group_dirty_regions(plans)
+
+	results = []
+	if regions:
+		workflow = task_factory.create_typo_workflow(**workflow_kwargs)
+		results = [workflow.run(region, batch_mode=batch_mode) for region in regions]
+
+	corrected_regions = iter([result.corrected_text for result in results])
+	text_corrected = ""
+	in_dirty_region = False
+	for plan in plans:
+		if not plan.is_dirty:
+			text_corrected += plan.reused_text
+			in_dirty_region = False
+			continue
+		if not in_dirty_region:
+			text_corrected += next(corrected_regions)
+			in_dirty_region = True
+
+	# The executor is shared by every region, so the last result carries the totals of the whole run.
+	telemetry = dict(results[-1].telemetry) if results else {}
+	telemetry["incremental"] = {
+		"segments": len(plans),
+		"reused_segments": sum(1 for plan in plans if not plan.is_dirty),
+		"corrected_segments": sum(1 for plan in plans if plan.is_dirty),
+	}
+	return TypoCorrectionResult(
+		corrected_text=text_corrected,
+		diff=strings_diff(request, text_corrected),
+		usage_summary=results[-1].usage_summary if results else {},
+		cost=results[-1].cost if results else Decimal("0"),
+		telemetry=telemetry,
+	)
@@ -1,12 +1,34 @@
+import base64
+import json
 import logging
 import random
 import requests
 import time
+from dataclasses import dataclass
+from threading import Lock, Timer
+
+def _(s):
+	return s
+
+try:
+	import addonHandler
+	addonHandler.initTranslation()
+except ImportError:
+	pass
+
 
 log = logging.getLogger(__name__)
 
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
 
-def obtain_openai_key(coseeing_url, coseeing_username, coseeing_password):
+
+class CoseeingError(Exception):
+	"""
+	Raised when the proofreader reports an error or its reply ends before the result.
+	"""
+
+
+def login(coseeing_url, coseeing_username, coseeing_password) -> dict:
 	auth_data = {
 		"username": coseeing_username,
 		"password": coseeing_password,
@@ -49,7 +71,183 @@ def obtain_openai_key(coseeing_url, coseeing_username, coseeing_password):
 	elif response.status_code != 200:
 		raise Exception(_("Unknown errors. Status code = {status_code}").format(status_code=response.status_code))
 
-	# Get token from response
-	token = response.json()["access_token"]
+	return response.json()
+
+
+def obtain_openai_key(coseeing_url, coseeing_username, coseeing_password):
+	return login(coseeing_url, coseeing_username, coseeing_password)["access_token"]
+
+
+def get_token_expiry(login_result: dict, now: float, default_ttl: float) -> float:
+	"""
+	Use expires_in from the login response, or the exp claim if the token is a JWT, or else default_ttl.
+	"""
+	if "expires_in" in login_result:
+		return now + float(login_result["expires_in"])
+
+	try:
+		payload = login_result["access_token"].split(".")[1]
+		claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+		return float(claims["exp"])
+	except (IndexError, KeyError, TypeError, ValueError):
+		return now + default_ttl
+
+
+class CoseeingTokenManager:
+	"""
+	Cache the Coseeing access token per account and renew it in the background shortly before it expires,
+	so a request does not have to log in first. A token nobody used since the last login is left to expire,
+	so the password is not resent for the rest of the session once Coseeing is no longer used.
+	"""
+	def __init__(self, coseeing_url: str, refresh_margin: float = 60, default_ttl: float = 1800):
+		self.coseeing_url = coseeing_url
+		self.refresh_margin = refresh_margin
+		self.default_ttl = default_ttl
+		self._lock = Lock()
+		self._login_lock = Lock()
+		self._account = None
+		self._token = None
+		self._expires_at = 0
+		self._used_since_login = False
+		self._refresh_timer = None
+
+	def get_token(self, username: str, password: str) -> str:
+		with self._lock:
+			if self._account == (username, password) and time.time() < self._expires_at:
+				self._used_since_login = True
+				return self._token
+		token = self._login(username, password)
+		with self._lock:
+			self._used_since_login = True
+		return token
+
+	def invalidate(self):
+		with self._lock:
+			self._token = None
+			self._expires_at = 0
+			if self._refresh_timer is not None:
+				self._refresh_timer.cancel()
+				self._refresh_timer = None
+
+	def request(self, method: str, path: str, username: str, password: str, **kwargs):
+		"""
+		Send an authenticated request, logging in again and retrying once if the token is rejected.
+		"""
+		try:
+			token = self.get_token(username, password)
+		except Exception as e:
+			# Let the server answer 401 so that wrong credentials are reported the same way as a rejected token.
+			log.warning(_("Unable to log into Coseeing: {e}").format(e=e))
+			token = ""
+
+		response = self._send(method, path, token, **kwargs)
+		if response.status_code != 401 or not token:
+			return response
+
+		self.invalidate()
+		try:
+			token = self.get_token(username, password)
+		except Exception:
+			return response
+		# A streamed response holds its connection until it is closed.
+		response.close()
+		return self._send(method, path, token, **kwargs)
+
+	def post(self, path: str, username: str, password: str, **kwargs):
+		return self.request("POST", path, username, password, **kwargs)
+
+	def _send(self, method: str, path: str, token: str, **kwargs):
+		headers = dict(kwargs.pop("headers", None) or {})
+		headers["Authorization"] = f"Bearer {token}"
+		return requests.request(method, f"{self.coseeing_url}{path}", headers=headers, **kwargs)
+
+	def _login(self, username: str, password: str, force: bool = False) -> str:
+		with self._login_lock:
+			# Another thread may have logged in while this one was waiting.
+			with self._lock:
+				if not force and self._account == (username, password) and time.time() < self._expires_at:
+					return self._token
+
+			now = time.time()
+			login_result = login(self.coseeing_url, username, password)
+			expires_at = get_token_expiry(login_result, now, self.default_ttl)
+
+			with self._lock:
+				self._account = (username, password)
+				self._token = login_result["access_token"]
+				self._expires_at = expires_at
+				self._used_since_login = False
+				self._schedule_refresh(username, password, expires_at - now)
+				return self._token
+
+	def _schedule_refresh(self, username: str, password: str, ttl: float):
+		if self._refresh_timer is not None:
+			self._refresh_timer.cancel()
+		delay = ttl - self.refresh_margin
+		if delay <= 0:
+			self._refresh_timer = None
+			return
+		self._refresh_timer = Timer(delay, self._refresh, args=(username, password))
+		self._refresh_timer.daemon = True
+		self._refresh_timer.start()
+
+	def _refresh(self, username: str, password: str):
+		with self._lock:
+			if self._account != (username, password):
+				return
+			if not self._used_since_login:
+				# The next request logs in again if it needs to.
+				self._refresh_timer = None
+				return
+		try:
+			# The current token stays in use until the new one arrives.
+			self._login(username, password, force=True)
+		except Exception as e:
+			log.warning(_("Unable to refresh the Coseeing access token: {e}").format(e=e))
+
+
+@dataclass(frozen=True)
+class ProofreaderProgress:
+	index: int
+	total: int | None
+	text: str
+	cost: float
+	partial_response: str
+
+
+def read_proofreader_response(response, on_progress=None) -> dict:
+	"""
+	Read a /proofreader reply.
+
+	A streaming reply is NDJSON: a "segment" event with the corrected text and cost of each segment as soon as it
+	is done, then a "result" event carrying the same fields as the plain JSON reply. Servers that do not stream
+	answer with plain JSON, which is returned as is.
+	"""
+	if not response.headers.get("Content-Type", "").startswith(NDJSON_CONTENT_TYPE):
+		return response.json()
+
+	segments = []
+	# Read byte by byte so that each event is handled as soon as its line arrives rather than when a buffer fills.
+	for line in response.iter_lines(chunk_size=1):
+		if not line.strip():
+			continue
+		event = json.loads(line.decode("utf8"))
+		event_type = event.pop("type", None)
+		if event_type == "segment":
+			segments.append(event["text"])
+			if on_progress is not None:
+				on_progress(
+					ProofreaderProgress(
+						index=event.get("index", len(segments) - 1),
+						total=event.get("total"),
+						text=event["text"],
+						cost=event.get("cost", 0),
+						partial_response="".join(segments),
+					)
+				)
+		elif event_type == "result":
+			return event
+		elif event_type == "error":
+			raise CoseeingError(_("Coseeing reported an error: {detail}").format(detail=event.get("detail")))
 
-	return token
+	raise CoseeingError(_("The Coseeing response ended before the proofreading result was received."))
@@ -2,20 +2,25 @@ from .adapter import (
 	AnthropicAdapter,
 	DeepSeekAdapter,
 	GoogleAdapter,
+	LocalAdapter,
 	OpenAIAdapter,
 	OpenRouterAdapter,
 	ProviderModelAdapter,
 	get_provider_model_adapter,
 )
+from .budget import BudgetExceeded, CorrectionBudget
 from .executor import LLMExecutor
 from .prompt_bundle import PromptBundle
 from .provider import (
 	AnthropicProvider,
 	DeepseekProvider,
 	GoogleProvider,
+	LocalProvider,
 	OpenAIProvider,
 	OpenrouterProvider,
 	Provider,
+	ProviderError,
 	get_provider,
 )
 from .result import LLMExecutionResult
+from .router import CircuitBreaker, FailoverExecutor, get_circuit_breaker
@@ -4,9 +4,39 @@ from decimal import Decimal
 from pathlib import Path
 
 from .cost_calculator import CostCalculator
+from .provider import ProviderError
+from .token_estimator import estimate_messages_tokens, estimate_tokens
+
+# HTTP statuses matching the error types providers report inside a stream, which arrives with status 200.
+STREAM_ERROR_STATUS_CODES = (
+	("overloaded", 529),
+	("rate_limit", 429),
+	("invalid_request", 400),
+	("authentication", 401),
+	("permission", 403),
+	("not_found", 404),
+)
+
+
+def get_stream_error(event: dict, error_type: str | None) -> ProviderError:
+	"""
+	Turn an error event of a stream into the ProviderError the same failure would raise as an HTTP response.
+
+	Unknown error types, like "server_error" or "api_error", count as server errors, so another provider is tried.
+	"""
+	status_code = 500
+	for fragment, fragment_status_code in STREAM_ERROR_STATUS_CODES:
+		if error_type and fragment in error_type:
+			status_code = fragment_status_code
+			break
+	return ProviderError(f"Streaming error. Response: {event}", status_code)
 
 
 class ProviderModelAdapter:
+	supports_streaming = False
+	input_usage_field = "input_tokens"
+	output_usage_field = "output_tokens"
+
 	def __init__(self, provider_name: str, model_name: str):
 		self.provider_name = provider_name
 		self.model_name = model_name
@@ -25,6 +55,24 @@ class ProviderModelAdapter:
 			return {}
 		return response.get(usage_key, {})
 
+	def format_stream_request(self, prompt_bundle, setting: dict):
+		payload = self.format_request(prompt_bundle=prompt_bundle, setting=setting)
+		payload["stream"] = True
+		return payload
+
+	def parse_stream_event(self, event: dict) -> tuple[str, dict]:
+		"""
+		Return the text delta and any usage reported by one streamed event.
+		"""
+		raise NotImplementedError("Subclass must implement this method")
+
+	def estimate_usage(self, prompt_bundle, output_text: str) -> dict:
+		# Used when a stream is cancelled before the provider reports the final usage.
+		return {
+			self.input_usage_field: estimate_messages_tokens(prompt_bundle.messages, prompt_bundle.system_template),
+			self.output_usage_field: estimate_tokens(output_text),
+		}
+
 	def get_model_entry(self) -> dict:
 		return self._model_entry
 
@@ -34,6 +82,12 @@ class ProviderModelAdapter:
 	def get_total_cost(self, usage_history: list) -> Decimal:
 		return self._cost_calculator.get_total_cost(usage_history)
 
+	def create_usage_accumulator(self):
+		return self._cost_calculator.create_accumulator()
+
+	def get_cost(self, usage: dict) -> Decimal:
+		return self._cost_calculator.get_cost(self._cost_calculator.get_priced_usage(usage))
+
 	def _load_model_entry(self) -> dict:
 		config_path = Path(__file__).resolve().parents[2] / "setting" / "price.json"
 		with config_path.open("r", encoding="utf8") as f:
@@ -42,6 +96,8 @@ class ProviderModelAdapter:
 
 
 class OpenAIAdapter(ProviderModelAdapter):
+	supports_streaming = True
+
 	def _is_gpt5_family(self) -> bool:
 		return self.model_name.startswith("o") or self.model_name.startswith("gpt-5")
 
@@ -106,8 +162,23 @@ class OpenAIAdapter(ProviderModelAdapter):
 			"output_tokens": usage.get("output_tokens", 0),
 		}
 
+	def parse_stream_event(self, event: dict) -> tuple[str, dict]:
+		event_type = event.get("type")
+		if event_type == "response.output_text.delta":
+			return event.get("delta", ""), {}
+		if event_type in ("response.completed", "response.incomplete"):
+			return "", self.extract_usage(event.get("response", {}))
+		if event_type == "error":
+			raise get_stream_error(event, event.get("code"))
+		if event_type == "response.failed":
+			error = event.get("response", {}).get("error") or {}
+			raise get_stream_error(event, error.get("code"))
+		return "", {}
+
 
 class AnthropicAdapter(ProviderModelAdapter):
+	supports_streaming = True
+
 	def _deprecated_temperature_models(self) -> tuple[str, ...]:
 		return ("claude-opus-4-7",)
 
@@ -126,8 +197,25 @@ class AnthropicAdapter(ProviderModelAdapter):
 	def parse_response(self, response):
 		return response["content"][0]["text"]
 
+	def parse_stream_event(self, event: dict) -> tuple[str, dict]:
+		event_type = event.get("type")
+		if event_type == "content_block_delta" and event["delta"].get("type") == "text_delta":
+			return event["delta"]["text"], {}
+		if event_type == "message_start":
+			return "", event["message"].get("usage", {})
+		if event_type == "message_delta":
+			# Carries the cumulative output_tokens, which replaces the placeholder from message_start.
+			return "", event.get("usage", {})
+		if event_type == "error":
+			raise get_stream_error(event, event.get("error", {}).get("type"))
+		return "", {}
+
 
 class GoogleAdapter(ProviderModelAdapter):
+	supports_streaming = True
+	input_usage_field = "promptTokenCount"
+	output_usage_field = "candidatesTokenCount"
+
 	def _build_generation_config(self, setting: dict) -> dict:
 		generation_config = deepcopy(setting)
 
@@ -152,6 +240,15 @@ class GoogleAdapter(ProviderModelAdapter):
 	def parse_response(self, response):
 		return response["candidates"][0]["content"]["parts"][0]["text"]
 
+	def format_stream_request(self, prompt_bundle, setting: dict):
+		# Google selects streaming through the endpoint rather than the payload.
+		return self.format_request(prompt_bundle=prompt_bundle, setting=setting)
+
+	def parse_stream_event(self, event: dict) -> tuple[str, dict]:
+		parts = event.get("candidates", [{}])[0].get("content", {}).get("parts", [])
+		text = "".join(part.get("text", "") for part in parts if not part.get("thought"))
+		return text, self.extract_usage(event)
+
 
 class OpenRouterAdapter(ProviderModelAdapter):
 	def format_request(self, prompt_bundle, setting: dict):
@@ -164,6 +261,10 @@ class OpenRouterAdapter(ProviderModelAdapter):
 
 
 class DeepSeekAdapter(ProviderModelAdapter):
+	supports_streaming = True
+	input_usage_field = "prompt_cache_miss_tokens"
+	output_usage_field = "completion_tokens"
+
 	def format_request(self, prompt_bundle, setting: dict):
 		payload = {
 			"model": self.model_name,
@@ -175,6 +276,47 @@ class DeepSeekAdapter(ProviderModelAdapter):
 			payload["thinking"] = {"type": "disabled"}
 		return payload
 
+	def format_stream_request(self, prompt_bundle, setting: dict):
+		payload = super().format_stream_request(prompt_bundle, setting)
+		payload["stream_options"] = {"include_usage": True}
+		return payload
+
+	def parse_stream_event(self, event: dict) -> tuple[str, dict]:
+		choices = event.get("choices") or [{}]
+		text = choices[0].get("delta", {}).get("content") or ""
+		return text, self.extract_usage(event) if event.get("usage") else {}
+
+
+class LocalAdapter(ProviderModelAdapter):
+	supports_streaming = True
+	input_usage_field = "prompt_tokens"
+	output_usage_field = "completion_tokens"
+
+	def format_request(self, prompt_bundle, setting: dict):
+		return {
+			"model": self.model_name,
+			"messages": [{"role": "system", "content": prompt_bundle.system_template}] + deepcopy(prompt_bundle.messages),
+			"stream": False,
+			**deepcopy(setting),
+		}
+
+	def format_stream_request(self, prompt_bundle, setting: dict):
+		payload = super().format_stream_request(prompt_bundle, setting)
+		payload["stream_options"] = {"include_usage": True}
+		return payload
+
+	def parse_stream_event(self, event: dict) -> tuple[str, dict]:
+		choices = event.get("choices") or [{}]
+		text = choices[0].get("delta", {}).get("content") or ""
+		return text, self.extract_usage(event) if event.get("usage") else {}
+
+	def _load_model_entry(self) -> dict:
+		# Local models are free to run; usage is still counted, at a price of zero.
+		return {
+			"usage_key": "usage",
+			"pricing": {"base_unit": 1, self.input_usage_field: 0, self.output_usage_field: 0},
+		}
+
 
 def get_provider_model_adapter(provider_name: str, model_name: str) -> ProviderModelAdapter:
 	if provider_name == "OpenAI":
@@ -185,6 +327,8 @@ def get_provider_model_adapter(provider_name: str, model_name: str) -> ProviderM
 		"Google": GoogleAdapter,
 		"OpenRouter": OpenRouterAdapter,
 		"DeepSeek": DeepSeekAdapter,
+		"Local": LocalAdapter,
+		"Ollama": LocalAdapter,
 	}
 	adapter_class = family_mapping.get(provider_name)
 	if not adapter_class:
@@ -0,0 +1,92 @@
+from dataclasses import dataclass
+from decimal import Decimal
+from threading import Lock
+
+def _(s):
+	return s
+
+try:
+	import addonHandler
+	addonHandler.initTranslation()
+except ImportError:
+	pass
+
+
+class BudgetExceeded(Exception):
+	"""
+	Raised instead of sending a request whose estimated cost the remaining budget cannot cover.
+	"""
+
+
+@dataclass(frozen=True)
+class BudgetReservation:
+	tokens: int
+	cost: Decimal
+
+
+class CorrectionBudget:
+	"""
+	Spending limits for one correction run, shared by every executor of the run.
+
+	Each request reserves its estimated tokens and cost before it is sent and is refused when the reservation
+	would exceed a limit; the reservation is replaced by the reported usage once the response arrives. A limit
+	of None is not enforced.
+	"""
+
+	def __init__(self, max_cost=None, max_tokens: int | None = None, max_requests: int | None = None):
+		self.max_cost = Decimal(str(max_cost)) if max_cost is not None else None
+		self.max_tokens = max_tokens
+		self.max_requests = max_requests
+		self.spent_cost = Decimal("0")
+		self.spent_tokens = 0
+		self.request_count = 0
+		self.refused_count = 0
+		self._reserved_cost = Decimal("0")
+		self._reserved_tokens = 0
+		self._lock = Lock()
+
+	@property
+	def exhausted(self) -> bool:
+		with self._lock:
+			return self.refused_count > 0
+
+	def reserve(self, tokens: int, cost: Decimal) -> BudgetReservation:
+		with self._lock:
+			if (
+				(self.max_requests is not None and self.request_count + 1 > self.max_requests)
+				or (self.max_tokens is not None and self.spent_tokens + self._reserved_tokens + tokens > self.max_tokens)
+				or (self.max_cost is not None and self.spent_cost + self._reserved_cost + cost > self.max_cost)
+			):
+				self.refused_count += 1
+				raise BudgetExceeded(_("The spending limit of this correction has been reached."))
+			self.request_count += 1
+			self._reserved_tokens += tokens
+			self._reserved_cost += cost
+			return BudgetReservation(tokens, cost)
+
+	def settle(self, reservation: BudgetReservation, tokens: int, cost: Decimal):
+		with self._lock:
+			self._release(reservation)
+			self.spent_tokens += tokens
+			self.spent_cost += cost
+
+	def release(self, reservation: BudgetReservation):
+		"""
+		Drop the reservation of a request that failed before it reported any usage.
+		"""
+		with self._lock:
+			self._release(reservation)
+
+	def _release(self, reservation: BudgetReservation):
+		self._reserved_tokens -= reservation.tokens
+		self._reserved_cost -= reservation.cost
+
+	def get_summary(self) -> dict:
+		with self._lock:
+			return {
+				"spent_cost": self.spent_cost,
+				"spent_tokens": self.spent_tokens,
+				"requests": self.request_count,
+				"refused_requests": self.refused_count,
+				"exhausted": self.refused_count > 0,
+			}
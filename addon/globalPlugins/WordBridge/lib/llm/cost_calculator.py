@@ -4,10 +4,12 @@ Cost Calculator for tracking LLM usage and costs.
 This module provides utilities for:
 - Tracking token usage from API responses
 - Calculating costs based on model pricing
+- Keeping running totals while responses arrive from many threads
 """
 
 from collections import defaultdict
 from decimal import Decimal
+from threading import Lock
 
 
 class CostCalculator:
@@ -15,36 +17,78 @@ class CostCalculator:
 		self._model_entry = model_entry
 		self._pricing = model_entry.get("pricing", {})
 		self._usage_key = model_entry.get("usage_key")
+		# Price per single unit, converted once instead of on every total.
+		base_unit = Decimal(str(self._pricing.get("base_unit", 1)))
+		self._unit_prices = {
+			usage_type: Decimal(str(price)) / base_unit
+			for usage_type, price in self._pricing.items()
+			if usage_type != "base_unit"
+		}
 
-	def get_total_usage(self, response_history: list) -> dict:
-		total_usage = defaultdict(int)
-
-		for response in response_history:
-			if not isinstance(response, dict):
-				continue
+	@property
+	def unit_prices(self) -> dict:
+		return self._unit_prices
 
-			if self._usage_key and self._usage_key in response:
-				usage_source = response[self._usage_key]
-			else:
-				usage_source = response
+	def get_priced_usage(self, response) -> dict:
+		"""
+		Return the priced usage types found in one response or usage dict.
+		"""
+		if not isinstance(response, dict):
+			return {}
 
-			for usage_type in self._pricing:
-				if usage_type == "base_unit":
-					continue
-				try:
-					total_usage[usage_type] += usage_source[usage_type]
-				except KeyError:
-					pass
+		if self._usage_key and self._usage_key in response:
+			usage_source = response[self._usage_key]
+		else:
+			usage_source = response
 
-		return dict(total_usage)
+		return {
+			usage_type: usage_source[usage_type]
+			for usage_type in self._unit_prices
+			if usage_type in usage_source
+		}
 
-	def get_total_cost(self, response_history: list) -> Decimal:
+	def get_cost(self, usage: dict) -> Decimal:
 		cost = Decimal("0")
-		usages = self.get_total_usage(response_history)
-		for key, value in usages.items():
-			cost += (
-				Decimal(str(self._pricing[key]))
-				* Decimal(str(value))
-				/ Decimal(str(self._pricing["base_unit"]))
-			)
+		for key, value in usage.items():
+			cost += self._unit_prices[key] * value
 		return cost
+
+	def create_accumulator(self):
+		return UsageAccumulator(self)
+
+	def get_total_usage(self, response_history: list) -> dict:
+		accumulator = self.create_accumulator()
+		for response in response_history:
+			accumulator.add(response)
+		return accumulator.get_total_usage()
+
+	def get_total_cost(self, response_history: list) -> Decimal:
+		return self.get_cost(self.get_total_usage(response_history))
+
+
+class UsageAccumulator:
+	"""
+	Running usage and cost totals, updated as each response arrives.
+	"""
+
+	def __init__(self, cost_calculator: CostCalculator):
+		self._cost_calculator = cost_calculator
+		self._total_usage = defaultdict(int)
+		self._total_cost = Decimal("0")
+		self._lock = Lock()
+
+	def add(self, usage: dict):
+		priced_usage = self._cost_calculator.get_priced_usage(usage)
+		cost = self._cost_calculator.get_cost(priced_usage)
+		with self._lock:
+			for usage_type, value in priced_usage.items():
+				self._total_usage[usage_type] += value
+			self._total_cost += cost
+
+	def get_total_usage(self) -> dict:
+		with self._lock:
+			return dict(self._total_usage)
+
+	def get_total_cost(self) -> Decimal:
+		with self._lock:
+			return self._total_cost
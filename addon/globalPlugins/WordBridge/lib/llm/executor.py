@@ -1,5 +1,9 @@
+import json
 import logging
+from dataclasses import dataclass, field
 from decimal import Decimal
+from threading import Event, Lock
+from typing import Any
 
 from .result import LLMExecutionResult
 
@@ -14,12 +18,40 @@ except ImportError:
 log = logging.getLogger(__name__)
 
 
+@dataclass
+class _InFlightRequest:
+	done: Event = field(default_factory=Event)
+	response: tuple | None = None
+	error: BaseException | None = None
+
+
 class LLMExecutor:
-	def __init__(self, provider_object, adapter_object):
+	def __init__(
+		self,
+		provider_object,
+		adapter_object,
+		stream_responses: bool = False,
+		keep_response_history: bool = True,
+		budget=None,
+	):
 		self.provider_object = provider_object
 		self.adapter_object = adapter_object
+		self.stream_responses = stream_responses and getattr(adapter_object, "supports_streaming", False)
+		self.keep_response_history = keep_response_history
+		self.budget = budget
 		self.response_history = []
 		self.usage_history = []
+		create_usage_accumulator = getattr(adapter_object, "create_usage_accumulator", None)
+		self.usage_accumulator = create_usage_accumulator() if create_usage_accumulator is not None else None
+		self._history_lock = Lock()
+		self.deduplicated_requests = 0
+		self._in_flight = {}
+		self._in_flight_lock = Lock()
+
+	@property
+	def route_name(self) -> str:
+		# Same form as a corrector config id, so results can be traced back to the corrector that produced them.
+		return f"{self.adapter_object.model_name}&{getattr(self.provider_object, 'name', '')}"
 
 	def ensure_connection(self):
 		self.provider_object.try_connection()
@@ -34,6 +66,92 @@ class LLMExecutor:
 			response_text_history=previous_results,
 			text_policy=text_policy,
 		)
+		(sentence, usage, response_json), shared = self._request_single_flight(prompt_bundle, input_text, text_policy)
+		response_text = text_policy.normalize_response(sentence)
+		output_text = text_policy.postprocess_output(response_text, input_text)
+
+		if shared:
+			# The request that went out already accounted for this usage.
+			usage = {}
+		else:
+			self._record_usage(response_json, usage)
+		return LLMExecutionResult(
+			original_text=input_text,
+			output_text=output_text,
+			raw_response=response_json,
+			usage=usage,
+			served_by=self.route_name,
+		)
+
+	def _request_single_flight(self, prompt_bundle, input_text: str, text_policy) -> tuple[tuple, bool]:
+		"""
+		Send the request unless an identical one is already in flight, in which case wait for and share its response.
+		Returns the response and whether it was shared.
+		"""
+		key = json.dumps(
+			[input_text, prompt_bundle.system_template, prompt_bundle.messages, self.provider_object.setting],
+			ensure_ascii=False,
+			sort_keys=True,
+			default=str,
+		)
+		with self._in_flight_lock:
+			in_flight = self._in_flight.get(key)
+			is_leader = in_flight is None
+			if is_leader:
+				in_flight = self._in_flight[key] = _InFlightRequest()
+			else:
+				self.deduplicated_requests += 1
+
+		if not is_leader:
+			in_flight.done.wait()
+			if in_flight.error is not None:
+				raise in_flight.error
+			return in_flight.response, True
+
+		try:
+			in_flight.response = self._request(prompt_bundle, input_text, text_policy)
+		except BaseException as e:
+			in_flight.error = e
+			raise
+		finally:
+			with self._in_flight_lock:
+				del self._in_flight[key]
+			in_flight.done.set()
+		return in_flight.response, False
+
+	def _request(self, prompt_bundle, input_text: str, text_policy) -> tuple[str, dict, Any]:
+		if self.budget is None:
+			return self._send(prompt_bundle, input_text, text_policy)
+
+		reservation = self.budget.reserve(*self._estimate_request(prompt_bundle, input_text, text_policy))
+		try:
+			response = self._send(prompt_bundle, input_text, text_policy)
+		except BaseException:
+			self.budget.release(reservation)
+			raise
+		usage = response[1]
+		self.budget.settle(
+			reservation,
+			tokens=sum(
+				usage.get(field, 0)
+				for field in (self.adapter_object.input_usage_field, self.adapter_object.output_usage_field)
+			),
+			cost=self.adapter_object.get_cost(usage),
+		)
+		return response
+
+	def _estimate_request(self, prompt_bundle, input_text: str, text_policy) -> tuple[int, Decimal]:
+		estimated_usage = self.adapter_object.estimate_usage(prompt_bundle, input_text)
+		get_output_length_limit = getattr(text_policy, "get_output_length_limit", None)
+		if get_output_length_limit is not None:
+			# Assume the longest answer the policy accepts at a token per character, so the estimate errs high.
+			estimated_usage[self.adapter_object.output_usage_field] = get_output_length_limit(input_text)
+		return sum(estimated_usage.values()), self.adapter_object.get_cost(estimated_usage)
+
+	def _send(self, prompt_bundle, input_text: str, text_policy) -> tuple[str, dict, Any]:
+		if self.stream_responses:
+			return self._execute_stream(prompt_bundle, input_text, text_policy)
+
 		payload = self.adapter_object.format_request(
 			prompt_bundle=prompt_bundle,
 			setting=self.provider_object.setting,
@@ -47,22 +165,70 @@ class LLMExecutor:
 		except KeyError:
 			log.error("%s", response_json)
 			raise Exception(_(f"Parsing error. Unexpected server response. Response: {response_json}"))
+		return sentence, self.adapter_object.extract_usage(response_json), response_json
 
-		response_text = text_policy.normalize_response(sentence)
-		output_text = text_policy.postprocess_output(response_text, input_text)
-		usage = self.adapter_object.extract_usage(response_json)
-
-		self.response_history.append(response_json)
-		self.usage_history.append(usage)
-		return LLMExecutionResult(
-			original_text=input_text,
-			output_text=output_text,
-			raw_response=response_json,
-			usage=usage,
+	def _execute_stream(self, prompt_bundle, input_text: str, text_policy) -> tuple[str, dict, dict]:
+		payload = self.adapter_object.format_stream_request(
+			prompt_bundle=prompt_bundle,
+			setting=self.provider_object.setting,
+		)
+		events = self.provider_object.stream(
+			payload,
+			model_name=self.adapter_object.model_name,
 		)
 
+		sentence = ""
+		usage = {}
+		cancelled = False
+		try:
+			for event in events:
+				text, event_usage = self.adapter_object.parse_stream_event(event)
+				usage.update(event_usage)
+				if not text:
+					continue
+				sentence += text
+				stopped_sentence = text_policy.check_stream_output(sentence, input_text)
+				if stopped_sentence is not None:
+					log.info("Cancelled a diverging stream after %d characters", len(sentence))
+					sentence = stopped_sentence
+					cancelled = True
+					break
+		finally:
+			# Closing the stream drops the connection, so the provider stops generating.
+			events.close()
+
+		if not sentence:
+			raise Exception(_(f"Parsing error. Unexpected server response. Response: {usage}"))
+		if cancelled:
+			# The final usage never arrives for a cancelled stream; estimate whatever is missing.
+			estimated_usage = self.adapter_object.estimate_usage(prompt_bundle, sentence)
+			for key, value in estimated_usage.items():
+				usage[key] = max(usage.get(key, 0), value)
+		return sentence, usage, {"output_text": sentence, "usage": usage, "cancelled": cancelled}
+
+	def _record_usage(self, response_json, usage: dict):
+		if self.usage_accumulator is not None:
+			self.usage_accumulator.add(usage)
+		# Without an accumulator the totals are computed from the usage history, so it is always kept.
+		if self.keep_response_history or self.usage_accumulator is None:
+			with self._history_lock:
+				if self.keep_response_history:
+					self.response_history.append(response_json)
+				self.usage_history.append(usage)
+
 	def get_total_usage(self) -> dict:
-		return self.adapter_object.get_total_usage(self.usage_history)
+		if self.usage_accumulator is not None:
+			return self.usage_accumulator.get_total_usage()
+		with self._history_lock:
+			usage_history = list(self.usage_history)
+		return self.adapter_object.get_total_usage(usage_history)
 
 	def get_total_cost(self) -> Decimal:
-		return self.adapter_object.get_total_cost(self.usage_history)
+		if self.usage_accumulator is not None:
+			return self.usage_accumulator.get_total_cost()
+		with self._history_lock:
+			usage_history = list(self.usage_history)
+		return self.adapter_object.get_total_cost(usage_history)
+
+	def get_summary(self) -> dict:
+		return {"deduplicated_requests": self.deduplicated_requests}
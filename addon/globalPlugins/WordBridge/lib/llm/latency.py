@@ -0,0 +1,100 @@
+"""
+Latency histograms per provider and model, used to size request timeouts from observed behavior.
+"""
+
+import bisect
+from threading import Lock
+
+# Upper bounds in seconds; a latency above the last bound counts as longer than any timeout allows.
+BUCKET_BOUNDS = (0.5, 1, 1.5, 2, 3, 4, 6, 8, 10, 15, 20, 30, 45, 60, 90, 120, 180, 300)
+# Requests are grouped by payload size in steps that double, starting below this many tokens.
+SIZE_CLASS_TOKENS = 256
+
+
+class LatencyHistogram:
+	"""
+	Bucketed latencies of successful requests, grouped by payload size. A timed-out request is recorded at the time
+	it gave up after, as it took at least that long.
+
+	Once a size class has min_samples observations, its timeout is the p99 latency times safety_factor. Counts
+	are halved whenever a class reaches max_samples, so recent behavior outweighs old behavior.
+	"""
+
+	def __init__(
+		self,
+		min_samples: int = 10,
+		max_samples: int = 1000,
+		safety_factor: float = 1.5,
+		min_timeout: float = 2,
+		max_timeout: float = 300,
+	):
+		self.min_samples = min_samples
+		self.max_samples = max_samples
+		self.safety_factor = safety_factor
+		self.min_timeout = min_timeout
+		self.max_timeout = max_timeout
+		self._counts = {}
+		self._lock = Lock()
+
+	def record(self, payload_tokens: int, seconds: float):
+		size_class = self._get_size_class(payload_tokens)
+		with self._lock:
+			counts = self._counts.setdefault(size_class, [0] * (len(BUCKET_BOUNDS) + 1))
+			counts[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+			if sum(counts) >= self.max_samples:
+				self._counts[size_class] = [count // 2 for count in counts]
+
+	def get_percentile(self, payload_tokens: int, percentile: float) -> float | None:
+		"""
+		Return the bucket bound below which the given share of latencies fall, or None without enough samples.
+		"""
+		with self._lock:
+			counts = list(self._counts.get(self._get_size_class(payload_tokens), []))
+		total = sum(counts)
+		if total < self.min_samples:
+			return None
+
+		cumulative = 0
+		for i, count in enumerate(counts):
+			cumulative += count
+			if cumulative >= total * percentile:
+				return BUCKET_BOUNDS[i] if i < len(BUCKET_BOUNDS) else float("inf")
+		return float("inf")
+
+	def get_timeout(self, payload_tokens: int, attempt: int, default: float) -> float:
+		p99 = self.get_percentile(payload_tokens, 0.99)
+		if p99 is None:
+			return default
+		# A retry waits longer, in case the first attempt hit a slow spell rather than a hung request.
+		timeout = p99 * self.safety_factor * (attempt + 1)
+		return max(self.min_timeout, min(timeout, self.max_timeout))
+
+	def get_summary(self) -> dict:
+		with self._lock:
+			size_classes = sorted(self._counts)
+		return {
+			f"<{SIZE_CLASS_TOKENS << size_class} tokens": {
+				"p50": self.get_percentile((SIZE_CLASS_TOKENS << size_class) - 1, 0.5),
+				"p99": self.get_percentile((SIZE_CLASS_TOKENS << size_class) - 1, 0.99),
+			}
+			for size_class in size_classes
+		}
+
+	def _get_size_class(self, payload_tokens: int) -> int:
+		return (payload_tokens // SIZE_CLASS_TOKENS).bit_length()
+
+
+_latency_histograms = {}
+_latency_histograms_lock = Lock()
+
+
+def get_latency_histogram(provider_name: str, model_name: str | None, stream: bool = False) -> LatencyHistogram:
+	"""
+	Return the histogram shared by every request to the same provider and model, so later corrections start from
+	what earlier ones observed. Streaming requests are kept apart, since only the time to the first event counts.
+	"""
+	key = (provider_name, model_name, stream)
+	with _latency_histograms_lock:
+		if key not in _latency_histograms:
+			_latency_histograms[key] = LatencyHistogram()
+		return _latency_histograms[key]
@@ -2,11 +2,18 @@ import json
 import logging
 import random
 import time
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from pathlib import Path
+from threading import BoundedSemaphore, Lock
 
 import requests
 from requests.utils import urlparse
 
+from .latency import get_latency_histogram
+from .token_estimator import estimate_tokens
+
 def _(s):
 	return s
 
@@ -19,6 +26,91 @@ except ImportError:
 
 log = logging.getLogger(__name__)
 
+# Statuses worth retrying elsewhere: timeouts, rate limits and overloaded or failing servers.
+FAILOVER_STATUS_CODES = {408, 429, 500, 502, 503, 504, 529}
+# Statuses whose Retry-After hint is worth waiting for before trying the same provider again.
+RETRY_AFTER_STATUS_CODES = {429, 503, 529}
+# A longer hint is better served by failing over to another provider.
+MAX_RETRY_AFTER = 20
+# The static timeouts in the provider settings were chosen for prompts of about this size.
+STATIC_TIMEOUT_TOKENS = 2000
+
+
+class ProviderError(Exception):
+	def __init__(self, message: str, status_code: int | None = None):
+		super().__init__(message)
+		self.status_code = status_code
+
+	@property
+	def retryable(self) -> bool:
+		# No status code means the request never got an answer, e.g. a timeout or a dropped connection.
+		return self.status_code is None or self.status_code in FAILOVER_STATUS_CODES
+
+
+_request_slots = {}
+_request_slots_lock = Lock()
+
+
+def get_request_slots(provider_name: str, url: str, max_concurrency: int | None):
+	"""
+	Return the semaphore shared by every request to the same endpoint, so proofreading tasks running side by side
+	stay within max_concurrency together instead of each on its own.
+	"""
+	if not max_concurrency:
+		return nullcontext()
+	key = (provider_name, url)
+	with _request_slots_lock:
+		if key not in _request_slots:
+			_request_slots[key] = BoundedSemaphore(max_concurrency)
+		return _request_slots[key]
+
+
+def parse_retry_after(value) -> float | None:
+	"""
+	Return the seconds a Retry-After header asks to wait, given as seconds or as an HTTP date.
+	"""
+	if not value:
+		return None
+	try:
+		return max(float(value), 0)
+	except ValueError:
+		pass
+	try:
+		retry_at = parsedate_to_datetime(value)
+	except (TypeError, ValueError):
+		return None
+	if retry_at.tzinfo is None:
+		retry_at = retry_at.replace(tzinfo=timezone.utc)
+	return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0)
+
+
+def iter_sse_events(response):
+	"""
+	Parse a text/event-stream body into the JSON payloads of its data fields.
+	"""
+	data_lines = []
+	# Read byte by byte so each event is handled as soon as it arrives instead of when a buffer fills.
+	for line in response.iter_lines(chunk_size=1):
+		line = line.decode("utf8") if isinstance(line, bytes) else line
+		if line.startswith(":"):
+			continue
+		if line:
+			field, separator, value = line.partition(":")
+			if field == "data":
+				data_lines.append(value[1:] if value.startswith(" ") else value)
+			continue
+
+		if not data_lines:
+			continue
+		data = "\n".join(data_lines)
+		data_lines = []
+		if data == "[DONE]":
+			return
+		yield json.loads(data)
+
+	if data_lines and "\n".join(data_lines) != "[DONE]":
+		yield json.loads("\n".join(data_lines))
+
 
 class Provider:
 	def __init__(self, credential: dict, retries: int = 2, backoff: int = 1):
@@ -33,6 +125,12 @@ class Provider:
 			self.setting = data["setting"]
 			self.timeout0 = data["timeout0"]
 			self.timeout_max = data["timeout_max"]
+			# The number of requests in flight at once across all tasks, e.g. 2 for a model on a local GPU.
+			self.max_concurrency = data.get("max_concurrency")
+
+	@property
+	def request_slots(self):
+		return get_request_slots(self.name, self.url, self.max_concurrency)
 
 	@property
 	def base_url(self):
@@ -50,25 +148,35 @@ class Provider:
 
 	def handle_errors(self, response):
 		if response.status_code != 200:
-			if response.status_code == 401:
-				raise Exception(_("Authentication error. Please check if the service provider's key is correct."))
-			if response.status_code == 403:
-				raise Exception(_("Country, region, or territory not supported."))
-			if response.status_code == 404:
-				raise Exception(_("Service does not exist. Please check if the model does not exist or has expired."))
-			if response.status_code == 429:
-				raise Exception(
+			status_code = response.status_code
+			if status_code == 401:
+				raise ProviderError(_("Authentication error. Please check if the service provider's key is correct."), status_code)
+			if status_code == 403:
+				raise ProviderError(_("Country, region, or territory not supported."), status_code)
+			if status_code == 404:
+				raise ProviderError(
+					_("Service does not exist. Please check if the model does not exist or has expired."),
+					status_code,
+				)
+			if status_code == 429:
+				raise ProviderError(
 					_("Rate limit reached for requests or you exceeded your current quota. ")
-					+ _("Please reduce the frequency of sending requests or check your account balance.")
+					+ _("Please reduce the frequency of sending requests or check your account balance."),
+					status_code,
 				)
-			if response.status_code == 503:
-				raise Exception(_("The server is currently overloaded, please try again later."))
-			message = json.loads(response.text)["error"]["message"]
-			raise Exception(
+			if status_code == 503:
+				raise ProviderError(_("The server is currently overloaded, please try again later."), status_code)
+			try:
+				message = json.loads(response.text)["error"]["message"]
+			except (ValueError, KeyError, TypeError):
+				# Gateways answer 5xx with HTML or plain text.
+				message = response.text[:200]
+			raise ProviderError(
 				_("An error occurred, status code = ") + "{status_code}, {message}".format(
-					status_code=response.status_code,
+					status_code=status_code,
 					message=message,
-				)
+				),
+				status_code,
 			)
 
 	def try_connection(self, timeout=10, try_count=1):
@@ -88,31 +196,69 @@ class Provider:
 					)
 				)
 
-		raise Exception(
+		raise ProviderError(
 			_("HTTP request error ({request_error}). Please check the network setting.").format(
 				request_error=request_error
 			)
 		)
 
-	def send(self, payload, model_name=None):
-		api_url = self.get_api_url(model_name=model_name)
+	def get_stream_api_url(self, model_name=None):
+		return self.get_api_url(model_name=model_name)
+
+	def get_static_timeout(self, attempt: int, payload_tokens: int) -> float:
+		# Larger prompts take proportionally longer, so they get proportionally more time.
+		scale = max(1, payload_tokens / STATIC_TIMEOUT_TOKENS)
+		return min(self.timeout0 * (attempt + 1), self.timeout_max) * scale
+
+	def get_retry_after(self, response) -> float | None:
+		if response.status_code not in RETRY_AFTER_STATUS_CODES:
+			return None
+		retry_after = parse_retry_after(response.headers.get("Retry-After"))
+		if retry_after is None or retry_after > MAX_RETRY_AFTER:
+			return None
+		return retry_after
+
+	def post(self, api_url, payload, stream=False, model_name=None):
 		headers = self.get_headers()
+		# Only streaming requests pass the flag, so plain requests look exactly as before.
+		stream_kwargs = {"stream": True} if stream else {}
+		# Only the time to the response headers is measured, which for a stream is the time to its first
+		# event.
+		latency_histogram = get_latency_histogram(self.name, model_name, stream)
+		payload_tokens = estimate_tokens(json.dumps(payload, ensure_ascii=False))
 
 		current_backoff = self.backoff
 		response = None
 		request_error = None
 
 		for r in range(self.retries):
-			timeout = min(self.timeout0 * (r + 1), self.timeout_max)
+			static_timeout = self.get_static_timeout(r, payload_tokens)
+			connect_timeout = latency_histogram.get_timeout(payload_tokens, attempt=r, default=static_timeout)
+			read_timeout = connect_timeout
+			timeout = connect_timeout
+			if stream:
+				# requests also applies the read timeout to every gap between events, and a model may pause
+				# longer mid-answer than it takes to start one, so only the connection gets the adaptive
+				# timeout.
+				read_timeout = max(connect_timeout, static_timeout)
+				timeout = (connect_timeout, read_timeout)
+			start_time = time.monotonic()
 			try:
 				response = requests.post(
 					api_url,
 					headers=headers,
 					json=payload,
 					timeout=timeout,
+					**stream_kwargs,
 				)
-				break
 			except Exception as e:
+				# The request took at least as long as its timeout; without the sample, timeouts could never
+				# raise the p99. A stream's read timeout covers the gaps between events, so only its connect
+				# timeout says anything about the time to the first event.
+				if isinstance(e, requests.exceptions.ConnectTimeout):
+					latency_histogram.record(payload_tokens, connect_timeout)
+				elif isinstance(e, requests.exceptions.Timeout) and not stream:
+					latency_histogram.record(payload_tokens, read_timeout)
 				request_error = type(e).__name__
 				log.error(
 					"Try = {try_index}, {request_error}, an error occurred when sending {provider} request: {e}".format(
@@ -124,16 +270,62 @@ class Provider:
 				)
 				current_backoff = min(current_backoff * (1 + random.random()), 3)
 				time.sleep(current_backoff)
+				continue
+
+			if response.status_code == 200:
+				latency_histogram.record(payload_tokens, time.monotonic() - start_time)
+			retry_after = self.get_retry_after(response)
+			if retry_after is None or r == self.retries - 1:
+				break
+			log.warning(
+				"Try = {try_index}, {provider} answered {status_code}, retrying after {retry_after} s".format(
+					try_index=(r + 1),
+					provider=self.name,
+					status_code=response.status_code,
+					retry_after=retry_after,
+				)
+			)
+			response.close()
+			response = None
+			time.sleep(retry_after)
 
 		if response is None:
-			raise Exception(
+			raise ProviderError(
 				_("HTTP request error ({request_error}). Please check the network setting.").format(
 					request_error=request_error
 				)
 			)
 
 		self.handle_errors(response)
-		return response.json()
+		return response
+
+	def send(self, payload, model_name=None):
+		with self.request_slots:
+			response = self.post(self.get_api_url(model_name=model_name), payload, model_name=model_name)
+			return response.json()
+
+	def stream(self, payload, model_name=None):
+		"""
+		Send a streaming request and yield its server-sent events as they arrive.
+		Closing the generator closes the connection, which stops the generation early.
+		"""
+		with self.request_slots:
+			response = self.post(
+				self.get_stream_api_url(model_name=model_name),
+				payload,
+				stream=True,
+				model_name=model_name,
+			)
+			try:
+				yield from iter_sse_events(response)
+			except requests.RequestException as e:
+				raise ProviderError(
+					_("HTTP request error ({request_error}). Please check the network setting.").format(
+						request_error=type(e).__name__
+					)
+				) from e
+			finally:
+				response.close()
 
 	def chat_completion(self, payload):
 		return self.send(payload)
@@ -167,6 +359,11 @@ class GoogleProvider(Provider):
 			raise ValueError("Google provider requires model_name when sending a request")
 		return f"{self.url}/models/{model_name}:generateContent?key={self.credential['api_key']}"
 
+	def get_stream_api_url(self, model_name=None):
+		if not model_name:
+			raise ValueError("Google provider requires model_name when sending a request")
+		return f"{self.url}/models/{model_name}:streamGenerateContent?alt=sse&key={self.credential['api_key']}"
+
 
 class OpenrouterProvider(Provider):
 	name = "OpenRouter"
@@ -176,6 +373,31 @@ class DeepseekProvider(Provider):
 	name = "DeepSeek"
 
 
+class LocalProvider(Provider):
+	"""
+	Any OpenAI-compatible chat completions server on this machine or network, like llama.cpp or Ollama.
+
+	No key is needed. The credential may name the server's base_url, e.g. {"base_url": "http://127.0.0.1:8080"},
+	and an api_key for servers started with one.
+	"""
+
+	name = "Local"
+
+	def __init__(self, credential: dict | None, retries: int = 2, backoff: int = 1):
+		super().__init__(credential or {}, retries=retries, backoff=backoff)
+		base_url = self.credential.get("base_url")
+		if base_url:
+			self.url = base_url.rstrip("/") + urlparse(self.url).path
+
+	def get_headers(self):
+		headers = {
+			"Content-Type": "application/json",
+		}
+		if self.credential.get("api_key"):
+			headers["Authorization"] = f"Bearer {self.credential['api_key']}"
+		return headers
+
+
 def get_provider(provider_name: str, credential: dict, retries: int = 2, backoff: int = 1) -> Provider:
 	provider_mapping = {
 		"OpenAI": OpenAIProvider,
@@ -183,6 +405,9 @@ def get_provider(provider_name: str, credential: dict, retries: int = 2, backoff
 		"DeepSeek": DeepseekProvider,
 		"Google": GoogleProvider,
 		"OpenRouter": OpenrouterProvider,
+		"Local": LocalProvider,
+		# The evaluation scripts name the local server after the tool that runs it.
+		"Ollama": LocalProvider,
 	}
 
 	provider_class = provider_mapping.get(provider_name)
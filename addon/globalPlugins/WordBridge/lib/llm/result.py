@@ -8,3 +8,4 @@ class LLMExecutionResult:
 	output_text: str
 	raw_response: dict[str, Any]
 	usage: dict[str, Any]
+	served_by: str = ""
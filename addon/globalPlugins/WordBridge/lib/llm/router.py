@@ -0,0 +1,172 @@
+import logging
+import time
+from collections import Counter
+from decimal import Decimal
+from threading import Lock
+
+from .provider import ProviderError
+from .result import LLMExecutionResult
+
+def _(s):
+	return s
+
+try:
+	import addonHandler
+	addonHandler.initTranslation()
+except ImportError:
+	pass
+
+
+log = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+	"""
+	Stop sending requests to a provider after repeated failures and probe it again after a cool-down.
+
+	Closed: requests pass. Open: requests are refused until reset_timeout has passed. Half open: a single
+	trial request passes; its success closes the breaker and its failure opens it again.
+	"""
+
+	def __init__(self, failure_threshold: int = 3, reset_timeout: float = 60, clock=time.monotonic):
+		self.failure_threshold = failure_threshold
+		self.reset_timeout = reset_timeout
+		self.clock = clock
+		self.failure_count = 0
+		self.opened_at = None
+		self.trial_in_progress = False
+		self._lock = Lock()
+
+	@property
+	def is_open(self) -> bool:
+		with self._lock:
+			return self.opened_at is not None
+
+	def allow_request(self) -> bool:
+		with self._lock:
+			if self.opened_at is None:
+				return True
+			if self.trial_in_progress or self.clock() - self.opened_at < self.reset_timeout:
+				return False
+			self.trial_in_progress = True
+			return True
+
+	def record_success(self):
+		with self._lock:
+			self.failure_count = 0
+			self.opened_at = None
+			self.trial_in_progress = False
+
+	def record_failure(self):
+		with self._lock:
+			self.failure_count += 1
+			if self.trial_in_progress or self.failure_count >= self.failure_threshold:
+				self.opened_at = self.clock()
+			self.trial_in_progress = False
+
+
+_circuit_breakers = {}
+_circuit_breakers_lock = Lock()
+
+
+def get_circuit_breaker(provider_name: str) -> CircuitBreaker:
+	"""
+	Return the breaker shared by every workflow that talks to provider_name, so an outage seen by one
+	correction is remembered by the next.
+	"""
+	with _circuit_breakers_lock:
+		if provider_name not in _circuit_breakers:
+			_circuit_breakers[provider_name] = CircuitBreaker()
+		return _circuit_breakers[provider_name]
+
+
+class FailoverExecutor:
+	"""
+	Executor over a primary route and its fallbacks, each an LLMExecutor for an equivalent corrector.
+
+	A route is skipped while its provider's circuit is open. Timeouts, rate limits and server errors count
+	against the circuit and move the request to the next route; other errors, like a wrong key, are raised.
+	"""
+
+	def __init__(self, executors: list, circuit_breaker_factory=get_circuit_breaker):
+		self.executors = executors
+		self.circuit_breakers = [circuit_breaker_factory(executor.provider_object.name) for executor in executors]
+		self._served_counts = Counter()
+		self._failover_count = 0
+		self._summary_lock = Lock()
+
+	@property
+	def adapter_object(self):
+		return self.executors[0].adapter_object
+
+	def ensure_connection(self):
+		error = None
+		for executor, circuit_breaker in zip(self.executors, self.circuit_breakers):
+			if not circuit_breaker.allow_request():
+				continue
+			try:
+				executor.ensure_connection()
+				return
+			except ProviderError as e:
+				circuit_breaker.record_failure()
+				error = e
+		raise error or ProviderError(_("All service providers are temporarily unavailable, please try again later."))
+
+	def execute(self, input_text: str, prompt_strategy, text_policy, previous_results: list | None = None) -> LLMExecutionResult:
+		error = None
+		for index, (executor, circuit_breaker) in enumerate(zip(self.executors, self.circuit_breakers)):
+			if not circuit_breaker.allow_request():
+				continue
+			try:
+				result = executor.execute(
+					input_text=input_text,
+					prompt_strategy=prompt_strategy,
+					text_policy=text_policy,
+					previous_results=previous_results,
+				)
+			except ProviderError as e:
+				if not e.retryable:
+					# The provider answered, so it is reachable; errors like a wrong key are not outages.
+					circuit_breaker.record_success()
+					raise
+				circuit_breaker.record_failure()
+				log.warning("%s failed, trying the next route: %s", executor.route_name, e)
+				error = e
+				continue
+
+			circuit_breaker.record_success()
+			with self._summary_lock:
+				if result.served_by:
+					self._served_counts[result.served_by] += 1
+				if index > 0:
+					self._failover_count += 1
+			return result
+
+		raise error or ProviderError(_("All service providers are temporarily unavailable, please try again later."))
+
+	def get_total_usage(self) -> dict:
+		total_usage = Counter()
+		for executor in self.executors:
+			total_usage.update(executor.get_total_usage())
+		return dict(total_usage)
+
+	def get_total_cost(self) -> Decimal:
+		return sum((executor.get_total_cost() for executor in self.executors), Decimal("0"))
+
+	def get_summary(self) -> dict:
+		summary = Counter()
+		for executor in self.executors:
+			summary.update(executor.get_summary())
+		with self._summary_lock:
+			return {
+				**summary,
+				"routing": {
+					"served_segments": dict(self._served_counts),
+					"failovers": self._failover_count,
+					"open_circuits": [
+						executor.route_name
+						for executor, circuit_breaker in zip(self.executors, self.circuit_breakers)
+						if circuit_breaker.is_open
+					],
+				},
+			}
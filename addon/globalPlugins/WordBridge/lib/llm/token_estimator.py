@@ -0,0 +1,16 @@
+"""
+Tokenizer-free token estimates for planning requests before they are sent.
+"""
+
+import math
+
+
+def estimate_tokens(text: str) -> int:
+	# CJK characters are roughly one token each in current tokenizers, other text about four characters per token.
+	wide_count = sum(1 for char in text if ord(char) >= 0x2E80)
+	return wide_count + math.ceil((len(text) - wide_count) / 4)
+
+
+def estimate_messages_tokens(messages: list, system_template: str = "") -> int:
+	# A few tokens of framing per message on top of its content.
+	return estimate_tokens(system_template) + sum(estimate_tokens(message["content"]) + 4 for message in messages)
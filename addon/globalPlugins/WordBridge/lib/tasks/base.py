@@ -24,6 +24,12 @@ class BaseTextPolicy(ABC):
 	def normalize_response(self, sentence: str) -> str:
 		raise NotImplementedError
 
+	def check_stream_output(self, partial_text: str, input_text: str) -> str | None:
+		"""
+		Return the usable part of a partially streamed answer once it clearly diverges, or None to keep streaming.
+		"""
+		return None
+
 
 class BaseTaskWorkflow(ABC):
 	@abstractmethod
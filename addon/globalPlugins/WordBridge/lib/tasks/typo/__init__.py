@@ -1,3 +1,5 @@
+from .detector import HomophoneTypoDetector
+from .prefilter import PlausibilityPrefilter
 from .prompt import LiteTypoPromptStrategy, StandardTypoPromptStrategy
 from .result import TypoCorrectionResult
 from .text_policy import LiteTypoTextPolicy, StandardTypoTextPolicy
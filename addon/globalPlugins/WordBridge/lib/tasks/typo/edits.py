@@ -0,0 +1,119 @@
+import re
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+
+EDIT_ARROW = "→"
+EDIT_PATTERN = re.compile(
+	r"([^\s→、，,；;「」『』\"'：:]+)[」』\"']?\s*(?:→|->|=>)\s*[「『\"']?([^\s→、，,；;「」『』\"'：:]+)"
+)
+
+
+@dataclass(frozen=True)
+class TypoEdit:
+	original: str
+	replacement: str
+
+
+def strip_typo_tags(text: str) -> str:
+	return text.replace("[[", "").replace("]]", "")
+
+
+def parse_edits(text: str) -> list:
+	"""
+	Read the edit list a model returned, one "原文→修正" pair per line.
+
+	Anything that is not such a pair, like the "無" reply for a segment without typos, is ignored.
+	"""
+	edits = []
+	for original, replacement in EDIT_PATTERN.findall(text):
+		original = strip_typo_tags(original)
+		replacement = strip_typo_tags(replacement)
+		if not original or original == replacement:
+			continue
+		edits.append(TypoEdit(original, replacement))
+	return edits
+
+
+def apply_edits(text: str, edits: list) -> str:
+	"""
+	Apply edits at the place their original fragment occurs in text.
+
+	Edits that would add or remove characters, whose original fragment does not occur exactly once, or that
+	overlap an edit listed before them are dropped, since there is no telling where the model meant them.
+	"""
+	spans = []
+	for edit in edits:
+		if len(edit.original) != len(edit.replacement):
+			continue
+		index = find_unique(text, edit.original)
+		if index < 0:
+			continue
+		end = index + len(edit.original)
+		if any(index < span_end and span_start < end for span_start, span_end, _replacement in spans):
+			continue
+		spans.append((index, end, edit.replacement))
+
+	result = text
+	for index, end, replacement in spans:
+		result = result[:index] + replacement + result[end:]
+	return result
+
+
+def find_unique(text: str, fragment: str) -> int:
+	"""
+	Return the index of fragment in text, or -1 when it does not occur exactly once.
+	"""
+	index = text.find(fragment)
+	if index < 0 or text.find(fragment, index + 1) >= 0:
+		return -1
+	return index
+
+
+def diff_edits(text: str, text_corrected: str) -> list:
+	"""
+	Return the edits that turn text into text_corrected.
+	"""
+	edits = []
+	matcher = SequenceMatcher(None, text, text_corrected, autojunk=False)
+	for op, index_start_before, index_end_before, index_start_after, index_end_after in matcher.get_opcodes():
+		if op == "equal":
+			continue
+		edits.append(TypoEdit(text[index_start_before:index_end_before], text_corrected[index_start_after:index_end_after]))
+	return edits
+
+
+def format_edits(text: str, text_corrected: str, no_edits: str) -> str:
+	"""
+	Describe the difference between two texts in the edit list format, for example to replay an earlier answer.
+
+	Like the few-shot examples, each edit carries the characters around the typo, widened until its original
+	fragment occurs only once in text, so that apply_edits can place it.
+	"""
+	matcher = SequenceMatcher(None, text, text_corrected, autojunk=False)
+	windows = []
+	for op, index_start_before, index_end_before, index_start_after, index_end_after in matcher.get_opcodes():
+		if op == "equal":
+			continue
+		start = max(index_start_before - 1, 0)
+		end = min(index_end_before + 1, len(text))
+		while find_unique(text, text[start:end]) < 0 and (start > 0 or end < len(text)):
+			start = max(start - 1, 0)
+			end = min(end + 1, len(text))
+		# Outside the changed ranges both texts are the same, so the window maps across by its distance from them.
+		if windows and start < windows[-1][1]:
+			window_start, window_end, window_start_after, _ = windows[-1]
+			end = max(end, window_end)
+			windows[-1] = (window_start, end, window_start_after, index_end_after + end - index_end_before)
+		else:
+			windows.append((
+				start,
+				end,
+				index_start_after - (index_start_before - start),
+				index_end_after + end - index_end_before,
+			))
+
+	lines = [
+		f"{text[start:end]}{EDIT_ARROW}{text_corrected[start_after:end_after]}"
+		for start, end, start_after, end_after in windows
+	]
+	return "\n".join(lines) if lines else no_edits
@@ -0,0 +1,117 @@
+import math
+from collections import Counter
+from threading import Lock
+
+import chinese_converter
+
+from ...text.chinese import is_chinese_character
+from .chinese_dictionary import pinyin_to_string, string_to_pinyin
+
+
+class CharBigramModel:
+	"""
+	Score Chinese text with a table of known character bigrams.
+
+	A character is suspicious when it forms no known bigram with either neighbour while one of its
+	homophones does, which is the typical shape of a typo produced by a pinyin or zhuyin input method.
+	"""
+	def __init__(self, bigrams, string_to_pinyin: dict, pinyin_to_string: dict):
+		self.bigrams = set(bigrams)
+		self.string_to_pinyin = string_to_pinyin
+		self.pinyin_to_string = pinyin_to_string
+		self.char_bigram_counts = Counter(char for bigram in self.bigrams for char in bigram)
+
+	def is_supported(self, text: str, index: int, char: str | None = None) -> bool:
+		char = char or text[index]
+		if index > 0 and (text[index - 1] + char) in self.bigrams:
+			return True
+		if index + 1 < len(text) and (char + text[index + 1]) in self.bigrams:
+			return True
+		return False
+
+	def get_homophones(self, char: str) -> list:
+		homophones = []
+		for pinyin in self.string_to_pinyin.get(char, []):
+			for candidate in self.pinyin_to_string.get(pinyin, []):
+				if candidate != char and candidate not in homophones:
+					homophones.append(candidate)
+		return homophones
+
+	def find_better_homophone(self, text: str, index: int) -> str | None:
+		if self.is_supported(text, index):
+			return None
+		for candidate in self.get_homophones(text[index]):
+			if self.is_supported(text, index, candidate):
+				return candidate
+		return None
+
+	def get_suspicion(self, text: str, index: int) -> float:
+		"""
+		Score how likely the character at index is a typo, 0 when it is not suspicious at all.
+
+		The score grows with the number of neighbours a homophone forms a known bigram with, and shrinks with
+		how common the character itself is: a character found in many bigrams is usually just used in a
+		combination the table lacks, while a rare one is usually a mistyped homophone.
+		"""
+		if self.is_supported(text, index):
+			return 0.0
+		supported_sides = 0
+		for candidate in self.get_homophones(text[index]):
+			supported_sides = max(
+				supported_sides,
+				int(index > 0 and (text[index - 1] + candidate) in self.bigrams)
+				+ int(index + 1 < len(text) and (candidate + text[index + 1]) in self.bigrams),
+			)
+		return supported_sides / (1 + math.log10(1 + self.char_bigram_counts[text[index]]))
+
+	def find_suspicious_indices(self, text: str) -> list:
+		return [
+			i for i, char in enumerate(text)
+			if is_chinese_character(char) and self.find_better_homophone(text, i) is not None
+		]
+
+	def find_rare_indices(self, text: str, min_char_bigrams: int) -> list:
+		"""
+		Return the characters found in fewer than min_char_bigrams known bigrams.
+
+		Typos that happen to form a known bigram are often rare characters no homophone check catches.
+		"""
+		return [
+			i for i, char in enumerate(text)
+			if char in self.string_to_pinyin and self.char_bigram_counts[char] < min_char_bigrams
+		]
+
+	def get_plausibility(self, text: str, min_char_bigrams: int = 0) -> float:
+		chinese_count = sum(1 for char in text if is_chinese_character(char))
+		if chinese_count == 0:
+			return 1.0
+		implausible_indices = set(self.find_suspicious_indices(text))
+		implausible_indices.update(self.find_rare_indices(text, min_char_bigrams))
+		return 1 - len(implausible_indices) / chinese_count
+
+
+def load_bigrams() -> set:
+	bigrams = set(getattr(chinese_converter, "bigrams", {}))
+	try:
+		from pypinyin.phrases_dict import phrases_dict
+	except ImportError:
+		phrases_dict = {}
+
+	for phrase in phrases_dict:
+		for variant in {phrase, chinese_converter.to_traditional(phrase)}:
+			for i in range(len(variant) - 1):
+				bigrams.add(variant[i:i + 2])
+
+	return bigrams
+
+
+_char_bigram_model = None
+_char_bigram_model_lock = Lock()
+
+
+def get_char_bigram_model() -> CharBigramModel:
+	global _char_bigram_model
+	with _char_bigram_model_lock:
+		if _char_bigram_model is None:
+			_char_bigram_model = CharBigramModel(load_bigrams(), string_to_pinyin, pinyin_to_string)
+	return _char_bigram_model
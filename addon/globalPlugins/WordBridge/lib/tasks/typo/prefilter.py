@@ -0,0 +1,55 @@
+from threading import Lock
+
+from .language_model import get_char_bigram_model
+
+# Measured on the 250-sentence eval corpus: skipping every segment without a suspicious character skipped 6.3%
+# and 2.9% of the segments with typos in the corpora with 10% and 25% typos, and 21% of the clean ones. Also
+# counting characters found in fewer than 10 known bigrams as implausible brings the false skips down to 2.3%
+# and 0.8%, while 16% of the clean segments are still skipped.
+DEFAULT_THRESHOLD = 1.0
+DEFAULT_MIN_CHAR_BIGRAMS = 10
+# Skipped segments are reported for review up to this many per run.
+MAX_REPORTED_SEGMENTS = 20
+
+
+class PlausibilityPrefilter:
+	"""
+	Decide locally whether a segment can skip the LLM because it already looks correct.
+
+	A skipped segment saves a request, but any typo in it stays, so the skipped segments are reported in the
+	telemetry next to the number of saved requests.
+	"""
+	def __init__(
+		self,
+		threshold: float = DEFAULT_THRESHOLD,
+		language_model=None,
+		min_char_bigrams: int = DEFAULT_MIN_CHAR_BIGRAMS,
+	):
+		self.threshold = threshold
+		self.language_model = language_model
+		self.min_char_bigrams = min_char_bigrams
+		self.checked_count = 0
+		self.skipped_count = 0
+		self.skipped_segments = []
+		self._lock = Lock()
+
+	def should_skip(self, text: str) -> bool:
+		language_model = self.language_model or get_char_bigram_model()
+		skip = language_model.get_plausibility(text, self.min_char_bigrams) >= self.threshold
+		with self._lock:
+			self.checked_count += 1
+			self.skipped_count += int(skip)
+			if skip and len(self.skipped_segments) < MAX_REPORTED_SEGMENTS:
+				self.skipped_segments.append(text)
+		return skip
+
+	def get_summary(self) -> dict:
+		with self._lock:
+			return {
+				"threshold": self.threshold,
+				"min_char_bigrams": self.min_char_bigrams,
+				"checked": self.checked_count,
+				"skipped": self.skipped_count,
+				"skip_rate": self.skipped_count / self.checked_count if self.checked_count else 0.0,
+				"skipped_segments": list(self.skipped_segments),
+			}
@@ -1,13 +1,16 @@
 from copy import deepcopy
 import json
 import os
+from threading import Lock
 
 from pypinyin import Style, lazy_pinyin
 
 from ...llm.prompt_bundle import PromptBundle
+from ...llm.token_estimator import estimate_tokens
 from ...text.chinese import PUNCTUATION, is_chinese_character
 from ..base import BasePromptStrategy
-from .utils import get_char_pinyin
+from .edits import diff_edits, format_edits, strip_typo_tags
+from .vocabulary import ensure_custom_vocabulary
 
 
 class TypoPromptStrategy(BasePromptStrategy):
@@ -17,10 +20,18 @@ class TypoPromptStrategy(BasePromptStrategy):
 		template_name: str,
 		optional_guidance_enable: dict = None,
 		customized_words: list = None,
+		customized_words_token_budget: int = 50,
+		max_history_responses: int = 2,
 	):
 		self.language = language
 		self.optional_guidance_enable = optional_guidance_enable or {}
-		self.customized_words = customized_words or []
+		self.customized_words = ensure_custom_vocabulary(customized_words)
+		self.customized_words_token_budget = customized_words_token_budget
+		self._vocabulary_usage = {"matched_words": 0, "injected_words": 0, "injected_tokens": 0, "saved_tokens": 0}
+		self._vocabulary_usage_lock = Lock()
+		self.max_history_responses = max_history_responses
+		self._history_usage = {"replayed_responses": 0, "dropped_responses": 0, "history_tokens": 0}
+		self._history_usage_lock = Lock()
 
 		file_dirpath = os.path.dirname(__file__)
 		template_path = os.path.join(file_dirpath, "..", "..", "..", "setting", "templates", template_name)
@@ -44,16 +55,49 @@ class TypoPromptStrategy(BasePromptStrategy):
 
 		message_template = self._replace_newlines_in_messages(message_template)
 		messages = self._render_input_messages(message_template, preprocessed_text, input_info, text_policy)
+		if input_info["word_candidates"]:
+			# Kept out of the system prompt so that the shared prefix stays identical across segments.
+			optional_guidance = self.template[self.language]["optional_guidance"]
+			vocabulary = optional_guidance["customized_words"] + "、".join(input_info["word_candidates"])
+			messages[-1]["content"] = vocabulary + "\n" + messages[-1]["content"]
 
 		comment_template = self.template[self.language]["comment"].replace("\\n", "\n")
-		for response_previous in response_text_history:
-			response_previous_wrapped = text_policy.wrap_history_response(response_previous)
+		history_responses = self._select_history_responses(input_text, response_text_history)
+		history_tokens = 0
+		for response_previous in history_responses:
+			response_previous_wrapped = self._wrap_history_response(input_text, response_previous, text_policy)
 			comment = comment_template.replace("{{response_previous}}", response_previous_wrapped)
 			messages.append({"role": "assistant", "content": response_previous_wrapped})
 			messages.append({"role": "user", "content": comment})
+			history_tokens += estimate_tokens(response_previous_wrapped) + estimate_tokens(comment)
 
+		if response_text_history:
+			with self._history_usage_lock:
+				self._history_usage["replayed_responses"] += len(history_responses)
+				self._history_usage["dropped_responses"] += len(response_text_history) - len(history_responses)
+				self._history_usage["history_tokens"] += history_tokens
 		return messages
 
+	def _select_history_responses(self, input_text: str, response_text_history: list) -> list:
+		"""
+		Keep at most max_history_responses earlier answers, preferring the ones that tried edits no kept answer tried.
+
+		Later answers win ties, and the kept answers are replayed in their original order.
+		"""
+		if len(response_text_history) <= self.max_history_responses:
+			return list(response_text_history)
+
+		text = strip_typo_tags(input_text)
+		edit_sets = [set(diff_edits(text, response)) for response in response_text_history]
+		selected_indices = []
+		covered_edits = set()
+		while len(selected_indices) < self.max_history_responses:
+			candidates = [i for i in range(len(response_text_history)) if i not in selected_indices]
+			best_index = max(candidates, key=lambda i: (len(edit_sets[i] - covered_edits), i))
+			selected_indices.append(best_index)
+			covered_edits |= edit_sets[best_index]
+		return [response_text_history[i] for i in sorted(selected_indices)]
+
 	def build_system_template(self, input_info: dict):
 		if input_info["focus_typo"]:
 			system_template = deepcopy(self.template[self.language]["system_tag"])
@@ -63,6 +107,9 @@ class TypoPromptStrategy(BasePromptStrategy):
 		system_template = system_template.replace("\\n", "\n")
 		return self._add_system_guidance(system_template, input_info)
 
+	def _wrap_history_response(self, input_text: str, response_previous: str, text_policy) -> str:
+		return text_policy.wrap_history_response(response_previous)
+
 	def _replace_newlines_in_messages(self, messages):
 		for i in range(len(messages)):
 			messages[i]["content"] = messages[i]["content"].replace("\\n", "\n")
@@ -73,6 +120,7 @@ class TypoPromptStrategy(BasePromptStrategy):
 			"input_text": input_text,
 			"contain_non_chinese": False,
 			"focus_typo": "[[" in input_text and "]]" in input_text,
+			"word_candidates": self._select_word_candidates(input_text),
 		}
 		for char in input_text:
 			if not is_chinese_character(char) and char not in PUNCTUATION:
@@ -81,21 +129,47 @@ class TypoPromptStrategy(BasePromptStrategy):
 		return input_info
 
 	def _find_word_candidate(self, input_text, customized_words):
-		candidates = []
-		for word in customized_words:
-			if len(word) > len(input_text):
+		return customized_words.find_candidates(input_text)
+
+	def _select_word_candidates(self, input_text):
+		if not self.customized_words:
+			return []
+
+		candidates = self._find_word_candidate(input_text, self.customized_words)
+		selected = []
+		selected_tokens = 0
+		dropped_tokens = 0
+		for word in self.customized_words.rank_candidates(input_text, candidates):
+			# One extra token for the separator between words.
+			word_tokens = estimate_tokens(word) + 1
+			if selected_tokens + word_tokens > self.customized_words_token_budget:
+				dropped_tokens += word_tokens
 				continue
-			for i in range(len(input_text) - len(word) + 1):
-				flag = True
-				for j in range(len(word)):
-					if len(set(get_char_pinyin(word[j])) & set(get_char_pinyin(input_text[i + j]))) == 0:
-						flag = False
-						break
-				if flag:
-					candidates.append(word)
-					break
-
-		return candidates
+			selected.append(word)
+			selected_tokens += word_tokens
+
+		with self._vocabulary_usage_lock:
+			self._vocabulary_usage["matched_words"] += len(candidates)
+			self._vocabulary_usage["injected_words"] += len(selected)
+			self._vocabulary_usage["injected_tokens"] += selected_tokens
+			self._vocabulary_usage["saved_tokens"] += dropped_tokens
+		return selected
+
+	def get_summary(self) -> dict:
+		summary = {}
+		if self.customized_words:
+			with self._vocabulary_usage_lock:
+				summary["customized_words"] = {
+					"token_budget": self.customized_words_token_budget,
+					**self._vocabulary_usage,
+				}
+		with self._history_usage_lock:
+			if self._history_usage["replayed_responses"] or self._history_usage["dropped_responses"]:
+				summary["history"] = {
+					"max_responses": self.max_history_responses,
+					**self._history_usage,
+				}
+		return summary
 
 	def _add_system_guidance(self, system_template: str, input_info: dict) -> str:
 		guidance_list = []
@@ -107,10 +181,6 @@ class TypoPromptStrategy(BasePromptStrategy):
 		if self.optional_guidance_enable.get("keep_non_chinese_char") and input_info["contain_non_chinese"]:
 			guidance_list.append(optional_guidance["keep_non_chinese_char"])
 
-		word_candidate = self._find_word_candidate(input_info["input_text"], self.customized_words)
-		if word_candidate:
-			system_template = system_template + "\n" + optional_guidance["customized_words"] + "、".join(word_candidate)
-
 		if not guidance_list:
 			return system_template
 
@@ -129,6 +199,13 @@ class LiteTypoPromptStrategy(TypoPromptStrategy):
 		return template
 
 
+class EditTypoPromptStrategy(LiteTypoPromptStrategy):
+	def _wrap_history_response(self, input_text: str, response_previous: str, text_policy) -> str:
+		# Earlier answers are stored as corrected text, so replay them in the edit list format the model used.
+		no_edits = self.template[self.language]["no_edits"]
+		return format_edits(strip_typo_tags(input_text), response_previous, no_edits)
+
+
 class StandardTypoPromptStrategy(TypoPromptStrategy):
 	def _render_input_messages(self, template: list, preprocessed_text: str, input_info: dict, text_policy):
 		phone = " ".join(lazy_pinyin(preprocessed_text, style=Style.TONE3))
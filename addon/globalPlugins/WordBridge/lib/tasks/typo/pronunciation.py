@@ -0,0 +1,115 @@
+from collections import Counter, defaultdict
+from functools import lru_cache
+from pathlib import Path
+import csv
+
+DATA_PATH = Path(__file__).resolve().parent / "data"
+ZHUYIN_TONES = {"ˉ": 1, "ˊ": 2, "ˇ": 3, "ˋ": 4, "˙": 5}
+TONE_MARKS = {"a": "āáǎà", "e": "ēéěè", "i": "īíǐì", "o": "ōóǒò", "u": "ūúǔù", "ü": "ǖǘǚǜ"}
+
+
+def _is_zhuyin(syllable: str) -> bool:
+	return any("ㄅ" <= char <= "ㄯ" or "ㆠ" <= char <= "ㆿ" or char in ZHUYIN_TONES for char in syllable)
+
+
+def _load_readings(filename: str) -> dict:
+	readings = defaultdict(set)
+	with (DATA_PATH / filename).open(encoding="utf8", newline="") as csvfile:
+		reader = csv.reader(csvfile)
+		next(reader, None)
+		for row in reader:
+			for reading in row[2].split("/"):
+				if reading.strip():
+					readings[row[0]].add(reading.strip())
+	return readings
+
+
+@lru_cache(maxsize=1)
+def load_zhuyin_to_pinyin() -> dict:
+	"""
+	Map toneless zhuyin syllables to toneless pinyin.
+
+	The bundled zhuyin and numbered pinyin dictionaries list the same characters, so every character with a
+	single reading in both files pairs one zhuyin syllable with its pinyin spelling.
+	"""
+	zhuyin_readings = _load_readings("chinese_dictionary_bopomofo.csv")
+	pinyin_readings = _load_readings("chinese_dictionary_pinyin_number.csv")
+
+	counters = defaultdict(Counter)
+	for char, zhuyins in zhuyin_readings.items():
+		pinyins = pinyin_readings.get(char, set())
+		if len(zhuyins) != 1 or len(pinyins) != 1:
+			continue
+		zhuyin = next(iter(zhuyins)).strip("".join(ZHUYIN_TONES))
+		pinyin = next(iter(pinyins)).rstrip("012345")
+		counters[zhuyin][pinyin] += 1
+
+	return {zhuyin: counter.most_common(1)[0][0] for zhuyin, counter in counters.items()}
+
+
+def add_tone_mark(syllable: str, tone: int) -> str:
+	if tone == 5:
+		return syllable
+
+	for vowel in ("a", "e"):
+		if vowel in syllable:
+			index = syllable.index(vowel)
+			break
+	else:
+		if "ou" in syllable:
+			index = syllable.index("o")
+		else:
+			indices = [i for i, char in enumerate(syllable) if char in TONE_MARKS]
+			if not indices:
+				return syllable
+			index = indices[-1]
+
+	return syllable[:index] + TONE_MARKS[syllable[index]][tone - 1] + syllable[index + 1:]
+
+
+def zhuyin_to_pinyin(syllable: str) -> str | None:
+	tone = 1
+	if syllable[-1] in ZHUYIN_TONES:
+		tone = ZHUYIN_TONES[syllable[-1]]
+		syllable = syllable[:-1]
+	if syllable and syllable[0] == "˙":
+		tone = 5
+		syllable = syllable[1:]
+
+	pinyin = load_zhuyin_to_pinyin().get(syllable)
+	if pinyin is None:
+		return None
+	return add_tone_mark(pinyin.replace("v", "ü"), tone)
+
+
+def numbered_pinyin_to_pinyin(syllable: str) -> str | None:
+	syllable = syllable.lower().replace("u:", "ü").replace("v", "ü")
+	tone = 5
+	if syllable[-1].isdigit():
+		tone = int(syllable[-1]) or 5
+		syllable = syllable[:-1]
+	if tone > 5 or not syllable.isalpha():
+		return None
+	if syllable[0] in "jqxy":
+		syllable = syllable.replace("ü", "u")
+	if any(char in marks for char in syllable for marks in TONE_MARKS.values()):
+		# Already written with tone marks.
+		return syllable
+	return add_tone_mark(syllable, tone)
+
+
+def parse_pronunciation(pronunciation: str) -> tuple | None:
+	"""
+	Parse a space separated pronunciation written in numbered pinyin or zhuyin into tone-marked pinyin,
+	the spelling used by the character dictionary. Returns None if any syllable cannot be understood.
+	"""
+	syllables = []
+	for syllable in pronunciation.split():
+		if _is_zhuyin(syllable):
+			pinyin = zhuyin_to_pinyin(syllable)
+		else:
+			pinyin = numbered_pinyin_to_pinyin(syllable)
+		if pinyin is None:
+			return None
+		syllables.append(pinyin)
+	return tuple(syllables) or None
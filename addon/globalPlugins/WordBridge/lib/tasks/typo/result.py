@@ -1,10 +1,22 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from decimal import Decimal
 
 
+@dataclass(frozen=True)
+class CorrectionTierSummary:
+	name: str
+	model_name: str
+	segment_count: int
+	escalation_count: int
+	cost: Decimal
+	latency: float
+
+
 @dataclass
 class TypoCorrectionResult:
 	corrected_text: str
 	diff: list
 	usage_summary: dict
 	cost: Decimal
+	telemetry: dict = field(default_factory=dict)
+	tiers: list = field(default_factory=list)
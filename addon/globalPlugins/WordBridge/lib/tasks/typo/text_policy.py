@@ -2,6 +2,7 @@ import chinese_converter
 
 from ...text.chinese import SEPERATOR, has_chinese, has_simplified_chinese_char, has_traditional_chinese_char
 from ..base import BaseTextPolicy
+from .edits import EDIT_PATTERN, apply_edits, parse_edits, strip_typo_tags
 
 
 class TypoTextPolicy(BaseTextPolicy):
@@ -44,6 +45,21 @@ class TypoTextPolicy(BaseTextPolicy):
 	def has_target_language(self, text: str) -> bool:
 		return has_chinese(text)
 
+	def get_output_length_limit(self, input_text: str) -> int:
+		# A corrected segment keeps the length of its input, so anything much longer is not a correction.
+		return len(self.prefix + self.answer_string + input_text + self.suffix) * 3 // 2 + 8
+
+	def check_stream_output(self, partial_text: str, input_text: str) -> str | None:
+		# A line break the input does not have starts an explanation after the answer.
+		lines = partial_text.split("\n")
+		expected_line_count = input_text.count("\n") + 1
+		if len(lines) > expected_line_count:
+			return "\n".join(lines[:expected_line_count])
+		limit = self.get_output_length_limit(input_text)
+		if len(partial_text) > limit:
+			return partial_text[:limit]
+		return None
+
 	def normalize_response(self, sentence: str) -> str:
 		if self.language == "zh_traditional" and has_simplified_chinese_char(sentence):
 			sentence = chinese_converter.to_traditional(sentence)
@@ -56,6 +72,31 @@ class LiteTypoTextPolicy(TypoTextPolicy):
 	pass
 
 
+class EditTypoTextPolicy(TypoTextPolicy):
+	"""
+	Policy for templates whose answer is an edit list rather than the corrected text.
+	The edits are applied to the input here, so the rest of the workflow still sees a corrected segment.
+	"""
+	def postprocess_output(self, text: str, input_text: str) -> str:
+		return apply_edits(strip_typo_tags(input_text), parse_edits(text))
+
+	def get_output_length_limit(self, input_text: str) -> int:
+		# Every character replaced at most once, with its context and an arrow.
+		return len(input_text) * 3 + 8
+
+	def check_stream_output(self, partial_text: str, input_text: str) -> str | None:
+		lines = partial_text.split("\n")
+		# The last line may still be arriving, so only complete lines are checked.
+		for i, line in enumerate(lines[:-1]):
+			if line.strip() and not EDIT_PATTERN.search(line):
+				# Either the "no typos" reply or an explanation; nothing after it is an edit.
+				return "\n".join(lines[:i]) or line
+		limit = self.get_output_length_limit(input_text)
+		if len(partial_text) > limit:
+			return partial_text[:limit]
+		return None
+
+
 class StandardTypoTextPolicy(TypoTextPolicy):
 	def __init__(self, language: str):
 		if language == "zh_traditional":
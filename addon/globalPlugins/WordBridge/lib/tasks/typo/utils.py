@@ -75,25 +75,37 @@ def create_encode_string(tokens, mapping):
 	return "".join([mapping[token] for token in tokens])
 
 
-def text_segmentation(text: str, max_length: int = 30) -> tuple:
-	partitions = []
+def iter_text_segments(chunks, max_length: int = 30):
+	"""
+	Streaming form of text_segmentation. Chunks may split the text anywhere; the segments are identical.
+	"""
+	partition = None
 	word = ""
-	for char in text:
-		word += char
+	for chunk in chunks:
+		for char in chunk:
+			word += char
 
-		if char in PUNCTUATION and len(word) >= max_length:
-			partitions.append(word)
-			word = ""
+			if char in PUNCTUATION and len(word) >= max_length:
+				if partition is not None:
+					yield partition
+				partition = word
+				word = ""
 
 	if not word:
-		return partitions
-
-	if not partitions or len(word) > max_length / 2:
-		partitions.append(word)
+		if partition is not None:
+			yield partition
+		return
+
+	if partition is None or len(word) > max_length / 2:
+		if partition is not None:
+			yield partition
+		yield word
 	else:
-		partitions[-1] += word
+		yield partition + word
 
-	return partitions
+
+def text_segmentation(text: str, max_length: int = 30) -> tuple:
+	return list(iter_text_segments([text], max_length=max_length))
 
 
 def analyze_diff(char_original: str, char_corrected: str) -> list:
@@ -0,0 +1,82 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+
+from .pronunciation import parse_pronunciation
+from .utils import get_char_pinyin
+
+
+@dataclass(frozen=True)
+class CustomWord:
+	text: str
+	pronunciation: str
+	char_pinyins: tuple
+
+
+@lru_cache(maxsize=8192)
+def get_char_pinyin_set(char: str) -> frozenset:
+	return frozenset(get_char_pinyin(char))
+
+
+def create_custom_word(text: str, pronunciation: str = "") -> CustomWord:
+	"""
+	Precompute the pinyin of every character of a word. A pronunciation given by the user takes precedence
+	over the dictionary readings when it has one syllable per character.
+	"""
+	syllables = parse_pronunciation(pronunciation) if pronunciation else None
+	if syllables is not None and len(syllables) == len(text):
+		char_pinyins = tuple(frozenset([syllable]) for syllable in syllables)
+	else:
+		char_pinyins = tuple(get_char_pinyin_set(char) for char in text)
+	return CustomWord(text=text, pronunciation=pronunciation, char_pinyins=char_pinyins)
+
+
+class CustomVocabulary:
+	"""
+	Custom words indexed by the pinyin of their first character, so a segment is only compared with the
+	words that can start at each of its characters.
+	"""
+	def __init__(self, words):
+		self.words = tuple(word if isinstance(word, CustomWord) else create_custom_word(word) for word in words or [])
+		self._order = {word.text: index for index, word in enumerate(self.words)}
+		self._index = defaultdict(list)
+		for word in self.words:
+			if not word.text:
+				continue
+			for pinyin in word.char_pinyins[0]:
+				self._index[pinyin].append(word)
+
+	def __iter__(self):
+		return iter(self.words)
+
+	def __len__(self):
+		return len(self.words)
+
+	def find_candidates(self, input_text: str) -> list:
+		input_pinyins = [get_char_pinyin_set(char) for char in input_text]
+		candidates = set()
+		for i, pinyins in enumerate(input_pinyins):
+			for pinyin in pinyins:
+				for word in self._index.get(pinyin, ()):
+					if word.text in candidates or i + len(word.text) > len(input_text):
+						continue
+					if all(word.char_pinyins[j] & input_pinyins[i + j] for j in range(1, len(word.text))):
+						candidates.add(word.text)
+
+		return sorted(candidates, key=self._order.__getitem__)
+
+	def rank_candidates(self, input_text: str, candidates: list) -> list:
+		"""
+		Longer words first, as short words match by chance more often; then words the segment does not already
+		spell correctly, since those are the ones the model may need to restore.
+		"""
+		return sorted(candidates, key=lambda text: (-len(text), text in input_text, self._order[text]))
+
+
+def ensure_custom_vocabulary(words) -> CustomVocabulary:
+	"""
+	Accept a prebuilt CustomVocabulary as well as plain strings or CustomWord objects.
+	"""
+	if isinstance(words, CustomVocabulary):
+		return words
+	return CustomVocabulary(words)
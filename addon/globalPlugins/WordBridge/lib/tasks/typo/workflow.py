@@ -1,3 +1,9 @@
+import time
+from collections import Counter
+from decimal import Decimal
+
+from ...llm.budget import BudgetExceeded
+from ...llm.result import LLMExecutionResult
 from ..concurrency import parallel_map
 from .utils import (
 	find_correction_errors,
@@ -6,15 +12,27 @@ from .utils import (
 	strings_diff,
 	text_segmentation,
 )
-from .result import TypoCorrectionResult
+from .result import CorrectionTierSummary, TypoCorrectionResult
 
 
 class TypoCorrectionWorkflow:
-	def __init__(self, executor, prompt_strategy, text_policy, max_correction_attempts: int = 3):
+	def __init__(
+		self,
+		executor,
+		prompt_strategy,
+		text_policy,
+		max_correction_attempts: int = 3,
+		prefilter=None,
+		detector=None,
+		budget=None,
+	):
 		self.executor = executor
 		self.prompt_strategy = prompt_strategy
 		self.text_policy = text_policy
 		self.max_correction_attempts = max_correction_attempts
+		self.prefilter = prefilter
+		self.detector = detector
+		self.budget = budget
 
 	def run(self, input_text: str, batch_mode: bool = True) -> TypoCorrectionResult:
 		self.executor.ensure_connection()
@@ -23,15 +41,31 @@ class TypoCorrectionWorkflow:
 		segments = text_segmentation(input_text, max_length=100)
 
 		if batch_mode:
-			results = parallel_map(self._execute_segment, segments)
+			results = parallel_map(self._execute_first_pass_segment, segments)
 		else:
-			results = [self._execute_segment(segment) for segment in segments]
+			results = [self._execute_first_pass_segment(segment) for segment in segments]
 
 		for res in results:
 			text_corrected += res.output_text
 
+		final_text = self._recorrect(input_text, text_corrected, batch_mode)
+		diff = strings_diff(input_text, final_text)
+		return TypoCorrectionResult(
+			corrected_text=final_text,
+			diff=diff,
+			usage_summary=self.executor.get_total_usage(),
+			cost=self.executor.get_total_cost(),
+			telemetry=self.get_telemetry(),
+		)
+
+	def _recorrect(self, input_text: str, text_corrected: str, batch_mode: bool = True) -> str:
+		"""
+		Send the segments whose corrections fail validation back to the model until they pass or attempts run out.
+		"""
 		recorrection_history = None
 		for i in range(self.max_correction_attempts):
+			if self.budget is not None and self.budget.exhausted:
+				break
 			text_corrected_revised, typo_indices = find_correction_errors(input_text, text_corrected)
 			if text_corrected_revised == text_corrected:
 				break
@@ -67,19 +101,136 @@ class TypoCorrectionWorkflow:
 				else:
 					text_corrected += segments_revised[j]
 
-		final_text = review_correction_errors(input_text, text_corrected)
-		diff = strings_diff(input_text, final_text)
-		return TypoCorrectionResult(
-			corrected_text=final_text,
-			diff=diff,
-			usage_summary=self.executor.get_total_usage(),
-			cost=self.executor.get_total_cost(),
-		)
+		return review_correction_errors(input_text, text_corrected)
+
+	def get_telemetry(self) -> dict:
+		telemetry = {}
+		if self.prefilter is not None:
+			telemetry["prefilter"] = self.prefilter.get_summary()
+		if self.detector is not None:
+			telemetry["detector"] = self.detector.get_summary()
+		if self.budget is not None:
+			telemetry["budget"] = self.budget.get_summary()
+		get_prompt_summary = getattr(self.prompt_strategy, "get_summary", None)
+		if get_prompt_summary is not None:
+			telemetry.update(get_prompt_summary())
+		get_executor_summary = getattr(self.executor, "get_summary", None)
+		if get_executor_summary is not None:
+			telemetry.update(get_executor_summary())
+		return telemetry
+
+	def _execute_first_pass_segment(self, input_text: str, fallback_text: str | None = None):
+		if self.prefilter is not None and self.prefilter.should_skip(input_text):
+			return LLMExecutionResult(input_text, input_text, {}, {})
+		segment = self.detector.annotate(input_text) if self.detector is not None else input_text
+		try:
+			return self._request_segment(segment)
+		except BudgetExceeded:
+			# Out of budget; keep the best text so far.
+			return LLMExecutionResult(input_text, input_text if fallback_text is None else fallback_text, {}, {})
 
 	def _execute_segment(self, input_text: str, previous_results: list | None = None):
+		try:
+			return self._request_segment(input_text, previous_results)
+		except BudgetExceeded:
+			# An empty output keeps the segment as it is.
+			return LLMExecutionResult(input_text, "", {}, {})
+
+	def _request_segment(self, input_text: str, previous_results: list | None = None):
 		return self.executor.execute(
 			input_text=input_text,
 			prompt_strategy=self.prompt_strategy,
 			text_policy=self.text_policy,
 			previous_results=previous_results,
 		)
+
+
+class CascadeTypoCorrectionWorkflow:
+	"""
+	Run a cheap first-pass workflow over every segment and escalate only the disputed ones.
+
+	A segment is escalated when the first-pass model changed it, whether or not the change passes
+	find_correction_errors. The escalation workflow corrects those segments from the original text and
+	then handles all recorrection, so the final answer always comes from the stronger model. A segment the
+	budget cannot escalate keeps its first-pass correction.
+	"""
+
+	def __init__(self, first_pass_workflow: TypoCorrectionWorkflow, escalation_workflow: TypoCorrectionWorkflow):
+		self.first_pass_workflow = first_pass_workflow
+		self.escalation_workflow = escalation_workflow
+
+	def run(self, input_text: str, batch_mode: bool = True) -> TypoCorrectionResult:
+		first_pass = self.first_pass_workflow
+		escalation = self.escalation_workflow
+		first_pass.executor.ensure_connection()
+
+		segments = text_segmentation(input_text, max_length=100)
+		start_time = time.perf_counter()
+		first_pass_results = self._map(first_pass._execute_first_pass_segment, segments, batch_mode)
+		first_pass_latency = time.perf_counter() - start_time
+
+		outputs = [res.output_text for res in first_pass_results]
+		escalated_indices = []
+		invalid_count = 0
+		for i, segment in enumerate(segments):
+			if outputs[i] == segment:
+				continue
+			escalated_indices.append(i)
+			if find_correction_errors(segment, outputs[i])[1]:
+				invalid_count += 1
+
+		start_time = time.perf_counter()
+		if escalated_indices:
+			escalation.executor.ensure_connection()
+			escalated_results = self._map(
+				escalation._execute_first_pass_segment,
+				[segments[i] for i in escalated_indices],
+				batch_mode,
+				iterable_kwargs=[{"fallback_text": outputs[i]} for i in escalated_indices],
+			)
+			for i, res in zip(escalated_indices, escalated_results):
+				outputs[i] = res.output_text
+		final_text = escalation._recorrect(input_text, "".join(outputs), batch_mode)
+		escalation_latency = time.perf_counter() - start_time
+
+		tiers = [
+			CorrectionTierSummary(
+				name="first_pass",
+				model_name=first_pass.executor.adapter_object.model_name,
+				segment_count=len(segments),
+				escalation_count=len(escalated_indices),
+				cost=first_pass.executor.get_total_cost(),
+				latency=first_pass_latency,
+			),
+			CorrectionTierSummary(
+				name="escalation",
+				model_name=escalation.executor.adapter_object.model_name,
+				segment_count=len(escalated_indices),
+				escalation_count=0,
+				cost=escalation.executor.get_total_cost(),
+				latency=escalation_latency,
+			),
+		]
+		usage_summary = Counter(first_pass.executor.get_total_usage())
+		usage_summary.update(escalation.executor.get_total_usage())
+		telemetry = first_pass.get_telemetry()
+		telemetry["cascade"] = {
+			"segments": len(segments),
+			"escalated_segments": len(escalated_indices),
+			"invalid_first_pass_segments": invalid_count,
+		}
+		telemetry["escalation"] = escalation.get_telemetry()
+		return TypoCorrectionResult(
+			corrected_text=final_text,
+			diff=strings_diff(input_text, final_text),
+			usage_summary=dict(usage_summary),
+			cost=sum((tier.cost for tier in tiers), Decimal("0")),
+			telemetry=telemetry,
+			tiers=tiers,
+		)
+
+	def _map(self, function, segments: list, batch_mode: bool, iterable_kwargs: list | None = None) -> list:
+		iterable_kwargs = iterable_kwargs or [{} for _ in segments]
+		if batch_mode:
+			return parallel_map(function, segments, iterable_kwargs=iterable_kwargs)
+		return [function(segment, **kwargs) for segment, kwargs in zip(segments, iterable_kwargs)]
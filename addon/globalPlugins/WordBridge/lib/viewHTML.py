@@ -1,6 +1,7 @@
 import json
 import os
-import re
+import shutil
+from functools import lru_cache
 
 import addonHandler
 
@@ -8,39 +9,103 @@ addonHandler.initTranslation()
 
 PATH = os.path.dirname(os.path.dirname(__file__))
 TEMPLATES_PATH = os.path.join(PATH, "web", "templates")
+WORKSPACE_PATH = os.path.join(PATH, "web", "workspace")
 CONTENT_CONFIG_PLACEHOLDER = "__CONTEXT__"
+MODULES_PATH_PLACEHOLDER = "__MODULES__"
+OPERATION_CODES = {"equal": "e", "delete": "d", "insert": "i", "replace": "r"}
 
 
-def text2template(src, dst, title=None):
-	with open(src, "r", encoding="utf8") as f:
-		value = f.read()
+@lru_cache(maxsize=1)
+def get_modules_version() -> str:
+	with open(os.path.join(PATH, "web", "version.txt"), "r", encoding="utf8") as f:
+		packages = [line.strip().replace("==", "-") for line in f if line.strip()]
+	return "_".join(packages)
 
-	decimal_pattern = re.compile(r"&#([\d]+);")
-	value = decimal_pattern.sub(lambda m: chr(int(m.group(1))), value)
 
-	hexadecimal_pattern = re.compile(r"&#x([\dABCDEFabcdef]+);")
-	value = hexadecimal_pattern.sub(lambda m: chr(int(m.group(1), 16)), value)
+@lru_cache(maxsize=1)
+def read_template() -> str:
+	with open(os.path.join(TEMPLATES_PATH, "index.template"), "r", encoding="utf8") as f:
+		return f.read()
 
-	if not title:
-		try:
-			name = os.path.basename(src).split(".")
-			if len(name) > 1:
-				name = name[:-1]
-			title = ".".join(name)
-		except BaseException:
-			title = "WordBridge"
 
-	content_config = {
-		"title": title,
-		"data": value,
-		"raw": value,
-	}
-	with open(os.path.join(TEMPLATES_PATH, "index.template"), "r", encoding="utf8") as f:
-		template = f.read()
-	content = template.replace(
-		CONTENT_CONFIG_PLACEHOLDER,
-		json.dumps(content_config, ensure_ascii=False),
-	)
+def install_static_modules(workspace_path: str = WORKSPACE_PATH) -> str:
+	"""
+	Copy the report's JavaScript modules into a versioned folder the first time they are needed.
+	"""
+	modules_path = os.path.join(workspace_path, "static", get_modules_version())
+	if os.path.isdir(modules_path):
+		return modules_path
+
+	staging_path = f"{modules_path}.tmp{os.getpid()}"
+	shutil.rmtree(staging_path, ignore_errors=True)
+	shutil.copytree(os.path.join(TEMPLATES_PATH, "modules"), staging_path)
+	try:
+		os.rename(staging_path, modules_path)
+	except OSError:
+		# Another report installed the same version first.
+		shutil.rmtree(staging_path, ignore_errors=True)
+	return modules_path
+
+
+def compact_diff(diff: list, page_size: int = 1000) -> dict:
+	"""
+	Turn strings_diff output into the op stream the report renders.
+
+	Adjacent equal runs are merged into one op, descriptions are stored once in a side table and referenced
+	by index, and the ops are cut into pages of about page_size characters so the report only renders one
+	page at a time. Each op is [code, text], plus [desc index] for changes and [before text] for replacements.
+	"""
+	ops = []
+	for item in diff:
+		operation = item["operation"]
+		if operation == "equal":
+			if ops and ops[-1]["operation"] == "equal":
+				ops[-1] = {**ops[-1], "before_text": ops[-1]["before_text"] + item["before_text"]}
+			else:
+				ops.append(item)
+			continue
+		ops.append(item)
+
+	compact_ops = []
+	descs = []
+	desc_indices = {}
+	pages = [0]
+	page_chars = 0
+	for item in ops:
+		operation = item["operation"]
+		text = item["before_text"] if operation in ("equal", "delete") else item["after_text"]
+		if page_chars and page_chars + len(text) > page_size:
+			pages.append(len(compact_ops))
+			page_chars = 0
+		page_chars += len(text)
+
+		op = [OPERATION_CODES[operation], text]
+		if operation != "equal":
+			desc = [item["before_descs"] or [], item["after_descs"] or []]
+			desc_key = json.dumps(desc, ensure_ascii=False)
+			if desc_key not in desc_indices:
+				desc_indices[desc_key] = len(descs)
+				descs.append(desc)
+			op.append(desc_indices[desc_key])
+		if operation == "replace":
+			op.append(item["before_text"])
+		compact_ops.append(op)
+
+	return {"ops": compact_ops, "descs": descs, "pages": pages}
+
+
+def render_report(diff_data, dst, title="WordBridge", workspace_path: str = WORKSPACE_PATH):
+	modules_path = install_static_modules(workspace_path)
+	dst_folder = os.path.dirname(os.path.abspath(dst))
+	os.makedirs(dst_folder, exist_ok=True)
+
+	content_config = json.dumps({"title": title, "report": compact_diff(diff_data)}, ensure_ascii=False)
+	# Keep the embedded JSON from closing the surrounding <script> element.
+	content_config = content_config.replace("</", "<\\/")
+	modules_url = os.path.relpath(modules_path, dst_folder).replace(os.sep, "/")
+
+	content = read_template().replace(MODULES_PATH_PLACEHOLDER, modules_url)
+	content = content.replace(CONTENT_CONFIG_PLACEHOLDER, content_config)
 	with open(dst, "w", encoding="utf8", newline="") as f:
 		f.write(content)
 	return dst
@@ -0,0 +1,187 @@
+import sys
+import types
+import unittest
+from decimal import Decimal
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+ADDON_PATH = PROJECT_ROOT / "addon" / "globalPlugins" / "WordBridge"
+PACKAGE_PATH = ADDON_PATH / "package"
+
+sys.path.insert(0, str(ADDON_PATH))
+sys.path.insert(0, str(PACKAGE_PATH))
+
+addon_handler = types.ModuleType("addonHandler")
+addon_handler.initTranslation = lambda: None
+sys.modules.setdefault("addonHandler", addon_handler)
+
+pypinyin_module = types.ModuleType("pypinyin")
+pypinyin_module.lazy_pinyin = lambda text, style=None: list(text)
+pypinyin_module.pinyin = lambda text, style=None, heteronym=False: [[char] for char in text]
+
+
+class _Style:
+	TONE3 = object()
+
+
+pypinyin_module.Style = _Style
+sys.modules.setdefault("pypinyin", pypinyin_module)
+
+chinese_converter_module = types.ModuleType("chinese_converter")
+chinese_converter_module.to_traditional = lambda text: text
+chinese_converter_module.to_simplified = lambda text: text
+sys.modules.setdefault("chinese_converter", chinese_converter_module)
+
+hanzidentifier_module = types.ModuleType("hanzidentifier")
+hanzidentifier_module.MIXED = "mixed"
+hanzidentifier_module.SIMPLIFIED = "simplified"
+hanzidentifier_module.TRADITIONAL = "traditional"
+hanzidentifier_module.identify = lambda text: hanzidentifier_module.TRADITIONAL
+sys.modules.setdefault("hanzidentifier", hanzidentifier_module)
+
+
+
+class CorrectionBudgetTests(unittest.TestCase):
+	def test_budget_refuses_requests_it_cannot_cover(self):
+		from lib.llm.budget import BudgetExceeded, CorrectionBudget
+
+		budget = CorrectionBudget(max_cost="0.01", max_requests=3)
+		reservation = budget.reserve(100, Decimal("0.006"))
+		with self.assertRaises(BudgetExceeded):
+			budget.reserve(100, Decimal("0.006"))
+		self.assertTrue(budget.exhausted)
+
+		# The reported usage replaces the estimate, which frees room for the next request.
+		budget.settle(reservation, tokens=40, cost=Decimal("0.002"))
+		budget.release(budget.reserve(100, Decimal("0.006")))
+		budget.reserve(10, Decimal("0"))
+		with self.assertRaises(BudgetExceeded):
+			budget.reserve(10, Decimal("0"))
+
+		self.assertEqual(
+			budget.get_summary(),
+			{
+				"spent_cost": Decimal("0.002"),
+				"spent_tokens": 40,
+				"requests": 3,
+				"refused_requests": 2,
+				"exhausted": True,
+			},
+		)
+
+	def test_llm_executor_reserves_estimated_cost_before_sending(self):
+		from lib.llm.budget import BudgetExceeded, CorrectionBudget
+		from lib.llm.cost_calculator import CostCalculator
+		from lib.llm.executor import LLMExecutor
+		from lib.llm.prompt_bundle import PromptBundle
+		from lib.llm.token_estimator import estimate_tokens
+
+		class FakeProvider:
+			setting = {}
+
+			def __init__(self):
+				self.send_count = 0
+
+			def send(self, payload, model_name=None):
+				self.send_count += 1
+				return {"text": payload["messages"][0]["content"], "usage": {"input_tokens": 10, "output_tokens": 5}}
+
+		class FakeAdapter:
+			model_name = "fake-model"
+			input_usage_field = "input_tokens"
+			output_usage_field = "output_tokens"
+
+			def __init__(self):
+				self._cost_calculator = CostCalculator({"pricing": {"base_unit": 1000, "input_tokens": 1, "output_tokens": 2}})
+
+			def format_request(self, prompt_bundle, setting):
+				return {"messages": prompt_bundle.messages}
+
+			def parse_response(self, response):
+				return response["text"]
+
+			def extract_usage(self, response):
+				return response["usage"]
+
+			def estimate_usage(self, prompt_bundle, output_text):
+				return {"input_tokens": 10, "output_tokens": estimate_tokens(output_text)}
+
+			def get_cost(self, usage):
+				return self._cost_calculator.get_cost(self._cost_calculator.get_priced_usage(usage))
+
+		class FakePromptStrategy:
+			def compose(self, input_text, response_text_history, text_policy):
+				return PromptBundle(messages=[{"role": "user", "content": input_text}], system_template="")
+
+		class FakeTextPolicy:
+			def has_target_language(self, text):
+				return True
+
+			def postprocess_output(self, text, input_text):
+				return text
+
+			def normalize_response(self, sentence):
+				return sentence
+
+			def get_output_length_limit(self, input_text):
+				return len(input_text) * 2
+
+		# Each request is estimated at 10 input and 8 output tokens, 0.026 USD, and costs 0.02 USD.
+		budget = CorrectionBudget(max_cost="0.04")
+		provider = FakeProvider()
+		executor = LLMExecutor(provider, FakeAdapter(), budget=budget)
+		executor.execute("今天天氣", FakePromptStrategy(), FakeTextPolicy())
+		with self.assertRaises(BudgetExceeded):
+			executor.execute("明天下雨", FakePromptStrategy(), FakeTextPolicy())
+
+		self.assertEqual(provider.send_count, 1)
+		self.assertEqual(budget.spent_cost, Decimal("0.02"))
+		self.assertEqual(budget.spent_tokens, 15)
+
+	def test_typo_workflow_stops_recorrection_when_budget_runs_out(self):
+		from lib.llm.budget import CorrectionBudget
+		from lib.llm.result import LLMExecutionResult
+		from lib.tasks.typo.workflow import TypoCorrectionWorkflow
+
+		class FakeExecutor:
+			def __init__(self, budget):
+				self.budget = budget
+				self.inputs = []
+
+			def ensure_connection(self):
+				pass
+
+			def execute(self, input_text, prompt_strategy, text_policy, previous_results=None):
+				if not input_text:
+					return LLMExecutionResult(input_text, input_text, {}, {})
+				self.budget.reserve(1, Decimal("0"))
+				self.inputs.append(input_text)
+				# An inserted character fails validation and asks for recorrection.
+				return LLMExecutionResult(input_text, input_text + "啊", {}, {})
+
+			def get_total_usage(self):
+				return {}
+
+			def get_total_cost(self):
+				return Decimal("0")
+
+		budget = CorrectionBudget(max_requests=1)
+		executor = FakeExecutor(budget)
+		workflow = TypoCorrectionWorkflow(
+			executor=executor,
+			prompt_strategy=object(),
+			text_policy=object(),
+			max_correction_attempts=3,
+			budget=budget,
+		)
+
+		result = workflow.run("今天天氣很好", batch_mode=False)
+
+		self.assertEqual(result.corrected_text, "今天天氣很好")
+		self.assertEqual(executor.inputs, ["今天天氣很好"])
+		self.assertEqual(result.telemetry["budget"]["refused_requests"], 1)
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,91 @@
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+ADDON_PATH = PROJECT_ROOT / "addon" / "globalPlugins" / "WordBridge"
+
+sys.path.insert(0, str(ADDON_PATH))
+
+
+class CorrectionJobQueueTests(unittest.TestCase):
+	def test_jobs_run_concurrently_and_keep_their_results(self):
+		from lib.application.jobs import JOB_DONE, JOB_FAILED, CorrectionJobQueue
+
+		barrier = threading.Barrier(2, timeout=5)
+
+		def handler(job):
+			if job.request == "fail":
+				raise ValueError("bad request")
+			# Both jobs must be running at the same time to get past the barrier.
+			barrier.wait()
+			return job.request.upper()
+
+		jobs = CorrectionJobQueue(handler, max_workers=2)
+		try:
+			first = jobs.submit("a")
+			second = jobs.submit("b")
+			self.assertTrue(first.wait(5) and second.wait(5))
+			failed = jobs.submit("fail")
+			self.assertTrue(jobs.idle.wait(5))
+		finally:
+			jobs.shutdown()
+
+		self.assertEqual((first.status, first.result), (JOB_DONE, "A"))
+		self.assertEqual((second.status, second.result), (JOB_DONE, "B"))
+		self.assertEqual(failed.status, JOB_FAILED)
+		self.assertIsInstance(failed.error, ValueError)
+		self.assertIs(jobs.get_job(second.id), second)
+		self.assertEqual([job.id for job in jobs.list_jobs()], [1, 2, 3])
+
+	def test_failures_are_logged_reported_and_none_counts_as_failed(self):
+		from lib.application.jobs import JOB_FAILED, CorrectionJobQueue
+
+		def handler(job):
+			if job.request == "fail":
+				raise ValueError("bad request")
+			# The handler has already told the user what went wrong.
+			return None
+
+		failed_jobs = []
+		jobs = CorrectionJobQueue(handler, max_workers=1, on_failure=failed_jobs.append)
+		try:
+			with self.assertLogs("lib.application.jobs", level="ERROR") as logs:
+				raised = jobs.submit("fail")
+				self.assertTrue(raised.wait(5))
+			reported = jobs.submit("reported")
+			self.assertTrue(jobs.idle.wait(5))
+		finally:
+			jobs.shutdown()
+
+		self.assertIn("bad request", logs.output[0])
+		self.assertEqual(failed_jobs, [raised])
+		self.assertEqual((reported.status, reported.error), (JOB_FAILED, None))
+
+	def test_queue_is_bounded(self):
+		from lib.application.jobs import JOB_FAILED, CorrectionJobQueue
+
+		release = threading.Event()
+		jobs = CorrectionJobQueue(lambda job: release.wait(5), max_workers=1, max_pending=1)
+		try:
+			running = jobs.submit("running")
+			for _ in range(50):
+				if running.status != "queued":
+					break
+				threading.Event().wait(0.01)
+			pending = jobs.submit("pending")
+			self.assertIsNone(jobs.submit("rejected"))
+			self.assertFalse(jobs.idle.is_set())
+		finally:
+			jobs.shutdown()
+			release.set()
+
+		self.assertTrue(running.wait(5))
+		self.assertEqual(pending.status, JOB_FAILED)
+		self.assertTrue(jobs.idle.wait(5))
+
+
+if __name__ == "__main__":
+	unittest.main()
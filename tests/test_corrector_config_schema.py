@@ -29,12 +29,17 @@ def test_corrector_configs_use_flattened_schema():
 		"template_name",
 		"optional_guidance_enable",
 	}
+	optional_keys = {
+		"active",
+		"first_pass_corrector_config_id",
+		"fallback_corrector_config_id",
+	}
 
 	for path in CORRECTOR_CONFIG_DIR.glob("*.json"):
 		with path.open("r", encoding="utf-8") as f:
 			config = json.load(f)
 
-		assert set(config.keys()) == required_keys, path.name
+		assert required_keys <= set(config.keys()) <= required_keys | optional_keys, path.name
 		assert "model_name" not in config, path.name
 		assert "name" not in config, path.name
 		assert isinstance(config["model"], str) and config["model"], path.name
@@ -55,3 +60,20 @@ def test_corrector_catalog_uses_unique_model_provider_pairs():
 
 def test_coseeing_duplicate_corrector_files_are_removed():
 	assert not list(CORRECTOR_CONFIG_DIR.glob("Coseeing-*.json"))
+
+
+def test_first_pass_and_fallback_correctors_refer_to_active_configs_of_the_catalog():
+	configs = {}
+	for path in CORRECTOR_CONFIG_DIR.glob("*.json"):
+		with path.open("r", encoding="utf-8") as f:
+			config = json.load(f)
+		configs[f"{config['model']}&{config['provider']}"] = config
+
+	for config_id, config in configs.items():
+		for key in ("first_pass_corrector_config_id", "fallback_corrector_config_id"):
+			route_id = config.get(key)
+			if route_id is None:
+				continue
+			assert route_id in configs, config_id
+			assert route_id != config_id, config_id
+			assert configs[route_id].get("active", True), config_id
@@ -0,0 +1,201 @@
+import json
+import sys
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+ADDON_PATH = PROJECT_ROOT / "addon" / "globalPlugins" / "WordBridge"
+
+sys.path.insert(0, str(ADDON_PATH))
+
+
+class FakeCoseeingHandler(BaseHTTPRequestHandler):
+	def log_message(self, format, *args):
+		pass
+
+	def _reply(self, status_code, body):
+		content = json.dumps(body).encode("utf8")
+		self.send_response(status_code)
+		self.send_header("Content-Type", "application/json")
+		self.send_header("Content-Length", str(len(content)))
+		self.end_headers()
+		self.wfile.write(content)
+
+	def do_POST(self):
+		server = self.server
+		body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+		if self.path == "/login":
+			server.login_count += 1
+			server.valid_token = f"token-{server.login_count}"
+			self._reply(200, {"access_token": server.valid_token, "expires_in": server.expires_in})
+			return
+		if self.headers.get("Authorization") != f"Bearer {server.valid_token}":
+			self._reply(401, {"detail": "Unauthorized"})
+			return
+		if self.path == "/proofreader" and json.loads(body).get("stream"):
+			self._stream_proofreader()
+			return
+		self._reply(200, {"response": "ok"})
+
+	def _stream_proofreader(self):
+		self.send_response(200)
+		self.send_header("Content-Type", "application/x-ndjson")
+		self.end_headers()
+		events = [
+			{"type": "segment", "index": 0, "total": 2, "text": "今天天氣真好，", "cost": 0.001},
+			{"type": "segment", "index": 1, "total": 2, "text": "出去玩。", "cost": 0.001},
+		]
+		for event in events:
+			self.wfile.write((json.dumps(event, ensure_ascii=False) + "\n").encode("utf8"))
+			self.wfile.flush()
+		# The result is only sent once the client has seen the segments, which fails if the reply is buffered.
+		self.server.streamed = self.server.segments_received.wait(5)
+		result = {"type": "result", "response": "今天天氣真好，出去玩。", "interaction_id": 7, "cost": 0.002}
+		self.wfile.write((json.dumps(result, ensure_ascii=False) + "\n").encode("utf8"))
+
+
+class FakeCoseeingServer:
+	def __enter__(self):
+		self.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeCoseeingHandler)
+		self.server.login_count = 0
+		self.server.valid_token = None
+		self.server.expires_in = 3600
+		self.server.segments_received = threading.Event()
+		threading.Thread(target=self.server.serve_forever, daemon=True).start()
+		self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+		return self
+
+	def __exit__(self, *args):
+		self.server.shutdown()
+		self.server.server_close()
+
+
+class CoseeingTokenManagerTests(unittest.TestCase):
+	def test_token_is_cached_and_refreshed_once_after_401(self):
+		from lib.coseeing import CoseeingTokenManager
+
+		with FakeCoseeingServer() as fake:
+			manager = CoseeingTokenManager(fake.url)
+			try:
+				for _ in range(3):
+					response = manager.post("/proofreader", "user", "password", json={"request": "天器"})
+					self.assertEqual(response.json(), {"response": "ok"})
+				self.assertEqual(fake.server.login_count, 1)
+
+				# The server revokes the token; the manager logs in again and retries once.
+				fake.server.valid_token = "revoked"
+				response = manager.post("/proofreader", "user", "password", json={})
+				self.assertEqual(response.status_code, 200)
+				self.assertEqual(fake.server.login_count, 2)
+
+				manager.get_token("another user", "password")
+				self.assertEqual(fake.server.login_count, 3)
+			finally:
+				manager.invalidate()
+
+	def test_token_is_refreshed_in_background_before_expiry(self):
+		from lib.coseeing import CoseeingTokenManager
+
+		with FakeCoseeingServer() as fake:
+			fake.server.expires_in = 0.3
+			manager = CoseeingTokenManager(fake.url, refresh_margin=0.2)
+			try:
+				self.assertEqual(manager.get_token("user", "password"), "token-1")
+				for _ in range(50):
+					if fake.server.login_count >= 2:
+						break
+					threading.Event().wait(0.02)
+				self.assertGreaterEqual(fake.server.login_count, 2)
+				self.assertEqual(manager.get_token("user", "password"), fake.server.valid_token)
+			finally:
+				manager.invalidate()
+
+	def test_unused_token_is_not_refreshed(self):
+		from lib.coseeing import CoseeingTokenManager
+
+		with FakeCoseeingServer() as fake:
+			fake.server.expires_in = 0.3
+			manager = CoseeingTokenManager(fake.url, refresh_margin=0.2)
+			try:
+				manager.get_token("user", "password")
+				# The token was used, so it is refreshed once; nothing uses the new one, so it is left to expire.
+				threading.Event().wait(0.6)
+				self.assertEqual(fake.server.login_count, 2)
+			finally:
+				manager.invalidate()
+
+	def test_token_expiry_falls_back_to_jwt_claim_and_default(self):
+		import base64
+
+		from lib.coseeing import get_token_expiry
+
+		claims = base64.urlsafe_b64encode(json.dumps({"exp": 1234}).encode()).decode().rstrip("=")
+		self.assertEqual(get_token_expiry({"access_token": f"header.{claims}.signature"}, 100, 60), 1234)
+		self.assertEqual(get_token_expiry({"access_token": "opaque"}, 100, 60), 160)
+		self.assertEqual(get_token_expiry({"access_token": "opaque", "expires_in": 10}, 100, 60), 110)
+
+	def test_proofreader_stream_reports_segments_before_result(self):
+		from lib.coseeing import CoseeingTokenManager, read_proofreader_response
+
+		with FakeCoseeingServer() as fake:
+			manager = CoseeingTokenManager(fake.url)
+			progress_list = []
+
+			def on_progress(progress):
+				progress_list.append(progress)
+				if len(progress_list) == 2:
+					fake.server.segments_received.set()
+
+			try:
+				response = manager.post(
+					"/proofreader",
+					"user",
+					"password",
+					json={"request": "今天天器真好，出去完。", "stream": True},
+					timeout=10,
+					stream=True,
+				)
+				result = read_proofreader_response(response, on_progress=on_progress)
+			finally:
+				manager.invalidate()
+
+		self.assertTrue(fake.server.streamed)
+		self.assertEqual([progress.partial_response for progress in progress_list], ["今天天氣真好，", "今天天氣真好，出去玩。"])
+		self.assertEqual(progress_list[1].total, 2)
+		self.assertEqual(result, {"response": "今天天氣真好，出去玩。", "interaction_id": 7, "cost": 0.002})
+
+	def test_plain_json_proofreader_reply_is_still_supported(self):
+		from lib.coseeing import CoseeingTokenManager, read_proofreader_response
+
+		with FakeCoseeingServer() as fake:
+			manager = CoseeingTokenManager(fake.url)
+			try:
+				response = manager.post("/proofreader", "user", "password", json={"request": "天器"})
+				self.assertEqual(read_proofreader_response(response), {"response": "ok"})
+			finally:
+				manager.invalidate()
+
+	def test_proofreader_errors_raise_coseeing_error(self):
+		from lib.coseeing import NDJSON_CONTENT_TYPE, CoseeingError, read_proofreader_response
+
+		class FakeResponse:
+			headers = {"Content-Type": NDJSON_CONTENT_TYPE}
+
+			def __init__(self, events):
+				self.events = events
+
+			def iter_lines(self, chunk_size=512):
+				for event in self.events:
+					yield json.dumps(event).encode("utf8")
+
+		with self.assertRaisesRegex(CoseeingError, "overloaded"):
+			read_proofreader_response(FakeResponse([{"type": "error", "detail": "overloaded"}]))
+		with self.assertRaises(CoseeingError):
+			read_proofreader_response(FakeResponse([{"type": "segment", "text": "天氣"}]))
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,121 @@
+import sys
+import types
+import unittest
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+ADDON_PATH = PROJECT_ROOT / "addon" / "globalPlugins" / "WordBridge"
+PACKAGE_PATH = ADDON_PATH / "package"
+
+sys.path.insert(0, str(ADDON_PATH))
+sys.path.insert(0, str(PACKAGE_PATH))
+
+addon_handler = types.ModuleType("addonHandler")
+addon_handler.initTranslation = lambda: None
+sys.modules.setdefault("addonHandler", addon_handler)
+
+pypinyin_module = types.ModuleType("pypinyin")
+pypinyin_module.lazy_pinyin = lambda text, style=None: list(text)
+pypinyin_module.pinyin = lambda text, style=None, heteronym=False: [[char] for char in text]
+
+
+class _Style:
+	TONE3 = object()
+
+
+pypinyin_module.Style = _Style
+sys.modules.setdefault("pypinyin", pypinyin_module)
+
+chinese_converter_module = types.ModuleType("chinese_converter")
+chinese_converter_module.to_traditional = lambda text: text
+chinese_converter_module.to_simplified = lambda text: text
+sys.modules.setdefault("chinese_converter", chinese_converter_module)
+
+hanzidentifier_module = types.ModuleType("hanzidentifier")
+hanzidentifier_module.MIXED = "mixed"
+hanzidentifier_module.SIMPLIFIED = "simplified"
+hanzidentifier_module.TRADITIONAL = "traditional"
+hanzidentifier_module.identify = lambda text: hanzidentifier_module.TRADITIONAL
+sys.modules.setdefault("hanzidentifier", hanzidentifier_module)
+
+
+class EditListTests(unittest.TestCase):
+	def test_parse_edits_reads_pairs_and_ignores_other_text(self):
+		from lib.tasks.typo.edits import TypoEdit, parse_edits
+
+		self.assertEqual(
+			parse_edits("天器真→天氣真\n「去完」→「去玩」\n說明: 無"),
+			[TypoEdit("天器真", "天氣真"), TypoEdit("去完", "去玩")],
+		)
+		self.assertEqual(parse_edits("天[[器]]→天氣"), [TypoEdit("天器", "天氣")])
+		self.assertEqual(parse_edits("無"), [])
+
+	def test_apply_edits_drops_ambiguous_overlapping_and_invalid_edits(self):
+		from lib.tasks.typo.edits import TypoEdit, apply_edits
+
+		text = "天器真好，天器不好"
+		self.assertEqual(apply_edits(text, [TypoEdit("天器", "天氣")]), text)
+		self.assertEqual(
+			apply_edits(text, [TypoEdit("器不", "氣不"), TypoEdit("天器真", "天氣真")]),
+			"天氣真好，天氣不好",
+		)
+		self.assertEqual(apply_edits(text, [TypoEdit("器真", "氣真"), TypoEdit("天器真", "天汽真")]), "天氣真好，天器不好")
+		self.assertEqual(apply_edits(text, [TypoEdit("天器真", "天氣真啊")]), text)
+		self.assertEqual(apply_edits(text, [TypoEdit("地器", "地氣")]), text)
+
+	def test_format_edits_round_trips_through_parse_and_apply(self):
+		from lib.tasks.typo.edits import apply_edits, format_edits, parse_edits
+
+		self.assertEqual(format_edits("天器真好", "天器真好", "無"), "無")
+		edits = format_edits("天器真好，出去完", "天氣真好，出去玩", "無")
+		self.assertEqual(edits, "天器真→天氣真\n去完→去玩")
+		self.assertEqual(apply_edits("天器真好，出去完", parse_edits(edits)), "天氣真好，出去玩")
+
+	def test_format_edits_widens_repeated_and_merges_adjacent_fragments(self):
+		from lib.tasks.typo.edits import apply_edits, format_edits, parse_edits
+
+		text = "天器真好，天器不好"
+		edits = format_edits(text, "天器真好，天氣不好", "無")
+		self.assertEqual(edits, "天器不→天氣不")
+		self.assertEqual(apply_edits(text, parse_edits(edits)), "天器真好，天氣不好")
+
+		text = "我門去完吧"
+		edits = format_edits(text, "我們去玩吧", "無")
+		self.assertEqual(edits, "我門去完吧→我們去玩吧")
+		self.assertEqual(apply_edits(text, parse_edits(edits)), "我們去玩吧")
+
+		text = "的的的的的"
+		edits = format_edits(text, "的的得的的", "無")
+		self.assertEqual(apply_edits(text, parse_edits(edits)), "的的得的的")
+
+	def test_edit_policy_applies_model_edits_to_untagged_input(self):
+		from lib.tasks.typo.text_policy import EditTypoTextPolicy
+
+		policy = EditTypoTextPolicy("zh_traditional")
+		self.assertEqual(policy.postprocess_output("天器真→天氣真", "今天天[[器]]真好"), "今天天氣真好")
+		self.assertEqual(policy.postprocess_output("無", "出去玩"), "出去玩")
+
+	def test_edit_prompt_replays_history_as_edit_lists(self):
+		from lib.tasks.typo.prompt import EditTypoPromptStrategy
+		from lib.tasks.typo.text_policy import EditTypoTextPolicy
+
+		composer = EditTypoPromptStrategy(
+			language="zh_traditional",
+			template_name="Edit_v1.json",
+			optional_guidance_enable={},
+		)
+		prompt_bundle = composer.compose(
+			input_text="天[[器]]真好",
+			response_text_history=["天汽真好"],
+			text_policy=EditTypoTextPolicy("zh_traditional"),
+		)
+
+		self.assertIn("天[[器]]真好", prompt_bundle.messages[-3]["content"])
+		self.assertEqual(prompt_bundle.messages[-2], {"role": "assistant", "content": "天器真→天汽真"})
+		self.assertIn("'天器真→天汽真'是錯誤答案", prompt_bundle.messages[-1]["content"])
+		self.assertIn("原文→修正", prompt_bundle.system_template)
+
+
+if __name__ == "__main__":
+	unittest.main()
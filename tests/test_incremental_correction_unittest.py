@@ -0,0 +1,118 @@
+import sys
+import types
+import unittest
+from decimal import Decimal
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+ADDON_PATH = PROJECT_ROOT / "addon" / "globalPlugins" / "WordBridge"
+PACKAGE_PATH = ADDON_PATH / "package"
+
+sys.path.insert(0, str(ADDON_PATH))
+sys.path.insert(0, str(PACKAGE_PATH))
+
+addon_handler = types.ModuleType("addonHandler")
+addon_handler.initTranslation = lambda: None
+sys.modules.setdefault("addonHandler", addon_handler)
+
+pypinyin_module = types.ModuleType("pypinyin")
+pypinyin_module.lazy_pinyin = lambda text, style=None: list(text)
+pypinyin_module.pinyin = lambda text, style=None, heteronym=False: [[char] for char in text]
+
+
+class _Style:
+	TONE3 = object()
+
+
+pypinyin_module.Style = _Style
+sys.modules.setdefault("pypinyin", pypinyin_module)
+
+chinese_converter_module = types.ModuleType("chinese_converter")
+chinese_converter_module.to_traditional = lambda text: text
+chinese_converter_module.to_simplified = lambda text: text
+sys.modules.setdefault("chinese_converter", chinese_converter_module)
+
+hanzidentifier_module = types.ModuleType("hanzidentifier")
+hanzidentifier_module.MIXED = "mixed"
+hanzidentifier_module.SIMPLIFIED = "simplified"
+hanzidentifier_module.TRADITIONAL = "traditional"
+hanzidentifier_module.identify = lambda text: hanzidentifier_module.TRADITIONAL if text else ""
+sys.modules.setdefault("hanzidentifier", hanzidentifier_module)
+
+
+class IncrementalCorrectionTests(unittest.TestCase):
+	def test_correction_memory_returns_closest_record_with_matching_key(self):
+		from lib.application.incremental import CorrectionMemory
+
+		memory = CorrectionMemory(max_size=2)
+		memory.remember(("a",), "今天天器真好，我們出去完。", "今天天氣真好，我們出去玩。", [])
+		memory.remember(("b",), "今天天器真好，我們出去完。", "今天天氣真好，我們出去玩。", [])
+		memory.remember(("a",), "長度不同", "長度不同的輸出", [])
+
+		record = memory.find_closest(("a",), "今天天器真好，我們出去走。")
+
+		self.assertEqual(record.response, "今天天氣真好，我們出去玩。")
+		self.assertIsNone(memory.find_closest(("c",), "今天天器真好，我們出去走。"))
+		self.assertIsNone(memory.find_closest(("a",), "完全無關的句子"))
+
+	def test_plan_reuses_untouched_segments_after_boundary_shift(self):
+		from lib.application.incremental import CorrectionRecord, group_dirty_regions, plan_incremental_correction
+
+		previous = CorrectionRecord(
+			key=(),
+			request="天器真好，想出去完。明天也是好天器。",
+			response="天氣真好，想出去玩。明天也是好天氣。",
+			diff=[],
+		)
+
+		plans = plan_incremental_correction("今天天器真好，想出去完。明天也是好天器。", previous, max_length=5)
+
+		self.assertEqual([plan.text for plan in plans], ["今天天器真好，", "想出去完。", "明天也是好天器。"])
+		self.assertEqual([plan.reused_text for plan in plans], [None, "想出去玩。", "明天也是好天氣。"])
+		self.assertEqual(group_dirty_regions(plans), ["今天天器真好，"])
+
+	def test_incremental_runner_only_corrects_edited_segments(self):
+		from lib.application import task_factory, task_runner
+		from lib.application.incremental import CorrectionRecord
+		from lib.tasks.typo.result import TypoCorrectionResult
+
+		first = "甲" * 100 + "。"
+		second = "乙" * 100 + "。"
+		previous = CorrectionRecord(key=(), request=first + second, response=first + "丙" * 100 + "。", diff=[])
+
+		class FakeWorkflow:
+			def __init__(self):
+				self.requests = []
+
+			def run(self, request, batch_mode=True):
+				self.requests.append(request)
+				return TypoCorrectionResult(
+					corrected_text=request.replace("丁", "戊"),
+					diff=[],
+					usage_summary={"input_tokens": 5},
+					cost=Decimal("0.01"),
+				)
+
+		fake_workflow = FakeWorkflow()
+		original_create = task_factory.create_typo_workflow
+		try:
+			task_factory.create_typo_workflow = lambda **kwargs: fake_workflow
+			result = task_runner.run_incremental_typo_correction(
+				request="丁" * 100 + "。" + second,
+				previous=previous,
+			)
+		finally:
+			task_factory.create_typo_workflow = original_create
+
+		self.assertEqual(fake_workflow.requests, ["丁" * 100 + "。"])
+		self.assertEqual(result.corrected_text, "戊" * 100 + "。" + "丙" * 100 + "。")
+		self.assertEqual(result.cost, Decimal("0.01"))
+		self.assertEqual(
+			result.telemetry["incremental"],
+			{"segments": 2, "reused_segments": 1, "corrected_segments": 1},
+		)
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -69,7 +69,12 @@ class InstructionComposerTests(unittest.TestCase):
 		self.assertIn("'前一次答案'是錯誤答案", prompt_bundle.messages[-1]["content"])
 		self.assertIn("勿將非漢字用漢字取代", prompt_bundle.system_template)
 		self.assertIn("輸出答案即可", prompt_bundle.system_template)
-		self.assertIn("參考詞彙: 天器", prompt_bundle.system_template)
+		self.assertIn("參考詞彙: 天器\n", prompt_bundle.messages[-3]["content"])
+		self.assertNotIn("參考詞彙", prompt_bundle.system_template)
+		self.assertEqual(
+			composer.get_summary()["customized_words"],
+			{"token_budget": 50, "matched_words": 1, "injected_words": 1, "injected_tokens": 3, "saved_tokens": 0},
+		)
 
 	def test_standard_instruction_composer_renders_phone_input(self):
 		from lib.tasks.typo.prompt import StandardTypoPromptStrategy
@@ -96,6 +101,39 @@ class InstructionComposerTests(unittest.TestCase):
 		self.assertIn("我 說 天 器", prompt_bundle.messages[-1]["content"])
 		self.assertEqual(prompt_bundle.system_template, "輸入為文字與其正確拼音，請修正錯字並輸出正確文字:\n(文字&拼音) => 文字")
 
+	def test_instruction_composer_replays_only_the_most_informative_answers(self):
+		from lib.llm.token_estimator import estimate_tokens
+		from lib.tasks.typo.prompt import LiteTypoPromptStrategy
+		from lib.tasks.typo.text_policy import LiteTypoTextPolicy
+
+		policy = LiteTypoTextPolicy("zh_traditional")
+		composer = LiteTypoPromptStrategy(
+			language="zh_traditional",
+			template_name="Lite_v1.json",
+			customized_words=[],
+			max_history_responses=2,
+		)
+
+		prompt_bundle = composer.compose(
+			input_text="天[[器]]很冷",
+			# The second answer repeats an edit the first one already tried.
+			response_text_history=["天氣很冷呀", "天氣很冷", "天汽很冷"],
+			text_policy=policy,
+		)
+
+		replayed = [message["content"] for message in prompt_bundle.messages if message["role"] == "assistant"]
+		self.assertEqual(replayed[-2:], ["天氣很冷呀", "天汽很冷"])
+		self.assertNotIn("天氣很冷", replayed)
+		self.assertEqual(
+			composer.get_summary()["history"],
+			{
+				"max_responses": 2,
+				"replayed_responses": 2,
+				"dropped_responses": 1,
+				"history_tokens": sum(estimate_tokens(message["content"]) for message in prompt_bundle.messages[-4:]),
+			},
+		)
+
 
 if __name__ == "__main__":
 	unittest.main()
@@ -0,0 +1,217 @@
+import sys
+import types
+import unittest
+from decimal import Decimal
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+ADDON_PATH = PROJECT_ROOT / "addon" / "globalPlugins" / "WordBridge"
+PACKAGE_PATH = ADDON_PATH / "package"
+
+sys.path.insert(0, str(ADDON_PATH))
+sys.path.insert(0, str(PACKAGE_PATH))
+
+addon_handler = types.ModuleType("addonHandler")
+addon_handler.initTranslation = lambda: None
+sys.modules.setdefault("addonHandler", addon_handler)
+
+pypinyin_module = types.ModuleType("pypinyin")
+pypinyin_module.lazy_pinyin = lambda text, style=None: list(text)
+pypinyin_module.pinyin = lambda text, style=None, heteronym=False: [[char] for char in text]
+
+
+class _Style:
+	TONE3 = object()
+
+
+pypinyin_module.Style = _Style
+sys.modules.setdefault("pypinyin", pypinyin_module)
+
+chinese_converter_module = types.ModuleType("chinese_converter")
+chinese_converter_module.to_traditional = lambda text: text
+chinese_converter_module.to_simplified = lambda text: text
+sys.modules.setdefault("chinese_converter", chinese_converter_module)
+
+hanzidentifier_module = types.ModuleType("hanzidentifier")
+hanzidentifier_module.MIXED = "mixed"
+hanzidentifier_module.SIMPLIFIED = "simplified"
+hanzidentifier_module.TRADITIONAL = "traditional"
+hanzidentifier_module.identify = lambda text: hanzidentifier_module.TRADITIONAL if text else ""
+sys.modules.setdefault("hanzidentifier", hanzidentifier_module)
+
+
+def build_language_model():
+	from lib.tasks.typo.language_model import CharBigramModel
+
+	return CharBigramModel(
+		bigrams={"天氣", "真好", "今天"},
+		string_to_pinyin={"器": ["qì"], "氣": ["qì"], "真": ["zhēn"], "好": ["hǎo"]},
+		pinyin_to_string={"qì": ["器", "氣"], "zhēn": ["真"], "hǎo": ["好"]},
+	)
+
+
+class LocalLanguageModelTests(unittest.TestCase):
+	def test_char_bigram_model_flags_characters_with_better_homophones(self):
+		language_model = build_language_model()
+
+		self.assertEqual(language_model.find_suspicious_indices("天器真好"), [1])
+		self.assertEqual(language_model.find_better_homophone("天器真好", 1), "氣")
+		self.assertEqual(language_model.find_suspicious_indices("天氣真好"), [])
+		self.assertEqual(language_model.get_plausibility("天器真好"), 0.75)
+		self.assertEqual(language_model.get_plausibility("abc"), 1.0)
+
+	def test_plausibility_prefilter_reports_threshold_and_skip_rate(self):
+		from lib.tasks.typo.prefilter import PlausibilityPrefilter
+
+		prefilter = PlausibilityPrefilter(
+			threshold=1.0,
+			language_model=build_language_model(),
+			min_char_bigrams=0,
+		)
+
+		self.assertTrue(prefilter.should_skip("天氣真好"))
+		self.assertFalse(prefilter.should_skip("天器真好"))
+		self.assertEqual(
+			prefilter.get_summary(),
+			{
+				"threshold": 1.0,
+				"min_char_bigrams": 0,
+				"checked": 2,
+				"skipped": 1,
+				"skip_rate": 0.5,
+				"skipped_segments": ["天氣真好"],
+			},
+		)
+
+	def test_plausibility_prefilter_keeps_segments_with_rare_characters(self):
+		from lib.tasks.typo.prefilter import PlausibilityPrefilter
+
+		language_model = build_language_model()
+		# 氣, 真 and 好 each form one known bigram and 器 none, so with min_char_bigrams=2 all are rare.
+		self.assertEqual(language_model.find_rare_indices("天器真好", 2), [1, 2, 3])
+		self.assertEqual(language_model.get_plausibility("天氣真好", 2), 0.25)
+
+		prefilter = PlausibilityPrefilter(threshold=1.0, language_model=language_model, min_char_bigrams=2)
+		self.assertFalse(prefilter.should_skip("天氣真好"))
+		self.assertTrue(prefilter.should_skip("今天"))
+		self.assertEqual(prefilter.get_summary()["skipped_segments"], ["今天"])
+
+	def test_typo_workflow_skips_llm_for_plausible_segments(self):
+		from lib.tasks.typo.prefilter import PlausibilityPrefilter
+		from lib.tasks.typo.workflow import TypoCorrectionWorkflow
+
+		class FakeExecutionResult:
+			def __init__(self, output_text):
+				self.output_text = output_text
+
+		class FakeExecutor:
+			def __init__(self):
+				self.calls = []
+
+			def ensure_connection(self):
+				pass
+
+			def execute(self, input_text, prompt_strategy, text_policy, previous_results=None):
+				self.calls.append(input_text)
+				return FakeExecutionResult(input_text)
+
+			def get_total_usage(self):
+				return {}
+
+			def get_total_cost(self):
+				return Decimal("0")
+
+		workflow = TypoCorrectionWorkflow(
+			executor=FakeExecutor(),
+			prompt_strategy=object(),
+			text_policy=object(),
+			max_correction_attempts=0,
+			prefilter=PlausibilityPrefilter(
+				threshold=1.0,
+				language_model=build_language_model(),
+				min_char_bigrams=0,
+			),
+		)
+
+		result = workflow.run("天氣真好", batch_mode=False)
+
+		self.assertEqual(result.corrected_text, "天氣真好")
+		self.assertEqual(workflow.executor.calls, [])
+		self.assertEqual(result.telemetry["prefilter"]["skipped"], 1)
+
+	def test_homophone_detector_tags_suspicious_characters(self):
+		from lib.tasks.typo.detector import HomophoneTypoDetector
+
+		detector = HomophoneTypoDetector(language_model=build_language_model())
+
+		self.assertEqual(detector.annotate("天器真好"), "天[[器]]真好")
+		self.assertEqual(detector.annotate("天氣真好"), "天氣真好")
+		self.assertEqual(
+			detector.get_summary(),
+			{"min_score": 0.7, "max_tags": 2, "segments": 2, "annotated_segments": 1, "suspicious_chars": 1},
+		)
+
+	def test_homophone_detector_tags_only_the_most_suspicious_characters(self):
+		from lib.tasks.typo.detector import HomophoneTypoDetector
+		from lib.tasks.typo.language_model import CharBigramModel
+
+		language_model = CharBigramModel(
+			bigrams={"天氣", "氣真", "真好", "今天", "出去", "去玩", "完成", "完全", "完美"},
+			string_to_pinyin={"器": ["qì"], "氣": ["qì"], "完": ["wán"], "玩": ["wán"]},
+			pinyin_to_string={"qì": ["器", "氣"], "wán": ["完", "玩"]},
+		)
+		# A homophone fits both neighbours of the rare 器, but only one neighbour of the common 完.
+		self.assertEqual(language_model.get_suspicion("天器真好", 1), 2)
+		self.assertLess(language_model.get_suspicion("出去完", 2), 0.7)
+		self.assertEqual(language_model.get_suspicion("天氣真好", 1), 0)
+
+		detector = HomophoneTypoDetector(language_model=language_model)
+		self.assertEqual(detector.annotate("天器真好，出去完"), "天[[器]]真好，出去完")
+		detector = HomophoneTypoDetector(language_model=language_model, min_score=0)
+		self.assertEqual(detector.annotate("天器真好，出去完"), "天[[器]]真好，出去[[完]]")
+		detector = HomophoneTypoDetector(language_model=language_model, min_score=0, max_tags=1)
+		self.assertEqual(detector.annotate("天器真好，出去完"), "天[[器]]真好，出去完")
+
+	def test_typo_workflow_sends_annotated_segments_in_first_pass(self):
+		from lib.tasks.typo.detector import HomophoneTypoDetector
+		from lib.tasks.typo.workflow import TypoCorrectionWorkflow
+
+		class FakeExecutionResult:
+			def __init__(self, output_text):
+				self.output_text = output_text
+
+		class FakeExecutor:
+			def __init__(self):
+				self.calls = []
+
+			def ensure_connection(self):
+				pass
+
+			def execute(self, input_text, prompt_strategy, text_policy, previous_results=None):
+				self.calls.append(input_text)
+				return FakeExecutionResult("天氣真好")
+
+			def get_total_usage(self):
+				return {}
+
+			def get_total_cost(self):
+				return Decimal("0")
+
+		workflow = TypoCorrectionWorkflow(
+			executor=FakeExecutor(),
+			prompt_strategy=object(),
+			text_policy=object(),
+			max_correction_attempts=0,
+			detector=HomophoneTypoDetector(language_model=build_language_model()),
+		)
+
+		result = workflow.run("天器真好", batch_mode=False)
+
+		self.assertEqual(workflow.executor.calls, ["天[[器]]真好"])
+		self.assertEqual(result.corrected_text, "天氣真好")
+		self.assertEqual(result.telemetry["detector"]["annotated_segments"], 1)
+
+
+if __name__ == "__main__":
+	unittest.main()
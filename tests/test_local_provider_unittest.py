@@ -0,0 +1,184 @@
+import json
+import sys
+import threading
+import time
+import types
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+ADDON_PATH = PROJECT_ROOT / "addon" / "globalPlugins" / "WordBridge"
+PACKAGE_PATH = ADDON_PATH / "package"
+
+sys.path.insert(0, str(ADDON_PATH))
+sys.path.insert(0, str(PACKAGE_PATH))
+
+addon_handler = types.ModuleType("addonHandler")
+addon_handler.initTranslation = lambda: None
+sys.modules.setdefault("addonHandler", addon_handler)
+
+pypinyin_module = types.ModuleType("pypinyin")
+pypinyin_module.lazy_pinyin = lambda text, style=None: list(text)
+pypinyin_module.pinyin = lambda text, style=None, heteronym=False: [[char] for char in text]
+
+
+class _Style:
+	TONE3 = object()
+
+
+pypinyin_module.Style = _Style
+sys.modules.setdefault("pypinyin", pypinyin_module)
+
+chinese_converter_module = types.ModuleType("chinese_converter")
+chinese_converter_module.to_traditional = lambda text: text
+chinese_converter_module.to_simplified = lambda text: text
+sys.modules.setdefault("chinese_converter", chinese_converter_module)
+
+hanzidentifier_module = types.ModuleType("hanzidentifier")
+hanzidentifier_module.MIXED = "mixed"
+hanzidentifier_module.SIMPLIFIED = "simplified"
+hanzidentifier_module.TRADITIONAL = "traditional"
+hanzidentifier_module.identify = lambda text: hanzidentifier_module.TRADITIONAL
+sys.modules.setdefault("hanzidentifier", hanzidentifier_module)
+
+
+
+class StandInServerHandler(BaseHTTPRequestHandler):
+	"""
+	A minimal OpenAI-compatible chat completions server, like the ones llama.cpp and Ollama run.
+	"""
+
+	def do_GET(self):
+		self._send(200, "text/plain", b"ok")
+
+	def do_POST(self):
+		payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+		server = self.server
+		with server.lock:
+			server.requests.append({"path": self.path, "headers": dict(self.headers), "payload": payload})
+			server.active += 1
+			server.max_active = max(server.max_active, server.active)
+		try:
+			time.sleep(server.delay)
+			if payload.get("stream"):
+				events = [
+					{"choices": [{"delta": {"content": "天"}}]},
+					{"choices": [{"delta": {"content": "氣"}}]},
+					{"choices": [], "usage": {"prompt_tokens": 12, "completion_tokens": 2}},
+				]
+				body = "".join(f"data: {json.dumps(event)}\n\n" for event in events) + "data: [DONE]\n\n"
+				self._send(200, "text/event-stream", body.encode("utf8"))
+			else:
+				body = {
+					"choices": [{"message": {"role": "assistant", "content": "天氣"}}],
+					"usage": {"prompt_tokens": 12, "completion_tokens": 2, "total_tokens": 14},
+				}
+				self._send(200, "application/json", json.dumps(body).encode("utf8"))
+		finally:
+			with server.lock:
+				server.active -= 1
+
+	def log_message(self, format, *args):
+		pass
+
+	def _send(self, status_code, content_type, body):
+		self.send_response(status_code)
+		self.send_header("Content-Type", content_type)
+		self.send_header("Content-Length", str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+
+
+class FakePromptStrategy:
+	def compose(self, input_text, response_text_history, text_policy):
+		from lib.llm.prompt_bundle import PromptBundle
+
+		return PromptBundle(messages=[{"role": "user", "content": input_text}], system_template="請修正錯字")
+
+
+class FakeTextPolicy:
+	def has_target_language(self, text):
+		return True
+
+	def postprocess_output(self, text, input_text):
+		return text
+
+	def normalize_response(self, sentence):
+		return sentence
+
+	def check_stream_output(self, partial_text, input_text):
+		return None
+
+
+class LocalProviderTests(unittest.TestCase):
+	def setUp(self):
+		self.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInServerHandler)
+		self.server.lock = threading.Lock()
+		self.server.requests = []
+		self.server.active = 0
+		self.server.max_active = 0
+		self.server.delay = 0
+		self.server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+		self.server_thread.start()
+		self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+	def tearDown(self):
+		self.server.shutdown()
+		self.server.server_close()
+
+	def create_executor(self, stream_responses=False):
+		from lib.llm.adapter import get_provider_model_adapter
+		from lib.llm.executor import LLMExecutor
+		from lib.llm.provider import get_provider
+
+		return LLMExecutor(
+			get_provider("Local", {"base_url": self.base_url}),
+			get_provider_model_adapter("Local", "qwen2.5:7b"),
+			stream_responses=stream_responses,
+		)
+
+	def test_local_provider_talks_to_an_openai_compatible_server_without_a_key(self):
+		executor = self.create_executor()
+		executor.ensure_connection()
+		result = executor.execute("天器", FakePromptStrategy(), FakeTextPolicy())
+
+		self.assertEqual(result.output_text, "天氣")
+		self.assertEqual(result.served_by, "qwen2.5:7b&Local")
+		request = self.server.requests[0]
+		self.assertEqual(request["path"], "/v1/chat/completions")
+		self.assertNotIn("Authorization", request["headers"])
+		self.assertEqual(request["payload"]["model"], "qwen2.5:7b")
+		self.assertEqual(request["payload"]["messages"][0], {"role": "system", "content": "請修正錯字"})
+		self.assertEqual(executor.get_total_usage(), {"prompt_tokens": 12, "completion_tokens": 2})
+		self.assertEqual(executor.get_total_cost(), 0)
+
+	def test_local_provider_streams_responses(self):
+		executor = self.create_executor(stream_responses=True)
+		result = executor.execute("天器", FakePromptStrategy(), FakeTextPolicy())
+
+		self.assertEqual(result.output_text, "天氣")
+		self.assertTrue(self.server.requests[0]["payload"]["stream"])
+		self.assertEqual(executor.get_total_usage(), {"prompt_tokens": 12, "completion_tokens": 2})
+
+	def test_local_provider_limits_concurrent_requests(self):
+		from lib.tasks.concurrency import parallel_map
+
+		self.server.delay = 0.05
+		# Two tasks running side by side each have their own provider for the same server.
+		executors = [self.create_executor(), self.create_executor()]
+		segments = [f"第{i}段" for i in range(8)]
+		results = parallel_map(
+			lambda segment: executors[int(segment[1]) % 2].execute(segment, FakePromptStrategy(), FakeTextPolicy()),
+			segments,
+		)
+
+		self.assertEqual(len(results), 8)
+		self.assertEqual(len(self.server.requests), 8)
+		# Local.json allows two requests at a time, shared by both tasks.
+		self.assertEqual(self.server.max_active, 2)
+
+
+if __name__ == "__main__":
+	unittest.main()
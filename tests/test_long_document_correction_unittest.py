@@ -0,0 +1,110 @@
+import sys
+import types
+import unittest
+from decimal import Decimal
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+ADDON_PATH = PROJECT_ROOT / "addon" / "globalPlugins" / "WordBridge"
+PACKAGE_PATH = ADDON_PATH / "package"
+
+sys.path.insert(0, str(ADDON_PATH))
+sys.path.insert(0, str(PACKAGE_PATH))
+
+addon_handler = types.ModuleType("addonHandler")
+addon_handler.initTranslation = lambda: None
+sys.modules.setdefault("addonHandler", addon_handler)
+
+pypinyin_module = types.ModuleType("pypinyin")
+pypinyin_module.lazy_pinyin = lambda text, style=None: list(text)
+pypinyin_module.pinyin = lambda text, style=None, heteronym=False: [[char] for char in text]
+
+
+class _Style:
+	TONE3 = object()
+
+
+pypinyin_module.Style = _Style
+sys.modules.setdefault("pypinyin", pypinyin_module)
+
+chinese_converter_module = types.ModuleType("chinese_converter")
+chinese_converter_module.to_traditional = lambda text: text
+chinese_converter_module.to_simplified = lambda text: text
+sys.modules.setdefault("chinese_converter", chinese_converter_module)
+
+hanzidentifier_module = types.ModuleType("hanzidentifier")
+hanzidentifier_module.MIXED = "mixed"
+hanzidentifier_module.SIMPLIFIED = "simplified"
+hanzidentifier_module.TRADITIONAL = "traditional"
+hanzidentifier_module.identify = lambda text: hanzidentifier_module.TRADITIONAL if text else ""
+sys.modules.setdefault("hanzidentifier", hanzidentifier_module)
+
+
+class LongDocumentCorrectionTests(unittest.TestCase):
+	def test_document_windows_end_on_segment_boundaries(self):
+		from lib.application.long_document import iter_document_windows
+		from lib.tasks.typo.utils import text_segmentation
+
+		text = "天氣真好，想出去玩。" * 30
+		chunks = [text[i:i + 7] for i in range(0, len(text), 7)]
+
+		windows = list(iter_document_windows(chunks, window_size=50, max_length=20))
+
+		self.assertEqual("".join(window.text for window in windows), text)
+		self.assertTrue(all(len(window.text) <= 50 for window in windows))
+		self.assertEqual(
+			[segment for window in windows for segment in text_segmentation(window.text, max_length=20)],
+			text_segmentation(text, max_length=20),
+		)
+		self.assertEqual([window.start for window in windows[:2]], [0, len(windows[0].text)])
+
+	def test_stream_typo_correction_yields_windows_and_reports_progress(self):
+		from lib.application import long_document, task_factory
+		from lib.tasks.typo.result import TypoCorrectionResult
+
+		class FakeWorkflow:
+			def __init__(self):
+				self.cost = Decimal("0")
+				self.requests = []
+
+			def run(self, request, batch_mode=True):
+				self.requests.append(request)
+				self.cost += Decimal("0.5")
+				return TypoCorrectionResult(
+					corrected_text=request.replace("器", "氣"),
+					diff=[{"operation": "equal", "before_text": request}],
+					usage_summary={"input_tokens": len(self.requests)},
+					cost=self.cost,
+				)
+
+		fake_workflow = FakeWorkflow()
+		progress = []
+		text = "甲" * 100 + "。" + "天器" * 50 + "。"
+		original_create = task_factory.create_typo_workflow
+		try:
+			task_factory.create_typo_workflow = lambda **kwargs: fake_workflow
+			chunks = list(
+				long_document.stream_typo_correction(
+					chunks=[text],
+					window_size=101,
+					total_chars=len(text),
+					on_progress=progress.append,
+				)
+			)
+			task_factory.create_typo_workflow = lambda **kwargs: FakeWorkflow()
+			result = long_document.run_long_document_typo_correction(request=text, window_size=101)
+		finally:
+			task_factory.create_typo_workflow = original_create
+
+		self.assertEqual(fake_workflow.requests, ["甲" * 100 + "。", "天器" * 50 + "。"])
+		self.assertEqual([chunk.cost for chunk in chunks], [Decimal("0.5"), Decimal("0.5")])
+		self.assertEqual([chunk.start for chunk in chunks], [0, 101])
+		self.assertEqual([(p.processed_chars, p.total_chars) for p in progress], [(101, 202), (202, 202)])
+		self.assertEqual(result.corrected_text, "甲" * 100 + "。" + "天氣" * 50 + "。")
+		self.assertEqual(result.cost, Decimal("1.0"))
+		self.assertEqual(len(result.diff), 2)
+
+
+if __name__ == "__main__":
+	unittest.main()
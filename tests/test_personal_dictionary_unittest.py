@@ -0,0 +1,128 @@
+import sys
+import os
+import tempfile
+import types
+import unittest
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+ADDON_PATH = PROJECT_ROOT / "addon" / "globalPlugins" / "WordBridge"
+PACKAGE_PATH = ADDON_PATH / "package"
+
+sys.path.insert(0, str(ADDON_PATH))
+sys.path.insert(0, str(PACKAGE_PATH))
+
+addon_handler = types.ModuleType("addonHandler")
+addon_handler.initTranslation = lambda: None
+sys.modules.setdefault("addonHandler", addon_handler)
+
+pypinyin_module = types.ModuleType("pypinyin")
+pypinyin_module.lazy_pinyin = lambda text, style=None: list(text)
+pypinyin_module.pinyin = lambda text, style=None, heteronym=False: [[char] for char in text]
+
+
+class _Style:
+	TONE3 = object()
+
+
+pypinyin_module.Style = _Style
+sys.modules.setdefault("pypinyin", pypinyin_module)
+
+chinese_converter_module = types.ModuleType("chinese_converter")
+chinese_converter_module.to_traditional = lambda text: text
+chinese_converter_module.to_simplified = lambda text: text
+sys.modules.setdefault("chinese_converter", chinese_converter_module)
+
+hanzidentifier_module = types.ModuleType("hanzidentifier")
+hanzidentifier_module.MIXED = "mixed"
+hanzidentifier_module.SIMPLIFIED = "simplified"
+hanzidentifier_module.TRADITIONAL = "traditional"
+hanzidentifier_module.identify = lambda text: hanzidentifier_module.TRADITIONAL
+sys.modules.setdefault("hanzidentifier", hanzidentifier_module)
+
+
+
+class PersonalDictionaryTests(unittest.TestCase):
+	def test_service_caches_words_until_file_changes(self):
+		from lib.application.dictionary import DictionaryService
+
+		with tempfile.TemporaryDirectory() as folder:
+			path = os.path.join(folder, "data.csv")
+			service = DictionaryService(path)
+			self.assertEqual(service.get_words(), ())
+
+			service.save([{"text": "天器", "pronunciation": ""}])
+			words = service.get_words()
+			self.assertEqual([word.text for word in words], ["天器"])
+			self.assertEqual(len(words[0].char_pinyins), 2)
+			self.assertIs(service.get_words(), words)
+
+			with open(path, "a", encoding="utf-8", newline="") as csvfile:
+				csvfile.write("旅遊,lv3 you2\r\n")
+			self.assertEqual(
+				service.get_rows(),
+				[{"text": "天器", "pronunciation": ""}, {"text": "旅遊", "pronunciation": "lv3 you2"}],
+			)
+
+	def test_prompt_strategy_matches_precomputed_words(self):
+		from lib.tasks.typo.prompt import LiteTypoPromptStrategy
+		from lib.tasks.typo.text_policy import LiteTypoTextPolicy
+		from lib.tasks.typo.vocabulary import create_custom_word
+
+		composer = LiteTypoPromptStrategy(
+			language="zh_traditional",
+			template_name="Lite_v1.json",
+			customized_words=[create_custom_word("天器"), create_custom_word("很長的詞彙不會出現")],
+		)
+
+		prompt_bundle = composer.compose(
+			input_text="天器",
+			response_text_history=[],
+			text_policy=LiteTypoTextPolicy("zh_traditional"),
+		)
+
+		self.assertIn("參考詞彙: 天器", prompt_bundle.messages[-1]["content"])
+		self.assertNotIn("很長的詞彙不會出現", prompt_bundle.messages[-1]["content"])
+
+	def test_parse_pronunciation_normalizes_pinyin_and_zhuyin(self):
+		from lib.tasks.typo.pronunciation import parse_pronunciation
+
+		self.assertEqual(parse_pronunciation("ba4 ba"), ("bà", "ba"))
+		self.assertEqual(parse_pronunciation("ㄅㄚˋ ㄅㄚ˙"), ("bà", "ba"))
+		self.assertEqual(parse_pronunciation("lv3 you2"), ("lǚ", "yóu"))
+		self.assertEqual(parse_pronunciation("ㄌㄩˇ ㄧㄡˊ"), ("lǚ", "yóu"))
+		self.assertEqual(parse_pronunciation("ㄐㄩㄝˊ"), ("jué",))
+		self.assertIsNone(parse_pronunciation("ba9"))
+		self.assertIsNone(parse_pronunciation(""))
+
+	def test_vocabulary_matches_user_pronunciation(self):
+		from lib.tasks.typo.vocabulary import CustomVocabulary, create_custom_word
+
+		word = create_custom_word("天器", "tian1 qi4")
+		self.assertEqual(word.char_pinyins, (frozenset(["tiān"]), frozenset(["qì"])))
+
+		vocabulary = CustomVocabulary([word, create_custom_word("天旗", "ㄊㄧㄢ ㄑㄧˊ"), "天氣"])
+
+		self.assertEqual(vocabulary.find_candidates("今天天氣很好"), ["天器", "天氣"])
+		self.assertEqual(vocabulary.find_candidates("天"), [])
+
+	def test_word_candidates_are_ranked_and_fit_the_token_budget(self):
+		from lib.tasks.typo.prompt import LiteTypoPromptStrategy
+
+		composer = LiteTypoPromptStrategy(
+			language="zh_traditional",
+			template_name="Lite_v1.json",
+			customized_words=["天", "天氣", "天器", "今天天器"],
+			customized_words_token_budget=8,
+		)
+
+		self.assertEqual(composer._get_input_info("今天天器")["word_candidates"], ["今天天器", "天氣"])
+		self.assertEqual(
+			composer.get_summary()["customized_words"],
+			{"token_budget": 8, "matched_words": 4, "injected_words": 2, "injected_tokens": 8, "saved_tokens": 5},
+		)
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,59 @@
+import subprocess
+import sys
+import textwrap
+import threading
+import unittest
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+ADDON_PATH = PROJECT_ROOT / "addon" / "globalPlugins" / "WordBridge"
+
+sys.path.insert(0, str(ADDON_PATH))
+
+
+class PrewarmTests(unittest.TestCase):
+	def test_startup_modules_do_not_load_language_data(self):
+		script = textwrap.dedent(f"""
+			import sys
+			sys.path.insert(0, {str(ADDON_PATH)!r})
+			from lib.application.dictionary import get_dictionary_service
+			from lib.application.incremental import CorrectionMemory
+			from lib.application.jobs import CorrectionJobQueue
+			from lib.application.prewarm import ModulePrewarmer
+			from lib.coseeing import CoseeingTokenManager
+			CorrectionMemory()
+			heavy = ["pypinyin", "chinese_converter", "hanzidentifier", "lib.tasks.typo.chinese_dictionary"]
+			print(",".join(name for name in heavy if name in sys.modules))
+		""")
+		output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+
+		self.assertEqual(output.stdout.strip(), "")
+
+	def test_steps_run_once_across_background_and_on_demand_callers(self):
+		from lib.application.prewarm import ModulePrewarmer
+
+		calls = []
+		step_started = threading.Event()
+		release_step = threading.Event()
+
+		def slow_step():
+			step_started.set()
+			release_step.wait(5)
+			calls.append("slow")
+
+		prewarmer = ModulePrewarmer([slow_step, lambda: calls.append("fast")])
+		prewarmer.start()
+		self.assertTrue(step_started.wait(5))
+
+		on_demand = threading.Thread(target=prewarmer.ensure_ready)
+		on_demand.start()
+		release_step.set()
+		on_demand.join(5)
+
+		self.assertTrue(prewarmer.ready.is_set())
+		self.assertEqual(calls, ["slow", "fast"])
+
+
+if __name__ == "__main__":
+	unittest.main()
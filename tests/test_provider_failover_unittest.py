@@ -0,0 +1,158 @@
+import sys
+import types
+import unittest
+from decimal import Decimal
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+ADDON_PATH = PROJECT_ROOT / "addon" / "globalPlugins" / "WordBridge"
+PACKAGE_PATH = ADDON_PATH / "package"
+
+sys.path.insert(0, str(ADDON_PATH))
+sys.path.insert(0, str(PACKAGE_PATH))
+
+addon_handler = types.ModuleType("addonHandler")
+addon_handler.initTranslation = lambda: None
+sys.modules.setdefault("addonHandler", addon_handler)
+
+pypinyin_module = types.ModuleType("pypinyin")
+pypinyin_module.lazy_pinyin = lambda text, style=None: list(text)
+pypinyin_module.pinyin = lambda text, style=None, heteronym=False: [[char] for char in text]
+
+
+class _Style:
+	TONE3 = object()
+
+
+pypinyin_module.Style = _Style
+sys.modules.setdefault("pypinyin", pypinyin_module)
+
+chinese_converter_module = types.ModuleType("chinese_converter")
+chinese_converter_module.to_traditional = lambda text: text
+chinese_converter_module.to_simplified = lambda text: text
+sys.modules.setdefault("chinese_converter", chinese_converter_module)
+
+hanzidentifier_module = types.ModuleType("hanzidentifier")
+hanzidentifier_module.MIXED = "mixed"
+hanzidentifier_module.SIMPLIFIED = "simplified"
+hanzidentifier_module.TRADITIONAL = "traditional"
+hanzidentifier_module.identify = lambda text: hanzidentifier_module.TRADITIONAL
+sys.modules.setdefault("hanzidentifier", hanzidentifier_module)
+
+
+class FakeClock:
+	def __init__(self):
+		self.now = 0.0
+
+	def __call__(self):
+		return self.now
+
+
+class FakeRouteExecutor:
+	def __init__(self, provider_name, errors=None):
+		self.provider_object = type("FakeProvider", (), {"name": provider_name})()
+		self.adapter_object = type("FakeAdapter", (), {"model_name": f"{provider_name.lower()}-model"})()
+		self.route_name = f"{self.adapter_object.model_name}&{provider_name}"
+		self.errors = list(errors or [])
+		self.calls = 0
+
+	def execute(self, input_text, prompt_strategy, text_policy, previous_results=None):
+		from lib.llm.result import LLMExecutionResult
+
+		self.calls += 1
+		if self.errors:
+			raise self.errors.pop(0)
+		return LLMExecutionResult(input_text, input_text + "!", {}, {"output_tokens": 1}, served_by=self.route_name)
+
+	def get_total_usage(self):
+		return {"output_tokens": self.calls}
+
+	def get_total_cost(self):
+		return Decimal("0.01") * self.calls
+
+	def get_summary(self):
+		return {"deduplicated_requests": 0}
+
+
+class ProviderFailoverTests(unittest.TestCase):
+	def test_circuit_breaker_opens_after_repeated_failures_and_probes_after_cool_down(self):
+		from lib.llm.router import CircuitBreaker
+
+		clock = FakeClock()
+		breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock)
+		breaker.record_failure()
+		self.assertTrue(breaker.allow_request())
+		breaker.record_failure()
+		self.assertFalse(breaker.allow_request())
+
+		clock.now = 31
+		self.assertTrue(breaker.allow_request())
+		self.assertFalse(breaker.allow_request())
+		breaker.record_failure()
+		self.assertFalse(breaker.allow_request())
+
+		clock.now = 62
+		self.assertTrue(breaker.allow_request())
+		breaker.record_success()
+		self.assertFalse(breaker.is_open)
+		self.assertTrue(breaker.allow_request())
+
+	def test_failover_executor_routes_around_failing_provider(self):
+		from lib.llm.provider import ProviderError
+		from lib.llm.router import CircuitBreaker, FailoverExecutor
+
+		breakers = {}
+
+		def breaker_factory(provider_name):
+			return breakers.setdefault(provider_name, CircuitBreaker(failure_threshold=2, reset_timeout=60))
+
+		primary = FakeRouteExecutor("Google", errors=[ProviderError("overloaded", 503), ProviderError("timeout")])
+		fallback = FakeRouteExecutor("OpenAI")
+		executor = FailoverExecutor([primary, fallback], circuit_breaker_factory=breaker_factory)
+
+		results = [executor.execute(text, object(), object()) for text in ("一", "二", "三")]
+
+		self.assertEqual([result.output_text for result in results], ["一!", "二!", "三!"])
+		self.assertEqual([result.served_by for result in results], ["openai-model&OpenAI"] * 3)
+		# The third segment skips the primary because its circuit opened after two failures.
+		self.assertEqual(primary.calls, 2)
+		self.assertEqual(fallback.calls, 3)
+		self.assertEqual(
+			executor.get_summary()["routing"],
+			{"served_segments": {"openai-model&OpenAI": 3}, "failovers": 3, "open_circuits": ["google-model&Google"]},
+		)
+		self.assertEqual(executor.get_total_usage(), {"output_tokens": 5})
+		self.assertEqual(executor.get_total_cost(), Decimal("0.05"))
+
+	def test_failover_executor_raises_errors_that_are_not_outages(self):
+		from lib.llm.provider import ProviderError
+		from lib.llm.router import CircuitBreaker, FailoverExecutor
+
+		primary = FakeRouteExecutor("Google", errors=[ProviderError("wrong key", 401)])
+		fallback = FakeRouteExecutor("OpenAI")
+		executor = FailoverExecutor([primary, fallback], circuit_breaker_factory=lambda name: CircuitBreaker())
+
+		with self.assertRaises(ProviderError) as context:
+			executor.execute("一", object(), object())
+
+		self.assertEqual(context.exception.status_code, 401)
+		self.assertEqual(fallback.calls, 0)
+
+	def test_provider_errors_keep_status_code_for_unparsable_bodies(self):
+		from lib.llm.provider import OpenAIProvider, ProviderError
+
+		class FakeResponse:
+			status_code = 502
+			text = "<html>Bad Gateway</html>"
+
+		with self.assertRaises(ProviderError) as context:
+			OpenAIProvider({"api_key": "test"}).handle_errors(FakeResponse())
+
+		self.assertEqual(context.exception.status_code, 502)
+		self.assertTrue(context.exception.retryable)
+		self.assertIn("Bad Gateway", str(context.exception))
+
+
+if __name__ == "__main__":
+	unittest.main()
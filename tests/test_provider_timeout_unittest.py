@@ -0,0 +1,223 @@
+import sys
+import types
+import unittest
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from pathlib import Path
+from unittest.mock import patch
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+ADDON_PATH = PROJECT_ROOT / "addon" / "globalPlugins" / "WordBridge"
+PACKAGE_PATH = ADDON_PATH / "package"
+
+sys.path.insert(0, str(ADDON_PATH))
+sys.path.insert(0, str(PACKAGE_PATH))
+
+addon_handler = types.ModuleType("addonHandler")
+addon_handler.initTranslation = lambda: None
+sys.modules.setdefault("addonHandler", addon_handler)
+
+pypinyin_module = types.ModuleType("pypinyin")
+pypinyin_module.lazy_pinyin = lambda text, style=None: list(text)
+pypinyin_module.pinyin = lambda text, style=None, heteronym=False: [[char] for char in text]
+
+
+class _Style:
+	TONE3 = object()
+
+
+pypinyin_module.Style = _Style
+sys.modules.setdefault("pypinyin", pypinyin_module)
+
+chinese_converter_module = types.ModuleType("chinese_converter")
+chinese_converter_module.to_traditional = lambda text: text
+chinese_converter_module.to_simplified = lambda text: text
+sys.modules.setdefault("chinese_converter", chinese_converter_module)
+
+hanzidentifier_module = types.ModuleType("hanzidentifier")
+hanzidentifier_module.MIXED = "mixed"
+hanzidentifier_module.SIMPLIFIED = "simplified"
+hanzidentifier_module.TRADITIONAL = "traditional"
+hanzidentifier_module.identify = lambda text: hanzidentifier_module.TRADITIONAL
+sys.modules.setdefault("hanzidentifier", hanzidentifier_module)
+
+
+class FakeResponse:
+	def __init__(self, status_code, headers=None):
+		self.status_code = status_code
+		self.headers = headers or {}
+		self.text = ""
+		self.closed = False
+
+	def json(self):
+		return {"choices": [{"message": {"content": "ok"}}]}
+
+	def close(self):
+		self.closed = True
+
+
+class ProviderTimeoutTests(unittest.TestCase):
+	def test_latency_histogram_derives_timeout_from_p99(self):
+		from lib.llm.latency import LatencyHistogram
+
+		histogram = LatencyHistogram(min_samples=10)
+		self.assertEqual(histogram.get_timeout(100, attempt=0, default=10), 10)
+
+		for _ in range(99):
+			histogram.record(100, 1.8)
+		histogram.record(100, 3.5)
+
+		self.assertEqual(histogram.get_percentile(100, 0.5), 2)
+		self.assertEqual(histogram.get_percentile(100, 0.99), 2)
+		self.assertEqual(histogram.get_timeout(100, attempt=0, default=10), 3)
+		self.assertEqual(histogram.get_timeout(100, attempt=1, default=10), 6)
+		# Payloads of another size class have not been observed yet.
+		self.assertEqual(histogram.get_timeout(3000, attempt=0, default=10), 10)
+
+	def test_latency_histogram_forgets_old_samples(self):
+		from lib.llm.latency import LatencyHistogram
+
+		histogram = LatencyHistogram(min_samples=10, max_samples=40)
+		for _ in range(39):
+			histogram.record(100, 25)
+		for _ in range(30):
+			histogram.record(100, 0.8)
+
+		self.assertEqual(histogram.get_percentile(100, 0.5), 1)
+		self.assertEqual(histogram.get_percentile(100, 0.99), 30)
+
+	def test_parse_retry_after_accepts_seconds_and_dates(self):
+		from lib.llm.provider import parse_retry_after
+
+		self.assertEqual(parse_retry_after("3"), 3)
+		self.assertIsNone(parse_retry_after(None))
+		self.assertIsNone(parse_retry_after("soon"))
+		retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+		self.assertAlmostEqual(parse_retry_after(format_datetime(retry_at, usegmt=True)), 30, delta=2)
+
+	def test_provider_waits_for_retry_after_before_trying_again(self):
+		from lib.llm.provider import OpenAIProvider
+
+		responses = [FakeResponse(429, {"Retry-After": "1.5"}), FakeResponse(200)]
+		timeouts = []
+
+		def fake_post(api_url, headers, json, timeout):
+			timeouts.append(timeout)
+			return responses[len(timeouts) - 1]
+
+		provider = OpenAIProvider({"api_key": "test"})
+		with patch("lib.llm.provider.requests.post", side_effect=fake_post):
+			with patch("lib.llm.provider.time.sleep") as sleep:
+				response = provider.send({"input": "天器"}, model_name="retry-after-test")
+
+		self.assertEqual(response, {"choices": [{"message": {"content": "ok"}}]})
+		sleep.assert_called_once_with(1.5)
+		self.assertTrue(responses[0].closed)
+		self.assertEqual(timeouts, [provider.timeout0, provider.timeout_max])
+
+	def test_provider_gives_large_payloads_more_time(self):
+		from lib.llm.provider import OpenAIProvider
+
+		timeouts = []
+
+		def fake_post(api_url, headers, json, timeout):
+			timeouts.append(timeout)
+			return FakeResponse(200)
+
+		provider = OpenAIProvider({"api_key": "test"})
+		with patch("lib.llm.provider.requests.post", side_effect=fake_post):
+			provider.send({"input": "天" * 4000}, model_name="large-payload-test")
+
+		self.assertGreater(timeouts[0], provider.timeout0 * 2)
+
+	def test_provider_keeps_static_read_timeout_for_streams(self):
+		from lib.llm.latency import get_latency_histogram
+		from lib.llm.provider import OpenAIProvider
+
+		histogram = get_latency_histogram("OpenAI", "stream-timeout-test", stream=True)
+		for _ in range(20):
+			histogram.record(100, 0.3)
+		timeouts = []
+
+		def fake_post(api_url, headers, json, timeout, stream):
+			timeouts.append(timeout)
+			return FakeResponse(200)
+
+		provider = OpenAIProvider({"api_key": "test"})
+		with patch("lib.llm.provider.requests.post", side_effect=fake_post):
+			provider.post(
+				"https://example.com",
+				{"input": "天器"},
+				stream=True,
+				model_name="stream-timeout-test",
+			)
+
+		# The connection gets the adaptive floor, while pauses between events may last the static timeout.
+		self.assertEqual(timeouts, [(histogram.min_timeout, provider.timeout0)])
+
+	def test_provider_timeouts_raise_the_adaptive_timeout(self):
+		import requests
+		from lib.llm.latency import get_latency_histogram
+		from lib.llm.provider import OpenAIProvider
+
+		histogram = get_latency_histogram("OpenAI", "timed-out-test")
+		for _ in range(10):
+			histogram.record(100, 1)
+		timeouts = []
+
+		def fake_post(api_url, headers, json, timeout):
+			timeouts.append(timeout)
+			if len(timeouts) == 1:
+				raise requests.exceptions.ReadTimeout("slow")
+			return FakeResponse(200)
+
+		provider = OpenAIProvider({"api_key": "test"})
+		with patch("lib.llm.provider.requests.post", side_effect=fake_post):
+			with patch("lib.llm.provider.time.sleep"):
+				provider.send({"input": "天器"}, model_name="timed-out-test")
+
+		self.assertEqual(timeouts[0], histogram.min_timeout)
+		# The timed-out attempt counts as a sample of at least the timeout, so the p99 no longer ignores it.
+		self.assertEqual(histogram.get_percentile(100, 0.99), histogram.min_timeout)
+		self.assertEqual(timeouts[1], histogram.min_timeout * histogram.safety_factor * 2)
+
+	def test_provider_stream_read_timeouts_are_not_recorded(self):
+		import requests
+		from lib.llm.latency import get_latency_histogram
+		from lib.llm.provider import OpenAIProvider
+
+		from lib.llm.provider import ProviderError
+
+		histogram = get_latency_histogram("OpenAI", "stream-read-timeout-test", stream=True)
+
+		def fake_post(api_url, headers, json, timeout, stream):
+			raise requests.exceptions.ReadTimeout("slow")
+
+		provider = OpenAIProvider({"api_key": "test"})
+		with patch("lib.llm.provider.requests.post", side_effect=fake_post):
+			with patch("lib.llm.provider.time.sleep"), self.assertRaises(ProviderError):
+				provider.post(
+					"https://example.com",
+					{"input": "天器"},
+					stream=True,
+					model_name="stream-read-timeout-test",
+				)
+
+		self.assertEqual(histogram.get_summary(), {})
+
+	def test_try_connection_reports_connect_timeouts_as_provider_errors(self):
+		import requests
+		from lib.llm.provider import OpenAIProvider, ProviderError
+
+		provider = OpenAIProvider({"api_key": "test"})
+		connect_timeout = requests.exceptions.ConnectTimeout("unreachable")
+		with patch("lib.llm.provider.requests.get", side_effect=connect_timeout):
+			with self.assertRaises(ProviderError) as context:
+				provider.try_connection()
+
+		self.assertIn("ConnectTimeout", str(context.exception))
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,233 @@
+import json
+import sys
+import types
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+ADDON_PATH = PROJECT_ROOT / "addon" / "globalPlugins" / "WordBridge"
+PACKAGE_PATH = ADDON_PATH / "package"
+
+sys.path.insert(0, str(ADDON_PATH))
+sys.path.insert(0, str(PACKAGE_PATH))
+
+addon_handler = types.ModuleType("addonHandler")
+addon_handler.initTranslation = lambda: None
+sys.modules.setdefault("addonHandler", addon_handler)
+
+pypinyin_module = types.ModuleType("pypinyin")
+pypinyin_module.lazy_pinyin = lambda text, style=None: list(text)
+pypinyin_module.pinyin = lambda text, style=None, heteronym=False: [[char] for char in text]
+
+
+class _Style:
+	TONE3 = object()
+
+
+pypinyin_module.Style = _Style
+sys.modules.setdefault("pypinyin", pypinyin_module)
+
+chinese_converter_module = types.ModuleType("chinese_converter")
+chinese_converter_module.to_traditional = lambda text: text
+chinese_converter_module.to_simplified = lambda text: text
+sys.modules.setdefault("chinese_converter", chinese_converter_module)
+
+hanzidentifier_module = types.ModuleType("hanzidentifier")
+hanzidentifier_module.MIXED = "mixed"
+hanzidentifier_module.SIMPLIFIED = "simplified"
+hanzidentifier_module.TRADITIONAL = "traditional"
+hanzidentifier_module.identify = lambda text: hanzidentifier_module.TRADITIONAL
+sys.modules.setdefault("hanzidentifier", hanzidentifier_module)
+
+
+class FakeStreamResponse:
+	status_code = 200
+
+	def __init__(self, lines):
+		self.lines = lines
+		self.closed = False
+
+	def iter_lines(self, chunk_size=512):
+		for line in self.lines:
+			yield line.encode("utf8")
+
+	def close(self):
+		self.closed = True
+
+
+def sse_lines(events):
+	lines = []
+	for event in events:
+		lines.append("data: " + json.dumps(event, ensure_ascii=False))
+		lines.append("")
+	return lines
+
+
+class StreamingTests(unittest.TestCase):
+	def test_iter_sse_events_joins_data_lines_and_stops_at_done(self):
+		from lib.llm.provider import iter_sse_events
+
+		response = FakeStreamResponse([
+			": keep-alive",
+			"event: message",
+			'data: {"a":',
+			"data: 1}",
+			"",
+			'data: {"b": 2}',
+			"",
+			"data: [DONE]",
+			"",
+			'data: {"c": 3}',
+			"",
+		])
+
+		self.assertEqual(list(iter_sse_events(response)), [{"a": 1}, {"b": 2}])
+
+	def test_provider_stream_requests_streaming_and_closes_response(self):
+		from lib.llm.provider import OpenAIProvider
+
+		captured = {}
+		response = FakeStreamResponse(sse_lines([{"n": 1}, {"n": 2}]))
+
+		def fake_post(api_url, headers, json, timeout, stream):
+			captured["api_url"] = api_url
+			captured["stream"] = stream
+			return response
+
+		provider = OpenAIProvider({"api_key": "test"})
+		provider.retries = 1
+		with patch("lib.llm.provider.requests.post", side_effect=fake_post):
+			events = provider.stream({"input": []})
+			self.assertEqual(next(events), {"n": 1})
+			events.close()
+
+		self.assertEqual(captured["api_url"], "https://api.openai.com/v1/responses")
+		self.assertTrue(captured["stream"])
+		self.assertTrue(response.closed)
+
+	def test_google_provider_uses_streaming_endpoint(self):
+		from lib.llm.provider import GoogleProvider
+
+		provider = GoogleProvider.__new__(GoogleProvider)
+		provider.url = "https://generativelanguage.googleapis.com/v1beta"
+		provider.credential = {"api_key": "google-key"}
+
+		self.assertEqual(
+			provider.get_stream_api_url(model_name="gemini-2.5-flash"),
+			"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:streamGenerateContent?alt=sse&key=google-key",
+		)
+
+	def test_adapters_parse_stream_events(self):
+		from lib.llm.adapter import get_provider_model_adapter
+
+		anthropic = get_provider_model_adapter("Anthropic", "claude-haiku-4-5")
+		self.assertEqual(
+			anthropic.parse_stream_event({"type": "message_start", "message": {"usage": {"input_tokens": 9, "output_tokens": 1}}}),
+			("", {"input_tokens": 9, "output_tokens": 1}),
+		)
+		self.assertEqual(
+			anthropic.parse_stream_event({"type": "content_block_delta", "delta": {"type": "text_delta", "text": "天氣"}}),
+			("天氣", {}),
+		)
+		self.assertEqual(anthropic.parse_stream_event({"type": "message_delta", "usage": {"output_tokens": 4}}), ("", {"output_tokens": 4}))
+
+		openai = get_provider_model_adapter("OpenAI", "gpt-5-mini")
+		self.assertEqual(openai.parse_stream_event({"type": "response.output_text.delta", "delta": "天"}), ("天", {}))
+		self.assertEqual(
+			openai.parse_stream_event({"type": "response.completed", "response": {"usage": {"input_tokens": 5, "output_tokens": 2}}}),
+			("", {"input_tokens": 5, "output_tokens": 2}),
+		)
+
+		google = get_provider_model_adapter("Google", "gemini-2.5-flash")
+		self.assertEqual(
+			google.parse_stream_event({
+				"candidates": [{"content": {"parts": [{"text": "天氣"}]}}],
+				"usageMetadata": {"promptTokenCount": 7, "candidatesTokenCount": 2},
+			}),
+			("天氣", {"promptTokenCount": 7, "candidatesTokenCount": 2}),
+		)
+
+		deepseek = get_provider_model_adapter("DeepSeek", "deepseek-chat")
+		self.assertEqual(deepseek.parse_stream_event({"choices": [{"delta": {"content": "天"}}]}), ("天", {}))
+		self.assertTrue(deepseek.format_stream_request(self._prompt_bundle(), {})["stream"])
+
+	def test_stream_error_events_raise_provider_errors_with_status(self):
+		from lib.llm.adapter import get_provider_model_adapter
+		from lib.llm.provider import ProviderError
+
+		anthropic = get_provider_model_adapter("Anthropic", "claude-haiku-4-5")
+		openai = get_provider_model_adapter("OpenAI", "gpt-5-mini")
+		cases = [
+			(anthropic, {"type": "error", "error": {"type": "overloaded_error", "message": "Overloaded"}}, 529, True),
+			(anthropic, {"type": "error", "error": {"type": "rate_limit_error"}}, 429, True),
+			(anthropic, {"type": "error", "error": {"type": "api_error"}}, 500, True),
+			(anthropic, {"type": "error", "error": {"type": "invalid_request_error"}}, 400, False),
+			(openai, {"type": "error", "code": "rate_limit_exceeded", "message": "Slow down"}, 429, True),
+			(openai, {"type": "response.failed", "response": {"error": {"code": "server_error"}}}, 500, True),
+			(openai, {"type": "response.failed", "response": {"error": None}}, 500, True),
+		]
+		for adapter, event, status_code, retryable in cases:
+			with self.subTest(event=event):
+				with self.assertRaises(ProviderError) as context:
+					adapter.parse_stream_event(event)
+				self.assertEqual(context.exception.status_code, status_code)
+				self.assertEqual(context.exception.retryable, retryable)
+
+	def test_executor_cancels_stream_when_model_starts_explaining(self):
+		from lib.llm.adapter import get_provider_model_adapter
+		from lib.llm.executor import LLMExecutor
+		from lib.tasks.typo.prompt import LiteTypoPromptStrategy
+		from lib.tasks.typo.text_policy import LiteTypoTextPolicy
+
+		class FakeStreamingProvider:
+			setting = {"max_tokens": 4096}
+
+			def __init__(self):
+				self.sent_events = 0
+				self.closed = False
+
+			def stream(self, payload, model_name=None):
+				self.payload = payload
+				deltas = ["天氣", "真好", "\n", "說明：", "「器」應為「氣」"] + ["。"] * 100
+				try:
+					yield {"type": "message_start", "message": {"usage": {"input_tokens": 120, "output_tokens": 1}}}
+					for delta in deltas:
+						self.sent_events += 1
+						yield {"type": "content_block_delta", "delta": {"type": "text_delta", "text": delta}}
+				finally:
+					self.closed = True
+
+		provider = FakeStreamingProvider()
+		executor = LLMExecutor(provider, get_provider_model_adapter("Anthropic", "claude-haiku-4-5"), stream_responses=True)
+		result = executor.execute(
+			input_text="天器真好",
+			prompt_strategy=LiteTypoPromptStrategy(language="zh_traditional", template_name="Lite_v1.json"),
+			text_policy=LiteTypoTextPolicy("zh_traditional"),
+		)
+
+		self.assertTrue(provider.payload["stream"])
+		self.assertEqual(result.output_text, "天氣真好")
+		self.assertEqual(provider.sent_events, 3)
+		self.assertTrue(provider.closed)
+		self.assertTrue(result.raw_response["cancelled"])
+		self.assertEqual(result.usage["input_tokens"], 120)
+		self.assertEqual(result.usage["output_tokens"], 4)
+
+	def test_edit_policy_stops_at_first_line_that_is_not_an_edit(self):
+		from lib.tasks.typo.text_policy import EditTypoTextPolicy
+
+		policy = EditTypoTextPolicy("zh_traditional")
+		self.assertIsNone(policy.check_stream_output("天器→天氣\n去", "天器真好，出去完"))
+		self.assertEqual(policy.check_stream_output("天器→天氣\n因為天氣\n", "天器真好"), "天器→天氣")
+		self.assertEqual(policy.check_stream_output("無\n", "出去玩"), "無")
+		self.assertEqual(len(policy.check_stream_output("天器→天氣" * 10, "天器")), 14)
+
+	def _prompt_bundle(self):
+		from lib.llm.prompt_bundle import PromptBundle
+
+		return PromptBundle(messages=[{"role": "user", "content": "天器"}], system_template="改錯字")
+
+
+if __name__ == "__main__":
+	unittest.main()
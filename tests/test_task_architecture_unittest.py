@@ -118,6 +118,150 @@ class TaskArchitectureTests(unittest.TestCase):
 		self.assertEqual(executor.get_total_usage(), {"prompt_tokens": 3})
 		self.assertEqual(executor.get_total_cost(), Decimal("0.001"))
 
+	def test_llm_executor_shares_identical_in_flight_requests(self):
+		import threading
+		import time
+
+		from lib.llm.executor import LLMExecutor
+		from lib.llm.prompt_bundle import PromptBundle
+
+		release = threading.Event()
+
+		class FakeProvider:
+			setting = {"temperature": 0}
+
+			def __init__(self):
+				self.send_count = 0
+
+			def send(self, payload, model_name=None):
+				self.send_count += 1
+				release.wait(5)
+				return {"text": payload["messages"][0]["content"], "usage": {"prompt_tokens": 3}}
+
+		class FakeAdapter:
+			model_name = "fake-model"
+
+			def format_request(self, prompt_bundle, setting):
+				return {"messages": prompt_bundle.messages}
+
+			def parse_response(self, response):
+				return response["text"]
+
+			def extract_usage(self, response):
+				return response["usage"]
+
+		class FakePromptStrategy:
+			def compose(self, input_text, response_text_history, text_policy):
+				return PromptBundle(messages=[{"role": "user", "content": input_text}], system_template="系統提示")
+
+		class FakeTextPolicy:
+			def has_target_language(self, text):
+				return True
+
+			def postprocess_output(self, text, input_text):
+				return text
+
+			def normalize_response(self, sentence):
+				return sentence
+
+		provider = FakeProvider()
+		executor = LLMExecutor(provider, FakeAdapter())
+		results = []
+
+		def run():
+			results.append(executor.execute("重複段落", FakePromptStrategy(), FakeTextPolicy()))
+
+		threads = [threading.Thread(target=run) for _ in range(3)]
+		for thread in threads:
+			thread.start()
+		deadline = time.monotonic() + 5
+		while executor.deduplicated_requests < 2 and time.monotonic() < deadline:
+			time.sleep(0.01)
+		release.set()
+		for thread in threads:
+			thread.join()
+
+		self.assertEqual(provider.send_count, 1)
+		self.assertEqual([result.output_text for result in results], ["重複段落"] * 3)
+		self.assertEqual(sorted(len(result.usage) for result in results), [0, 0, 1])
+		self.assertEqual(executor.usage_history, [{"prompt_tokens": 3}])
+		self.assertEqual(executor.get_summary(), {"deduplicated_requests": 2})
+
+	def test_usage_accumulator_keeps_running_totals_across_threads(self):
+		import threading
+
+		from lib.llm.cost_calculator import CostCalculator
+
+		calculator = CostCalculator({
+			"usage_key": "usage",
+			"pricing": {"base_unit": 1000000, "input_tokens": 0.28, "output_tokens": 0.42},
+		})
+		responses = [{"usage": {"input_tokens": 1000 + i, "output_tokens": 10 * i, "cached_tokens": 5}} for i in range(50)]
+		accumulator = calculator.create_accumulator()
+
+		threads = [threading.Thread(target=accumulator.add, args=(response,)) for response in responses]
+		for thread in threads:
+			thread.start()
+		for thread in threads:
+			thread.join()
+
+		self.assertEqual(accumulator.get_total_usage(), calculator.get_total_usage(responses))
+		self.assertEqual(accumulator.get_total_usage(), {"input_tokens": 51225, "output_tokens": 12250})
+		self.assertEqual(accumulator.get_total_cost(), calculator.get_total_cost(responses))
+		self.assertEqual(accumulator.get_total_cost(), Decimal("0.019488"))
+
+	def test_llm_executor_can_drop_raw_responses_and_keep_totals(self):
+		from lib.llm.cost_calculator import CostCalculator
+		from lib.llm.executor import LLMExecutor
+		from lib.llm.prompt_bundle import PromptBundle
+
+		class FakeProvider:
+			setting = {}
+
+			def send(self, payload, model_name=None):
+				return {"text": payload["messages"][0]["content"], "usage": {"input_tokens": 100, "output_tokens": 20}}
+
+		class FakeAdapter:
+			model_name = "fake-model"
+
+			def __init__(self):
+				self._cost_calculator = CostCalculator({"pricing": {"base_unit": 1000, "input_tokens": 1, "output_tokens": 2}})
+
+			def format_request(self, prompt_bundle, setting):
+				return {"messages": prompt_bundle.messages}
+
+			def parse_response(self, response):
+				return response["text"]
+
+			def extract_usage(self, response):
+				return response["usage"]
+
+			def create_usage_accumulator(self):
+				return self._cost_calculator.create_accumulator()
+
+		class FakePromptStrategy:
+			def compose(self, input_text, response_text_history, text_policy):
+				return PromptBundle(messages=[{"role": "user", "content": input_text}], system_template="")
+
+		class FakeTextPolicy:
+			def has_target_language(self, text):
+				return True
+
+			def postprocess_output(self, text, input_text):
+				return text
+
+			def normalize_response(self, sentence):
+				return sentence
+
+		executor = LLMExecutor(FakeProvider(), FakeAdapter(), keep_response_history=False)
+		for text in ["第一段", "第二段"]:
+			executor.execute(text, FakePromptStrategy(), FakeTextPolicy())
+
+		self.assertEqual(executor.response_history, [])
+		self.assertEqual(executor.usage_history, [])
+		self.assertEqual(executor.get_total_usage(), {"input_tokens": 200, "output_tokens": 40})
+		self.assertEqual(executor.get_total_cost(), Decimal("0.28"))
+
 	def test_typo_workflow_uses_executor_and_returns_task_result(self):
 		from lib.tasks.typo.result import TypoCorrectionResult
 		from lib.tasks.typo.workflow import TypoCorrectionWorkflow
@@ -161,6 +305,63 @@ class TaskArchitectureTests(unittest.TestCase):
 		self.assertEqual(result.usage_summary, {"prompt_tokens": 1, "completion_tokens": 1})
 		self.assertEqual(result.cost, Decimal("0.0001"))
 
+	def test_cascade_workflow_escalates_only_segments_the_first_pass_changed(self):
+		from lib.tasks.typo.workflow import CascadeTypoCorrectionWorkflow, TypoCorrectionWorkflow
+
+		clean_segment = "今天天氣真好" * 17 + "。"
+		typo_segment = "天器真好" * 26 + "。"
+
+		class FakeExecutionResult:
+			def __init__(self, output_text):
+				self.output_text = output_text
+
+		class FakeAdapter:
+			def __init__(self, model_name):
+				self.model_name = model_name
+
+		class FakeExecutor:
+			def __init__(self, model_name, cost):
+				self.adapter_object = FakeAdapter(model_name)
+				self.cost = cost
+				self.calls = []
+
+			def ensure_connection(self):
+				pass
+
+			def execute(self, input_text, prompt_strategy, text_policy, previous_results=None):
+				self.calls.append(input_text)
+				return FakeExecutionResult(input_text.replace("天器", "天氣"))
+
+			def get_total_usage(self):
+				return {"input_tokens": len(self.calls), "output_tokens": 1}
+
+			def get_total_cost(self):
+				return self.cost
+
+		def create_workflow(executor):
+			return TypoCorrectionWorkflow(
+				executor=executor,
+				prompt_strategy=object(),
+				text_policy=object(),
+				max_correction_attempts=0,
+			)
+
+		cheap_executor = FakeExecutor("cheap-model", Decimal("0.001"))
+		strong_executor = FakeExecutor("strong-model", Decimal("0.01"))
+		workflow = CascadeTypoCorrectionWorkflow(create_workflow(cheap_executor), create_workflow(strong_executor))
+
+		result = workflow.run(clean_segment + typo_segment, batch_mode=False)
+
+		self.assertEqual(result.corrected_text, clean_segment + typo_segment.replace("天器", "天氣"))
+		self.assertEqual(cheap_executor.calls, [clean_segment, typo_segment])
+		self.assertEqual(strong_executor.calls, [typo_segment])
+		self.assertEqual([tier.model_name for tier in result.tiers], ["cheap-model", "strong-model"])
+		self.assertEqual([tier.segment_count for tier in result.tiers], [2, 1])
+		self.assertEqual(result.tiers[0].escalation_count, 1)
+		self.assertEqual(result.cost, Decimal("0.011"))
+		self.assertEqual(result.usage_summary, {"input_tokens": 3, "output_tokens": 2})
+		self.assertEqual(result.telemetry["cascade"]["escalated_segments"], 1)
+
 	def test_task_factory_and_runner_build_and_execute_typo_workflow(self):
 		from lib.application import task_factory, task_runner
 		from lib.tasks.typo.workflow import TypoCorrectionWorkflow
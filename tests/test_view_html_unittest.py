@@ -0,0 +1,83 @@
+import json
+import re
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+ADDON_PATH = PROJECT_ROOT / "addon" / "globalPlugins" / "WordBridge"
+
+sys.path.insert(0, str(ADDON_PATH))
+
+addon_handler = types.ModuleType("addonHandler")
+addon_handler.initTranslation = lambda: None
+sys.modules.setdefault("addonHandler", addon_handler)
+
+
+class ViewHTMLTests(unittest.TestCase):
+	def test_render_report_embeds_diff_once_and_installs_modules_once(self):
+		from lib import viewHTML
+
+		diff_data = [
+			{"operation": "equal", "before_text": "今天", "after_text": "今天", "before_descs": "", "after_descs": "", "tags": None},
+			{
+				"operation": "replace",
+				"before_text": "器",
+				"after_text": "氣",
+				"before_descs": [["器", ["</script><b>"]]],
+				"after_descs": [["氣", ["空氣的氣"]]],
+				"tags": None,
+			},
+		]
+		with tempfile.TemporaryDirectory() as workspace_path:
+			dst = Path(workspace_path) / "review" / "result.html"
+			viewHTML.render_report(diff_data, str(dst), workspace_path=workspace_path)
+
+			modules_path = Path(workspace_path) / "static" / viewHTML.get_modules_version()
+			self.assertTrue((modules_path / "vue.js").is_file())
+			marker = modules_path / "marker"
+			marker.write_text("installed")
+
+			viewHTML.render_report(diff_data, str(dst), title="報告", workspace_path=workspace_path)
+			content = dst.read_text(encoding="utf8")
+
+			self.assertTrue(marker.is_file())
+			self.assertIn(f'src="../static/{viewHTML.get_modules_version()}/vue.js"', content)
+			self.assertNotIn("</script><b>", content)
+
+			embedded = re.search(r"window\.contentConfig = (.*);\n", content).group(1)
+			self.assertEqual(json.loads(embedded), {"title": "報告", "report": viewHTML.compact_diff(diff_data)})
+
+	def test_compact_diff_merges_equal_runs_shares_descs_and_pages(self):
+		from lib import viewHTML
+
+		def equal(text):
+			return {"operation": "equal", "before_text": text, "after_text": text, "before_descs": "", "after_descs": "", "tags": None}
+
+		def replace(before, after):
+			return {
+				"operation": "replace",
+				"before_text": before,
+				"after_text": after,
+				"before_descs": [[before, ["desc"]]],
+				"after_descs": [[after, ["desc"]]],
+				"tags": None,
+			}
+
+		diff_data = [equal("今天"), equal("天"), replace("器", "氣"), equal("很好"), replace("器", "氣"), equal("。")]
+
+		report = viewHTML.compact_diff(diff_data, page_size=4)
+
+		self.assertEqual(
+			report["ops"],
+			[["e", "今天天"], ["r", "氣", 0, "器"], ["e", "很好"], ["r", "氣", 0, "器"], ["e", "。"]],
+		)
+		self.assertEqual(report["descs"], [[[["器", ["desc"]]], [["氣", ["desc"]]]]])
+		self.assertEqual(report["pages"], [0, 2])
+
+
+if __name__ == "__main__":
+	unittest.main()
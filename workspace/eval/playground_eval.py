@@ -1,6 +1,10 @@
 import json
 import os
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from decimal import Decimal
 
 from tqdm import tqdm
 
@@ -10,130 +14,245 @@ import jiwer
 path = os.path.dirname(__file__)
 api_path = os.path.join(path, "..", "..", "addon", "globalPlugins", "WordBridge")
 sys.path.insert(0, api_path)
+sys.path.insert(0, os.path.join(api_path, "package"))
 
-from lib.typo_corrector import ChineseTypoCorrector, ChineseTypoCorrectorLite
+from lib.application.task_runner import run_typo_correction
 
 
-def generate_results(text, groundtruth, corrector):
-	text_corrected = []
-	for i in tqdm(range(len(text))):
-		output, _ = corrector.correct_text(text[i], batch_mode=False)
-		text_corrected.append(output)
+class RunningScore:
+	"""
+	Accumulate accuracy, character error rate, usage and cost as sentence results arrive.
+	"""
+	def __init__(self):
+		self.count = 0
+		self.correct_count = 0
+		self.cer_sum = 0.0
+		self.cost = Decimal("0")
+		self.usage = {}
+		self.elapsed_sum = 0.0
 
-		# For debugging
-		if text_corrected[i] not in groundtruth[i]:
-			print(f"{text[i]} => {text_corrected[i]}, ans: {' or '.join(groundtruth[i])}")
+	def add(self, record: dict):
+		self.count += 1
+		self.correct_count += int(record["correct"])
+		self.cer_sum += record["cer"]
+		self.cost += Decimal(record["cost"])
+		self.elapsed_sum += record["elapsed"]
+		for key, value in record["usage"].items():
+			if isinstance(value, (int, float)):
+				self.usage[key] = self.usage.get(key, 0) + value
+
+	@property
+	def accuracy(self) -> float:
+		return self.correct_count / self.count * 100 if self.count else 0.0
+
+	@property
+	def cer(self) -> float:
+		return self.cer_sum / self.count * 100 if self.count else 0.0
+
+	def to_dict(self) -> dict:
+		return {
+			"count": self.count,
+			"accuracy": self.accuracy,
+			"cer": self.cer,
+			"cost": str(self.cost),
+			"usage": self.usage,
+			"mean_latency": self.elapsed_sum / self.count if self.count else 0.0,
+		}
+
+
+def get_config_name(config: dict) -> str:
+	model = config["model"].replace(":", "_").replace("/", "_")
+	template = os.path.splitext(config["template_name"])[0]
+	return f"{model}_{template}_{config['corrector_mode']}"
+
+
+def load_corpus(data_path: str, groundtruth_path: str) -> tuple:
+	with open(data_path, "r", encoding="utf8") as f:
+		text = [sentence.replace("\n", "") for sentence in f.readlines()]
+
+	with open(groundtruth_path, "r", encoding="utf8") as f:
+		groundtruth = [sentence.replace("\n", "").split("|") for sentence in f.readlines()]
+
+	assert len(text) == len(groundtruth)
+	return text, groundtruth
+
+
+def load_checkpoint(checkpoint_path: str) -> dict:
+	records = {}
+	if not os.path.exists(checkpoint_path):
+		return records
+
+	with open(checkpoint_path, "r", encoding="utf8") as f:
+		for line in f:
+			line = line.strip()
+			if not line:
+				continue
+			try:
+				record = json.loads(line)
+			except json.JSONDecodeError:
+				# A run interrupted mid-write leaves a truncated last line, which is simply redone.
+				continue
+			records[record["index"]] = record
+
+	return records
+
+
+def correct_sentence(index: int, sentence: str, groundtruth: list, config: dict, shared_kwargs: dict) -> dict:
+	start_time = time.time()
+	result = run_typo_correction(
+		request=sentence,
+		provider_name=config["provider"],
+		model_name=config["model"],
+		template_name=config["template_name"],
+		corrector_mode=config["corrector_mode"],
+		**shared_kwargs,
+	)
+	output = result.corrected_text
+	return {
+		"index": index,
+		"input": sentence,
+		"output": output,
+		"groundtruth": groundtruth,
+		"correct": output in groundtruth,
+		"cer": min([jiwer.cer(gt, output) for gt in groundtruth]),
+		"usage": result.usage_summary,
+		"cost": str(result.cost),
+		"elapsed": time.time() - start_time,
+	}
+
+
+def evaluate_configuration(
+	config: dict,
+	text: list,
+	groundtruth: list,
+	checkpoint_path: str,
+	shared_kwargs: dict,
+	max_workers: int = 8,
+) -> RunningScore:
+	score = RunningScore()
+	records = load_checkpoint(checkpoint_path)
+	for record in records.values():
+		score.add(record)
+
+	pending = [i for i in range(len(text)) if i not in records]
+	if not pending:
+		return score
+
+	lock = threading.Lock()
+	progress = tqdm(total=len(text), initial=len(records), desc=get_config_name(config))
+	with open(checkpoint_path, "a", encoding="utf8") as checkpoint_file, \
+		ThreadPoolExecutor(max_workers=max_workers) as executor:
+		future_to_index = {
+			executor.submit(correct_sentence, i, text[i], groundtruth[i], config, shared_kwargs): i
+			for i in pending
+		}
+		for future in as_completed(future_to_index):
+			index = future_to_index[future]
+			try:
+				record = future.result()
+			except Exception as e:
+				# Failed sentences are not checkpointed, so the next invocation retries them.
+				progress.write(f"[{index}] {text[index]} failed: {e}")
+				continue
+
+			with lock:
+				checkpoint_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+				checkpoint_file.flush()
+				score.add(record)
+
+			if not record["correct"]:
+				progress.write(f"{record['input']} => {record['output']}, ans: {' or '.join(record['groundtruth'])}")
+			progress.set_postfix(acc=f"{score.accuracy:.1f}%", cer=f"{score.cer:.2f}%", cost=str(score.cost))
+			progress.update(1)
+	progress.close()
+
+	return score
+
+
+def write_comparison(scores: dict, total: int, eval_file_path: str):
+	header = f"{'configuration':<60} {'done':>9} {'accuracy':>9} {'CER':>8} {'cost (USD)':>14} {'latency':>8}"
+	lines = [header, "-" * len(header)]
+	for name, score in sorted(scores.items(), key=lambda item: (-item[1].accuracy, item[1].cer)):
+		lines.append(
+			f"{name:<60} {f'{score.count}/{total}':>9} {score.accuracy:>8.2f}% {score.cer:>7.2f}% "
+			f"{str(score.cost):>14} {score.elapsed_sum / max(score.count, 1):>7.2f}s"
+		)
+
+	print("\n".join(lines))
+	with open(eval_file_path, "w", encoding="utf8") as f:
+		f.write("\n".join(lines) + "\n\n")
+		f.write(json.dumps({name: score.to_dict() for name, score in scores.items()}, ensure_ascii=False, indent=2))
 
-	return text_corrected
 
 if __name__ == "__main__":
 
-	model = "qwen2"
-	provider = "Ollama"
-	typo_corrector_class = ChineseTypoCorrector
+	# Each (model, template, mode) configuration is evaluated and compared in one invocation.
+	configs = [
+		{
+			"provider": "OpenAI",
+			"model": "gpt-5.4-nano-2026-03-17",
+			"template_name": "Standard_v1.json",
+			"corrector_mode": "standard",
+		},
+		{
+			"provider": "OpenAI",
+			"model": "gpt-5.4-nano-2026-03-17",
+			"template_name": "Lite_v1.json",
+			"corrector_mode": "lite",
+		},
+		{
+			"provider": "Google",
+			"model": "gemini-2.5-flash-lite",
+			"template_name": "Standard_v3.json",
+			"corrector_mode": "standard",
+		},
+	]
 	language = "zh_traditional"
-	template_name = "Standard_v3.json"
 	optional_guidance_enable = {
 		"no_explanation": True,
 		"keep_non_chinese_char": False,
 	}
 	max_correction_attempts = 15
 	customized_words = []
-	credential = None
-	if provider.lower() != "ollama":
-		with open(os.path.join(path, "config.json"), "r", encoding="utf8") as f:
-			credential = json.loads(f.read())[provider]
+	max_workers = 8
 	data_name = "gpt4_250_sentence_aug_err_0.1_41PJSO2KRV6SK1WJ6936.txt"
 	groundtruth_name = "gpt4_250_sentence_gt.txt"
-	tag = "2024-08-26-ollama"
+	tag = "2026-10-19"
+
+	with open(os.path.join(path, "config.json"), "r", encoding="utf8") as f:
+		credentials = json.loads(f.read())
 
 	data_path = os.path.join(path, "data", data_name)
 	groundtruth_path = os.path.join(path, "data", groundtruth_name)
-
-	eval_file_name = f"eval_{model.replace(':', '_').replace('/', '_')}_{tag}_{os.path.basename(data_path)}"
-	result_file_name = f"result_{model.replace(':', '_').replace('/', '_')}_{tag}_{os.path.basename(data_path)}"
 	eval_file_folder = os.path.join(path, "eval")
 	result_file_folder = os.path.join(path, "result")
-	eval_file_path = os.path.join(eval_file_folder, eval_file_name)
-	result_file_path = os.path.join(result_file_folder, result_file_name)
+	eval_file_path = os.path.join(eval_file_folder, f"eval_{tag}_{os.path.basename(data_path)}")
 
 	if not os.path.isdir(eval_file_folder):
 		os.makedirs(eval_file_folder)
 	if not os.path.isdir(result_file_folder):
 		os.makedirs(result_file_folder)
 
-	# Initialize the typo corrector object with the OpenAI API key and the GPT model
-	corrector = typo_corrector_class(
-		model=model,
-		provider=provider,
-		credential=credential,
-		language=language,
-		template_name=template_name,
-		optional_guidance_enable=optional_guidance_enable,
-		customized_words=customized_words,
-		max_correction_attempts=max_correction_attempts,
-	)
-
-	# Read testing data
-	with open(data_path, 'r', encoding="utf8") as f:
-		text = f.readlines()
-		text = [sentence.replace('\n', '') for sentence in text]
+	text, groundtruth = load_corpus(data_path, groundtruth_path)
 
-	# Read ground truth
-	with open(groundtruth_path, 'r', encoding="utf8") as f:
-		groundtruth = f.readlines()
-		groundtruth = [sentence.replace('\n', '').split('|') for sentence in groundtruth]
-
-	assert len(text) == len(groundtruth)
+	scores = {}
+	for config in configs:
+		name = get_config_name(config)
+		checkpoint_path = os.path.join(result_file_folder, f"result_{name}_{tag}_{os.path.splitext(data_name)[0]}.jsonl")
+		shared_kwargs = {
+			"credential": credentials.get(config["provider"], {}),
+			"language": language,
+			"optional_guidance_enable": optional_guidance_enable,
+			"customized_words": customized_words,
+			"max_correction_attempts": max_correction_attempts,
+		}
+		scores[name] = evaluate_configuration(
+			config,
+			text,
+			groundtruth,
+			checkpoint_path,
+			shared_kwargs,
+			max_workers=max_workers,
+		)
 
-	# Text correction
-	if os.path.exists(result_file_path):
-		with open(result_file_path, 'r', encoding="utf8") as f:
-			results = f.readlines()
-			text_corrected = [sentence.replace('\n', '') for sentence in results[:len(groundtruth)]]
-	else:
-		text_corrected = generate_results(text, groundtruth, corrector)
-		result_file = open(result_file_path, 'w', encoding="utf8")
-		for i in range(len(text_corrected)):
-			result_file.write(f"{text_corrected[i]}\n")
-
-		usage = corrector.get_total_usage()
-		result_file.write(f"\n\nToken Usage:\n")
-		print("Token Usage:")
-		for k in usage:
-			if isinstance(usage[k], dict):
-				result_file.write(f"  {k}:\n")
-				print(f"  {k}:")
-				for m in usage[k]:
-					result_file.write(f"    {m} = {usage[k][m]}\n")
-					print(f"    {m} = {usage[k][m]}")
-			else:
-				result_file.write(f"  {k} = {usage[k]}\n")
-				print(f"  {k} = {usage[k]}")
-
-		result_file.close()
-
-	eval_file = open(eval_file_path, 'w', encoding="utf8")
-
-	# Calculate accuracy
-	correct_count = 0
-	for i in range(len(text)):
-		if text_corrected[i] in groundtruth[i]:
-			correct_count += 1
-			continue
-
-		eval_file.write(f"{text[i]} => {text_corrected[i]}, ans: {groundtruth[i]}\n")
-
-	# Calculate character error rate
-	cer_sum = 0
-	for i in range(len(text)):
-		cer = min([jiwer.cer(gt, text_corrected[i]) for gt in groundtruth[i]])
-		cer_sum += cer
-
-	eval_file.write(f"\n\nAccuracy = {correct_count / len(text) * 100}%\n")
-	print(f"Accuracy = {correct_count / len(text) * 100}%")
-
-	eval_file.write(f"Character Error Rate = {cer_sum / len(text) * 100}%\n")
-	print(f"Character Error Rate = {cer_sum / len(text) * 100}%")
-
-	eval_file.close()
\ No newline at end of file
+	write_comparison(scores, len(text), eval_file_path)